@@ -5,18 +5,26 @@
     :copyright: 2016 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
-from operator import itemgetter
+import mmap
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from time import perf_counter
+
 try:
+    from gf256._speedups import ffi as _ffi
     from gf256._speedups import lib as _speedups
 except ImportError:
-    _speedups = None
+    _ffi = _speedups = None
 
 
 #: The version as a string.
-__version__ = '0.2.0'
+__version__ = '0.3.0.dev0'
 
 #: The version as a tuple. Use this for any comparisions, you may need to make.
-__version_info__ = (0, 2, 0)
+__version_info__ = (0, 3, 0, 'dev', 0)
 
 
 def _polymul(a, b):
@@ -53,11 +61,230 @@ def _polydiv(dividend, divisor):
     return quotient
 
 
-class _GF256Base:
-    def __init__(self, n):
+def _polymulmod(a, b, modulus):
+    """
+    Returns the product of two elements of `GF(2 ** 8)` given as integers,
+    using binary multiplication modulo `modulus`.
+    """
+    # The algorithm takes two factors `a` and `b` and iteratively halves `a`
+    # and doubles `b`. The product is then the sum of all `b`s whose
+    # corresponding `a` is odd, modulo the modulus.
+    #
+    # In an effort to try to be invulnerable to timing side channel attacks,
+    # this implementation does exactly the same thing, in terms of which
+    # operations are executed and in what order, no matter what the inputs
+    # are.
+    product = 0
+    # We can't let either `a` or `b` have any impact on how many iterations we
+    # perform because that would leak information about `a` and `b` through
+    # the runtime. Instead we perform one iteration per bit.
+    #
+    # This means that there will be iterations where `a == 0` and we already
+    # have the finished product.
+    for _ in range(8):
+        # If `a` is odd, add `b` to the product.
+        product ^= (a & 1) * b
+
+        # Double `b`. If the carry `(b >> 7)` is `1` and therefore `(b << 1)`
+        # overflows, continue with the remainder `(b << 1) % modulus`.
+        #
+        # In implementing the modulo operation we can take advantage of the
+        # fact that in case of an overflow `(b << 1)` is a polynomial of
+        # degree 8 and that the modulus is also a polynomial of degree 8. A
+        # single subtraction (exclusive or in this field) is therefore enough
+        # to get the remainder.
+        b = (b << 1) ^ ((b >> 7) * modulus)
+
+        # Halve `a` by shifting it one bit to the right.
+        a >>= 1
+    return product
+
+
+def _modinverse(n, modulus):
+    """
+    Returns the multiplicative inverse of an element of `GF(2 ** 8)` given as
+    an integer, using multiplication modulo `modulus`. `0`, which has no
+    inverse, is mapped to `0`.
+    """
+    # Every element `n` other than `0` satisfies `n ** 255 == 1`, so
+    # `n ** 254` is the inverse of `n`. For `0` this is `0`.
+    #
+    # We compute `n ** 254` with a fixed addition chain, so that the same
+    # sequence of squarings and multiplications is performed for every `n`
+    # and, just like with :func:`_polymulmod`, the runtime doesn't depend on
+    # the input. The chain uses 7 squarings and 4 multiplications:
+    #
+    #   1 -> 2 -> 3 -> 6 -> 12 -> 15 -> 30 -> 60 -> 120 -> 240 -> 252 -> 254
+    n2 = _polymulmod(n, n, modulus)
+    n3 = _polymulmod(n2, n, modulus)
+    n6 = _polymulmod(n3, n3, modulus)
+    n12 = _polymulmod(n6, n6, modulus)
+    n15 = _polymulmod(n12, n3, modulus)
+    n30 = _polymulmod(n15, n15, modulus)
+    n60 = _polymulmod(n30, n30, modulus)
+    n120 = _polymulmod(n60, n60, modulus)
+    n240 = _polymulmod(n120, n120, modulus)
+    n252 = _polymulmod(n240, n12, modulus)
+    return _polymulmod(n252, n2, modulus)
+
+
+def _exponentiation_table(generator, modulus):
+    """
+    Returns the powers `generator ** i` for `i` in `range(255)`, each computed
+    from the previous one with a single multiplication.
+    """
+    table = []
+    power = 1
+    for _ in range(255):
+        table.append(power)
+        power = _polymulmod(power, generator, modulus)
+    return table
+
+
+def _logarithm_table(exponentiation_table):
+    """
+    Returns the table mapping `n - 1` to the logarithm of `n`, given an
+    exponentiation table.
+    """
+    table = [0] * 255
+    for logarithm, power in enumerate(exponentiation_table):
+        table[power - 1] = logarithm
+    return table
+
+
+#: The directory in which tables and decode matrices are cached or `None`.
+_cache_directory = os.environ.get('GF256_CACHE_DIR') or None
+
+
+def set_cache_directory(path):
+    """
+    Sets the directory in which tables of fields and decode matrices of
+    :class:`gf256.erasure.ReedSolomon` are cached between processes. `None`
+    disables the cache, which is the default unless the environment variable
+    `GF256_CACHE_DIR` is set.
+
+    Each entry is a file with the tables or the matrix as raw bytes. New
+    processes map these files read-only, instead of computing the tables
+    again. The files are stored in a subdirectory named after the version of
+    this library and written atomically, so that many processes can share
+    the same directory. Errors reading or writing the cache are ignored.
+
+    The tables of :class:`GF256LT` are created, when :mod:`gf256` is
+    imported, so set `GF256_CACHE_DIR` for them to be read from the cache.
+    """
+    global _cache_directory
+    _cache_directory = path
+
+
+def _cache_path(name):
+    return os.path.join(
+        _cache_directory, 'gf256-{}'.format(__version__), name
+    )
+
+
+def _load_cache(name, size):
+    """
+    Returns the cache entry `name` as a read-only :class:`mmap.mmap` or
+    `None`, if there is no cache or no such entry of `size` bytes.
+    """
+    if _cache_directory is None:
+        return None
+    try:
+        with open(_cache_path(name), 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapping) != size:
+        mapping.close()
+        return None
+    return mapping
+
+
+def _store_cache(name, data):
+    """
+    Stores `data` as the cache entry `name`, if there is a cache.
+    """
+    if _cache_directory is None:
+        return
+    path = _cache_path(name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # The data is renamed into place, so that other processes never see
+        # a partially written entry.
+        fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with open(fd, 'wb') as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+    except OSError:
+        pass
+
+
+def _field_cache_name(irreducible_polynomial, generator):
+    return 'field-{:#x}-{}'.format(irreducible_polynomial, generator)
+
+
+#: The size of the cache entry of a field: The exponentiation and logarithm
+#: table followed by the multiplication table.
+_FIELD_CACHE_SIZE = 255 + 255 + 256 * 256
+
+
+def _field_tables(irreducible_polynomial, generator):
+    """
+    Returns the exponentiation and the logarithm table for a field, from the
+    cache if possible.
+    """
+    mapping = _load_cache(
+        _field_cache_name(irreducible_polynomial, generator),
+        _FIELD_CACHE_SIZE
+    )
+    if mapping is not None:
+        with mapping:
+            return list(mapping[:255]), list(mapping[255:510])
+    exponentiation_table = _exponentiation_table(
+        generator, irreducible_polynomial
+    )
+    return exponentiation_table, _logarithm_table(exponentiation_table)
+
+
+class _GF256Type(type):
+    """
+    Creates all 256 elements for each class, when the class is created.
+
+    As there are so few elements, we never have to create any objects after
+    that. Calling the class returns one of these preallocated objects and
+    operations look up their results in :attr:`_instances` directly.
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        instances = []
+        for n in range(256):
+            instance = object.__new__(cls)
+            object.__setattr__(instance, 'n', n)
+            instances.append(instance)
+        cls._instances = tuple(instances)
+
+
+class _GF256Base(metaclass=_GF256Type):
+    __slots__ = ('n', )
+
+    def __new__(cls, n):
         if not 0 <= n < 256:
             raise ValueError('{} is not in range(0, 256)'.format(n))
-        self.n = n
+        return cls._instances[n]
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            '{} objects are immutable'.format(self.__class__.__name__)
+        )
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            '{} objects are immutable'.format(self.__class__.__name__)
+        )
+
+    def __reduce__(self):
+        return self.__class__, (self.n, )
 
     def to_polynomial_string(self):
         """
@@ -78,22 +305,51 @@ class _GF256Base:
 
     def __add__(self, other):
         if isinstance(other, _GF256Base):
-            return self.__class__(self.n ^ other.n)
+            return self._instances[self.n ^ other.n]
         return NotImplemented
 
     def __sub__(self, other):
         if isinstance(other, _GF256Base):
-            return self.__class__(self.n ^ other.n)
+            return self._instances[self.n ^ other.n]
         return NotImplemented
 
+    @staticmethod
+    def _exponent(other):
+        """
+        Returns `other` as an integer exponent or `None`, if `other` can't be
+        used as an exponent.
+        """
+        if isinstance(other, (int, _GF256Base)):
+            return int(other)
+        return None
+
     def __pow__(self, other):
         # modulo not supported
-        if isinstance(other, _GF256Base):
-            power = self.__class__(1)
-            for _ in range(int(other)):
-                power *= self
-            return power
-        return NotImplemented
+        exponent = self._exponent(other)
+        if exponent is None:
+            return NotImplemented
+        base = self
+        if exponent < 0:
+            base = self._multiplicative_inverse()
+            exponent = -exponent
+        # Every non-zero element `a` satisfies `a ** 255 == 1`, so we can
+        # reduce the exponent to `range(1, 256)` without changing the result,
+        # unless it's zero, in which case the result is always 1.
+        if exponent:
+            exponent = (exponent - 1) % 255 + 1
+
+        # We use square-and-multiply with a fixed sequence of operations: One
+        # squaring and one multiplication for each of the 8 bits of the
+        # exponent. Whether the product is used is decided with a mask,
+        # instead of a branch, so that the runtime is independent of both
+        # the base and the exponent.
+        power = self._instances[1]
+        for bit in reversed(range(8)):
+            power *= power
+            product = power * base
+            mask = -((exponent >> bit) & 1)
+            power = self._instances[power.n ^ ((power.n ^ product.n) & mask)]
+        return power
 
     def __truediv__(self, other):
         if isinstance(other, _GF256Base):
@@ -122,6 +378,9 @@ class GF256(_GF256Base):
     You can do arithmetic using `+`, `-`, `*`, `/` and `**`. Additionally `==`
     and `!=` operations are implemented. GF256 objects are hashable and can be
     used as keys. Use `int()` to turn an object into an integer.
+
+    The exponent of `**` is an integer, negative exponents are powers of the
+    multiplicative inverse.
     """
 
     #: The irreducible polynomial `x**8 + x**4 + x**3 + x + 1` used as a
@@ -130,67 +389,15 @@ class GF256(_GF256Base):
     #: This particular polynomial was chosen due to it's use in AES.
     irreducible_polynomial = 0b100011011
 
+    __slots__ = ()
+
     def __mul__(self, other):
         if isinstance(other, GF256):
-            # We multiply using binary multiplication modulo
-            # :attr:`irreducible_polynomial`.
-            #
-            # The algorithm takes two factors `a` and `b` and iteratively
-            # halves `a` and doubles `b`. The product is then the sum of all
-            # `b`s whose corresponding `a` is odd, modulo the modulus.
-            #
-            # In an effort to try to be invulnerable to timing side channel
-            # attacks, this implementation does exactly the same thing, in
-            # terms of which operations are executed and in what order, no
-            # matter what the inputs are.
-
-            a, b = self.n, other.n
-            product = 0
-            # We can't let either `a` or `b` have any impact on how many
-            # iterations we perform because that would leak information about
-            # `a` and `b` through the runtime. Instead we perform one iteration
-            # per bit.
-            #
-            # This means that there will be iterations where `a == 0` and we
-            # already have the finished product.
-            for _ in range(8):
-                # If `a` is odd, add `b` to the product.
-                product ^= (a & 1) * b
-
-                # Double `b`. If the carry `(b >> 7)` is `1` and therefore
-                # `(b << 1)` overflows, continue with the remainder
-                # `(b << 1) % self.irreducible_polynomial`.
-                #
-                # In implementing the modulo operation we can take advantage of
-                # the fact that in case of an overflow `(b << 1)` is a
-                # polynomial of degree 8 and that the irreducible polynomial is
-                # also a polynomial of degree 8. A single subtraction
-                # (exclusive or in this field) is therefore enough to get the
-                # remainder.
-                b = (b << 1) ^ ((b >> 7) * self.irreducible_polynomial)
-
-                # Halve `a` by shifting it one bit to the right.
-                a >>= 1
-            return self.__class__(product)
+            return self._instances[_polymulmod(
+                self.n, other.n, self.irreducible_polynomial
+            )]
         return NotImplemented
 
-    if _speedups:
-        def __mul__(self, other):  # noqa
-            if isinstance(other, GF256):
-                return self.__class__(_speedups.polymulmod(
-                    self.n, other.n, self.irreducible_polynomial
-                ))
-            return NotImplemented
-
-        def __truediv__(self, other):
-            if isinstance(other, GF256):
-                if other.n == 0:
-                    raise ZeroDivisionError()
-                return self.__class__(_speedups.polydivmod(
-                    self.n, other.n, self.irreducible_polynomial
-                ))
-            return NotImplemented
-
     def _multiplicative_inverse(self):
         """
         Returns the multiplicative inverse that is the element that, if
@@ -201,107 +408,1148 @@ class GF256(_GF256Base):
         Such an inverse exists for all elements except 0, for which a
         :exc:`ZeroDivisionError` is raised.
         """
-        if self == self.__class__(0):
+        if self.n == 0:
             raise ZeroDivisionError()
-
-        # We use a variant of the *extended Euclidean algorithm* to find the
-        # multiplicative inverse.
-        #
-        # The extended Euclidean algorithm computes - in addition to the
-        # greatest common divisor (gcd) which the Euclidean algorithm computes
-        # - two integers `s` and `t` such that::
-        #
-        #   s*a + t*b == gcd(a, b)
-        #
-        # In our case `gcd(a, b) == 1` holds, applying equivalence
-        # transformations we can show that `t` is the multiplicative inverse.
-        #
-        #       s*a + t*b == 1      | % a
-        #    => 0*a + t*b == 1 % a
-        #   <=>       t*b == 1 % a
-        #
-        # You can easily find explanations that describe the algorithm, instead
-        # we'll only cover the differences to the textbook definition and
-        # application specific details here.
-        #
-        # The algorithm calls for Euclidean division, :func:`_polydiv`
-        # implements that for polynomials. The function defintition has more
-        # information on how that is implemented.
-        #
-        # The sequence of remainders computed as part of the algorithm includes
-        # the modulus, which in our case is the irreducible polynomial. This
-        # means that the remainders are not (all) elements of `GF(2**8)`.
-        # `quotient` and through that `t` are also affected by this issue. In
-        # order to deal this issue, we use multiplication without the modulo
-        # part here.
-        #
-        # Subtraction is defined as exclusive or in `GF(2**8)`, so we
-        # use that instead of subtraction in the algorithm.
-        old_t, t = 0, 1
-        old_r, r = self.irreducible_polynomial, self.n
-        while r != 0:
-            quotient = _polydiv(old_r, r)
-            old_r, r = r, old_r ^ _polymul(quotient, r)
-            old_t, t = t, old_t ^ _polymul(quotient, t)
-
-        # old_r is the gcd. The gcd should always be 1 here. If it isn't, this
-        # would indicate that either `self` is 0 (which a check above prevents)
-        # or that the :attr:`irreducible_polynomial` isn't actually
-        # irreducible.
-        assert old_r == 1  # old_r is the gcd
-        return self.__class__(abs(old_t))
+        return self._instances[
+            _modinverse(self.n, self.irreducible_polynomial)
+        ]
 
 
-class GF256LT(_GF256Base):
+class _GF256LTBase(_GF256Base):
     """
-    Represents an element in `GF(2 ** 8)`, implemented using lookup tables for
-    fast multiplication and division.
-
-    Works like :class:`GF256`.
+    Implements the elements of a field using lookup tables, which subclasses
+    provide as :attr:`exponentiation_table` and :attr:`logarithm_table`.
     """
 
-    generator = 3
-    exponentiation_table = [
-        int(GF256(3) ** GF256(i)) for i in range(255)
-    ]
-    logarithm_table = [
-        logarithm
-        for logarithm, exponent in sorted(
-            enumerate(exponentiation_table, 0),
-            key=itemgetter(1)
-        )
-    ]
+    __slots__ = ()
 
     def __mul__(self, other):
-        if isinstance(other, GF256LT):
+        if isinstance(other, self.__class__):
             if self.n == 0 or other.n == 0:
-                return self.__class__(0)
-            return self.__class__(self.exponentiation_table[
+                return self._instances[0]
+            return self._instances[self.exponentiation_table[
                 (
                     self.logarithm_table[self.n - 1]
                     + self.logarithm_table[other.n - 1]
                 ) % 255
-            ])
+            ]]
         return NotImplemented
 
-    if _speedups:
-        def __mul__(self, other):  # noqa
-            if isinstance(other, GF256LT):
-                return self.__class__(_speedups.polymulmodlt(self.n, other.n))
-            return NotImplemented
-
-        def __truediv__(self, other):
-            if isinstance(other, GF256LT):
-                if other.n == 0:
-                    raise ZeroDivisionError()
-                return self.__class__(_speedups.polydivmodlt(self.n, other.n))
+    def __pow__(self, other):
+        exponent = self._exponent(other)
+        if exponent is None:
             return NotImplemented
+        if self.n == 0:
+            if exponent < 0:
+                raise ZeroDivisionError()
+            return self._instances[int(exponent == 0)]
+        return self._instances[
+            self.exponentiation_table[
+                (self.logarithm_table[self.n - 1] * exponent) % 255
+            ]
+        ]
 
     def _multiplicative_inverse(self):
         if self.n == 0:
             raise ZeroDivisionError()
-        return self.__class__(
+        return self._instances[
             self.exponentiation_table[
                 (-self.logarithm_table[self.n - 1]) % 255
             ]
+        ]
+
+    @classmethod
+    def _multiplication_table(cls):
+        """
+        Returns a bytes-like object of length `256 * 256` with the product of
+        `a` and `b` at index `a << 8 | b`.
+
+        The table is computed when it's first needed, as only bulk operations
+        make use of it. If it's in the cache set with
+        :func:`set_cache_directory`, the table is a read-only
+        :class:`memoryview` of the mapped cache entry, which all processes
+        using the cache share, otherwise it's :class:`bytes`.
+        """
+        if '_cached_multiplication_table' not in cls.__dict__:
+            name = _field_cache_name(cls.irreducible_polynomial, cls.generator)
+            mapping = _load_cache(name, _FIELD_CACHE_SIZE)
+            if mapping is not None:
+                # The mapping stays open for as long as the view exists.
+                cls._cached_multiplication_table = memoryview(mapping)[510:]
+                return cls._cached_multiplication_table
+            table = bytearray(256 * 256)
+            for a in range(1, 256):
+                logarithm = cls.logarithm_table[a - 1]
+                table[a << 8 | 1:(a + 1) << 8] = bytes(
+                    cls.exponentiation_table[
+                        (logarithm + cls.logarithm_table[b - 1]) % 255
+                    ]
+                    for b in range(1, 256)
+                )
+            cls._cached_multiplication_table = bytes(table)
+            _store_cache(name, bytes(
+                cls.exponentiation_table + cls.logarithm_table
+            ) + cls._cached_multiplication_table)
+        return cls._cached_multiplication_table
+
+    @classmethod
+    def _multiplication_row(cls, n):
+        """
+        Returns the 256 byte long row of the multiplication table for `n`,
+        which maps every element to its product with `n`, as a bytes-like
+        object.
+        """
+        return cls._multiplication_table()[n << 8:(n + 1) << 8]
+
+    @classmethod
+    def _inverse_table(cls):
+        """
+        Returns a 256 byte long table that maps every element to its
+        multiplicative inverse. `0`, which has no inverse, is mapped to `0`.
+        """
+        if '_cached_inverse_table' not in cls.__dict__:
+            cls._cached_inverse_table = bytes([0]) + bytes(
+                cls.exponentiation_table[
+                    (-cls.logarithm_table[n - 1]) % 255
+                ]
+                for n in range(1, 256)
+            )
+        return cls._cached_inverse_table
+
+
+class GF256LT(_GF256LTBase):
+    """
+    Represents an element in `GF(2 ** 8)`, implemented using lookup tables for
+    fast multiplication and division.
+
+    Works like :class:`GF256`. Use :func:`field` for other irreducible
+    polynomials.
+    """
+
+    __slots__ = ()
+
+    #: The irreducible polynomial used as a modulus, the same as
+    #: :attr:`GF256.irreducible_polynomial`.
+    irreducible_polynomial = GF256.irreducible_polynomial
+
+    #: The generator of the multiplicative group, that the tables are based
+    #: on.
+    generator = 3
+
+    exponentiation_table, logarithm_table = _field_tables(
+        irreducible_polynomial, generator
+    )
+
+
+def _is_irreducible(polynomial):
+    """
+    Returns `True`, if `polynomial` is of degree 8 and irreducible.
+    """
+    if polynomial.bit_length() != 9:
+        return False
+    # A reducible polynomial of degree 8 has a factor of degree 4 or less.
+    for divisor in range(2, 32):
+        quotient = _polydiv(polynomial, divisor)
+        if polynomial ^ _polymul(quotient, divisor) == 0:
+            return False
+    return True
+
+
+_fields = {(GF256LT.irreducible_polynomial, GF256LT.generator): GF256LT}
+
+
+def field(irreducible_polynomial=GF256.irreducible_polynomial, generator=3):
+    """
+    Returns a class that works like :class:`GF256LT`, using the irreducible
+    polynomial `irreducible_polynomial` as a modulus and tables based on the
+    generator `generator`.
+
+    Many applications, such as QR codes, use `0b100011101` with the generator
+    `2`::
+
+        >>> QR = field(0b100011101, 2)
+        >>> QR(2) ** 8
+        field(0x11d, 2)(0b00011101)
+
+    The class and its tables are created on the first call, further calls with
+    the same arguments return the same class. The defaults return
+    :class:`GF256LT`. Elements of different fields can't be combined, except
+    with `+` and `-`. All bulk operations pass the tables of the field to
+    the speedups, so they are as fast as with :class:`GF256LT`.
+
+    Raises :exc:`ValueError`, if `irreducible_polynomial` is not an
+    irreducible polynomial of degree 8 or if `generator` does not generate
+    the multiplicative group of the field.
+    """
+    key = irreducible_polynomial, generator
+    if key in _fields:
+        return _fields[key]
+    if not _is_irreducible(irreducible_polynomial):
+        raise ValueError(
+            '{:#x} is not an irreducible polynomial of degree 8'.format(
+                irreducible_polynomial
+            )
+        )
+    if not 0 < generator < 256:
+        raise ValueError('{} is not in range(1, 256)'.format(generator))
+    exponentiation_table, logarithm_table = _field_tables(
+        irreducible_polynomial, generator
+    )
+    if len(set(exponentiation_table)) != 255:
+        raise ValueError(
+            '{} is not a generator of the multiplicative group'.format(
+                generator
+            )
+        )
+
+    def __reduce__(self):
+        return _field_element, key + (self.n, )
+
+    name = 'field({:#x}, {})'.format(irreducible_polynomial, generator)
+    cls = _GF256Type(name, (_GF256LTBase, ), {
+        '__slots__': (),
+        '__qualname__': name,
+        '__module__': __name__,
+        '__reduce__': __reduce__,
+        'irreducible_polynomial': irreducible_polynomial,
+        'generator': generator,
+        'exponentiation_table': exponentiation_table,
+        'logarithm_table': logarithm_table,
+    })
+    return _fields.setdefault(key, cls)
+
+
+def _field_element(irreducible_polynomial, generator, n):
+    """
+    Returns the element `n` of a field returned by :func:`field`.
+    """
+    return field(irreducible_polynomial, generator)(n)
+
+
+def _addition_row(n):
+    """
+    Returns a 256 byte long table that maps every element to its sum with `n`.
+    """
+    return bytes(m ^ n for m in range(256))
+
+
+def _byte_view(buffer, writable=False):
+    """
+    Returns a flat, byte-sized :class:`memoryview` of `buffer`.
+
+    Raises :exc:`TypeError` if `buffer` doesn't support the buffer protocol or,
+    if `writable` is true, isn't writable.
+    """
+    view = memoryview(buffer)
+    if writable and view.readonly:
+        raise TypeError('{!r} is not writable'.format(buffer))
+    return view.cast('B')
+
+
+def _output_buffer(out, length):
+    """
+    Returns `out` or, if `out` is `None`, a new :class:`bytearray`, for use as
+    the output of an operation producing `length` bytes.
+
+    Raises :exc:`TypeError` if `out` isn't a writable buffer and
+    :exc:`ValueError` if it isn't `length` bytes long.
+    """
+    if out is None:
+        return bytearray(length)
+    if len(_byte_view(out, writable=True)) != length:
+        raise ValueError('out must be {} bytes long, got {}'.format(
+            length, len(_byte_view(out))
+        ))
+    return out
+
+
+class _PythonBackend:
+    """
+    Performs all operations in Python.
+    """
+
+    name = 'python'
+
+    def __init__(self):
+        # The methods are the ones defined in the class bodies, which are
+        # captured before any other backend replaces them. `None` means that
+        # the method is inherited.
+        self.methods = {
+            (cls, name): cls.__dict__.get(name)
+            for cls, name in _BACKEND_METHODS
+        }
+
+    def find_zero(self, data):
+        return bytes(data).find(0)
+
+    def add_regions(self, a, b, dst):
+        dst[:] = (
+            int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')
+        ).to_bytes(len(dst), 'little')
+
+    def _store(self, products, dst, add):
+        if add:
+            self.add_regions(dst, products, dst)
+        else:
+            dst[:] = products
+
+    def mul_regions(self, table, a, b, dst):
+        # The product of `x ** 7` and `x` is `x ** 8` reduced by the
+        # irreducible polynomial, which is all that is needed to multiply
+        # without the table.
+        products = _swar_mul(
+            int.from_bytes(a, 'little'), int.from_bytes(b, 'little'),
+            table[0x80 << 8 | 2], len(dst)
+        )
+        dst[:] = products.to_bytes(len(dst), 'little')
+
+    def lookup_region(self, table, src, dst, add=False):
+        self._store(bytes(src).translate(table), dst, add)
+
+    mul_region = lookup_region
+
+    def mul_region_ct(self, c, modulus, src, dst, add=False):
+        # Constant time operations are performed byte by byte, operations on
+        # integers spanning the entire buffer take time that depends on
+        # their values.
+        products = bytes(_polymulmod(c, n, modulus) for n in src)
+        self._store(products, dst, add)
+
+    def inverse_region_ct(self, modulus, src, dst):
+        dst[:] = bytes(_modinverse(n, modulus) for n in src)
+
+    def inverse_many_ct(self, modulus, data):
+        # Montgomery's trick, see `region_inverse_many_ct` in the speedups.
+        products = []
+        product = 1
+        for n in data:
+            product = _polymulmod(product, n, modulus)
+            products.append(product)
+        inverse = _modinverse(product, modulus)
+        for i in range(len(data) - 1, 0, -1):
+            n = data[i]
+            data[i] = _polymulmod(inverse, products[i - 1], modulus)
+            inverse = _polymulmod(inverse, n, modulus)
+        if data:
+            data[0] = inverse
+
+
+def _swar_ones(length):
+    """
+    Returns an integer, whose `length` bytes are all `1`.
+    """
+    return int.from_bytes(b'\1' * length, 'little')
+
+
+def _swar_mul(a, b, reduction, length):
+    """
+    Returns the products of the `length` bytes of the integers `a` and `b`,
+    as an integer with the product of the `i`-th bytes as its `i`-th byte.
+    `reduction` are the lower eight bits of the irreducible polynomial.
+
+    All bytes are multiplied at once (SIMD within a register) with a fixed
+    sequence of shifts, masks and `xor` on the integers. This isn't constant
+    time, the duration of operations on integers depends on their values.
+    """
+    ones = _swar_ones(length)
+    high = ones << 7
+    low = high - ones
+    product = 0
+    for i in range(8):
+        # Every byte of the mask is `0xff`, if bit `i` of that byte of `b`
+        # is set, and `0` otherwise.
+        product ^= a & ((b >> i) & ones) * 0xff
+        # Multiplies every byte of `a` with `x`, reducing those that overflow.
+        a = ((a & low) << 1) ^ ((a & high) >> 7) * reduction
+    return product
+
+
+class _SpeedupsBackend:
+    """
+    Performs all operations in C, using the speedups.
+    """
+
+    name = 'speedups'
+
+    def __init__(self):
+        self.methods = {
+            (GF256, '__mul__'): self._gf256_mul,
+            (GF256, '__truediv__'): self._gf256_truediv,
+            (GF256, '_multiplicative_inverse'): (
+                self._gf256_multiplicative_inverse
+            ),
+            (GF256LT, '__mul__'): self._gf256lt_mul,
+            (GF256LT, '__truediv__'): self._gf256lt_truediv,
+        }
+
+    @staticmethod
+    def _gf256_mul(self, other):
+        if isinstance(other, GF256):
+            return self._instances[_speedups.polymulmod(
+                self.n, other.n, self.irreducible_polynomial
+            )]
+        return NotImplemented
+
+    @staticmethod
+    def _gf256_truediv(self, other):
+        if isinstance(other, GF256):
+            if other.n == 0:
+                raise ZeroDivisionError()
+            return self._instances[_speedups.polydivmod(
+                self.n, other.n, self.irreducible_polynomial
+            )]
+        return NotImplemented
+
+    @staticmethod
+    def _gf256_multiplicative_inverse(self):
+        if self.n == 0:
+            raise ZeroDivisionError()
+        return self._instances[
+            _speedups.modinverse(self.n, self.irreducible_polynomial)
+        ]
+
+    @staticmethod
+    def _gf256lt_mul(self, other):
+        if isinstance(other, GF256LT):
+            return self._instances[_speedups.polymulmodlt(self.n, other.n)]
+        return NotImplemented
+
+    @staticmethod
+    def _gf256lt_truediv(self, other):
+        if isinstance(other, GF256LT):
+            if other.n == 0:
+                raise ZeroDivisionError()
+            return self._instances[_speedups.polydivmodlt(self.n, other.n)]
+        return NotImplemented
+
+    def find_zero(self, data):
+        position = _speedups.region_find_zero(
+            _ffi.from_buffer(data), len(data)
+        )
+        return -1 if position == len(data) else position
+
+    def add_regions(self, a, b, dst):
+        _speedups.region_xor(
+            _ffi.from_buffer(a), _ffi.from_buffer(b), _ffi.from_buffer(dst),
+            len(dst)
+        )
+
+    def mul_regions(self, table, a, b, dst):
+        _speedups.region_mul(
+            _ffi.from_buffer(table),
+            _ffi.from_buffer(a), _ffi.from_buffer(b), _ffi.from_buffer(dst),
+            len(dst)
+        )
+
+    def lookup_region(self, table, src, dst, add=False):
+        function = (
+            _speedups.region_lookup_xor if add else _speedups.region_lookup
+        )
+        function(
+            _ffi.from_buffer(table), _ffi.from_buffer(src),
+            _ffi.from_buffer(dst), len(dst)
+        )
+
+    def mul_region(self, row, src, dst, add=False):
+        function = (
+            _speedups.region_muladd_constant if add
+            else _speedups.region_mul_constant
+        )
+        function(
+            _ffi.from_buffer(row), _ffi.from_buffer(src),
+            _ffi.from_buffer(dst), len(dst)
+        )
+
+    def mul_region_ct(self, c, modulus, src, dst, add=False):
+        function = (
+            _speedups.region_muladd_ct if add else _speedups.region_mul_ct
+        )
+        function(
+            c, modulus, _ffi.from_buffer(src), _ffi.from_buffer(dst), len(dst)
+        )
+
+    def inverse_region_ct(self, modulus, src, dst):
+        _speedups.region_inverse_ct(
+            modulus, _ffi.from_buffer(src), _ffi.from_buffer(dst), len(dst)
+        )
+
+    def inverse_many_ct(self, modulus, data):
+        _speedups.region_inverse_many_ct(
+            modulus, _ffi.from_buffer(data), _ffi.new('uint8_t[]', len(data)),
+            len(data)
+        )
+
+
+def _numpy_backend():
+    from gf256.np import _NumPyBackend
+    return _NumPyBackend()
+
+
+def _numpy_available():
+    return find_spec('numpy') is not None
+
+
+#: The methods of elements, that differ between backends.
+_BACKEND_METHODS = [
+    (GF256, '__mul__'),
+    (GF256, '__truediv__'),
+    (GF256, '_multiplicative_inverse'),
+    (GF256LT, '__mul__'),
+    (GF256LT, '__truediv__'),
+]
+
+#: The bulk operations, that :func:`calibrate` selects backends for, and the
+#: arguments used to measure them, given a table, a row of it, a modulus and
+#: the data.
+_BULK_OPERATIONS = [
+    ('find_zero', lambda table, row, modulus, data: (data, )),
+    ('add_regions', lambda table, row, modulus, data: (data, data, data)),
+    ('mul_regions', lambda table, row, modulus, data: (
+        table, data, data, data
+    )),
+    ('lookup_region', lambda table, row, modulus, data: (row, data, data)),
+    ('mul_region', lambda table, row, modulus, data: (row, data, data)),
+    ('mul_region_ct', lambda table, row, modulus, data: (
+        3, modulus, data, data
+    )),
+    ('inverse_region_ct', lambda table, row, modulus, data: (
+        modulus, data, data
+    )),
+    ('inverse_many_ct', lambda table, row, modulus, data: (modulus, data)),
+]
+
+#: The sizes, in bytes, that separate the size classes :func:`calibrate`
+#: distinguishes, and the size used to measure each class.
+_SIZE_CLASSES = [(256, 64), (16384, 4096), (None, 65536)]
+
+_backends = {}
+_backend = None
+_calibration = None
+
+
+def available_backends():
+    """
+    Returns a tuple with the names of the backends, that can be selected with
+    :func:`select_backend`, fastest first.
+
+    These are `'speedups'`, if the speedups are installed, `'numpy'`, if
+    NumPy is installed, and `'python'`.
+    """
+    names = []
+    if _speedups:
+        names.append('speedups')
+    if _numpy_available():
+        names.append('numpy')
+    names.append('python')
+    return tuple(names)
+
+
+def backend():
+    """
+    Returns the name of the selected backend.
+    """
+    return _backend.name
+
+
+def _speedups_selected():
+    """
+    Returns `True`, if the speedups are the selected backend.
+    """
+    return _backend.name == 'speedups'
+
+
+def _get_backend(name):
+    if name not in _backends:
+        if name == 'speedups':
+            _backends[name] = _SpeedupsBackend()
+        else:
+            _backends[name] = _numpy_backend()
+    return _backends[name]
+
+
+def select_backend(name=None):
+    """
+    Selects the backend called `name`, which performs all operations from
+    then on. If `name` is `None`, the fastest available backend is selected.
+
+    When :mod:`gf256` is imported, the backend named by the environment
+    variable `GF256_BACKEND` is selected, or the fastest one, if it's not
+    set. If `GF256_BACKEND` is `'calibrate'`, :func:`calibrate` is called as
+    well.
+
+    `'speedups'` performs operations on single elements and bulk operations
+    in C. `'numpy'` performs bulk operations with NumPy and everything else
+    in Python. `'python'` performs all operations in Python. Whether a field
+    uses tables, like :class:`GF256LT`, or not, like :class:`GF256`, is
+    independent of the backend.
+
+    Raises :exc:`ValueError`, if `name` isn't one of
+    :func:`available_backends`. Undoes :func:`calibrate`. If
+    :mod:`gf256.instrumentation` is enabled, it's applied to the methods of
+    the selected backend.
+    """
+    global _backend, _calibration
+    if name is None:
+        name = available_backends()[0]
+    if name not in available_backends():
+        raise ValueError('{!r} is not an available backend'.format(name))
+    selected = _get_backend(name)
+    # The instrumented methods wrap those of the previous backend, the
+    # instrumentation is removed and applied to the new ones instead.
+    instrumentation = sys.modules.get('gf256.instrumentation')
+    instrumented = (
+        instrumentation is not None and instrumentation.is_enabled()
+    )
+    if instrumented:
+        instrumentation.disable()
+    methods = selected.methods if name == 'speedups' else (
+        _backends['python'].methods
+    )
+    for (cls, method_name), method in methods.items():
+        if method is None:
+            if method_name in cls.__dict__:
+                delattr(cls, method_name)
+        else:
+            setattr(cls, method_name, method)
+    _backend = selected
+    _calibration = None
+    if instrumented:
+        instrumentation.enable(timing=instrumentation._timing)
+
+
+def _measure(function, arguments):
+    """
+    Returns the shortest of three durations of `function(*arguments)`.
+    """
+    durations = []
+    for _ in range(3):
+        start = perf_counter()
+        function(*arguments)
+        durations.append(perf_counter() - start)
+    return min(durations)
+
+
+def calibrate():
+    """
+    Measures how fast each available backend performs each bulk operation on
+    small, medium and large regions. From then on, these operations are
+    performed by the fastest backend for the size of the region, while all
+    other operations are still performed by the selected backend.
+
+    Returns a dictionary, that maps `(operation, size)` to the name of the
+    backend chosen for regions smaller than `size` bytes, `None` being the
+    largest size class. Each call measures again and replaces the previous
+    calibration, use :func:`select_backend` to undo it.
+    """
+    global _calibration
+    candidates = [_get_backend(name) for name in available_backends()]
+    table = GF256LT._multiplication_table()
+    row = GF256LT._multiplication_row(3)
+    modulus = GF256.irreducible_polynomial
+    calibration = {}
+    for operation, arguments in _BULK_OPERATIONS:
+        remaining = candidates
+        calibration[operation] = []
+        for index, (limit, size) in enumerate(_SIZE_CLASSES):
+            data = bytearray(range(1, 256)) * (size // 255 + 1)
+            data = data[:size]
+            durations = [
+                _measure(
+                    getattr(candidate, operation),
+                    arguments(table, row, modulus, data)
+                )
+                for candidate in remaining
+            ]
+            fastest = min(durations)
+            calibration[operation].append(
+                (limit, remaining[durations.index(fastest)])
+            )
+            if index:
+                # Backends, that are much slower than the fastest one once
+                # the overhead of a call doesn't matter anymore, won't catch
+                # up with larger regions, which would take long to measure.
+                remaining = [
+                    candidate
+                    for candidate, duration in zip(remaining, durations)
+                    if duration <= fastest * 10
+                ]
+    _calibration = calibration
+    return {
+        (operation, limit): candidate.name
+        for operation, classes in calibration.items()
+        for limit, candidate in classes
+    }
+
+
+def _bulk(operation, size):
+    """
+    Returns the backend, that performs the bulk `operation` on `size` bytes.
+    """
+    if _calibration is None:
+        return _backend
+    size_classes = _calibration[operation]
+    for limit, candidate in size_classes[:-1]:
+        if size < limit:
+            return candidate
+    return size_classes[-1][1]
+
+
+def _find_zero(data):
+    return _bulk('find_zero', len(data)).find_zero(data)
+
+
+def _add_regions(a, b, dst):
+    _bulk('add_regions', len(dst)).add_regions(a, b, dst)
+
+
+def _mul_regions(table, a, b, dst):
+    _bulk('mul_regions', len(dst)).mul_regions(table, a, b, dst)
+
+
+def _lookup_region(table, src, dst, add=False):
+    _bulk('lookup_region', len(dst)).lookup_region(table, src, dst, add=add)
+
+
+def _mul_region(row, src, dst, add=False):
+    _bulk('mul_region', len(dst)).mul_region(row, src, dst, add=add)
+
+
+def _mul_region_ct(c, modulus, src, dst, add=False):
+    _bulk('mul_region_ct', len(dst)).mul_region_ct(
+        c, modulus, src, dst, add=add
+    )
+
+
+def _inverse_region_ct(modulus, src, dst):
+    _bulk('inverse_region_ct', len(dst)).inverse_region_ct(modulus, src, dst)
+
+
+def _inverse_many_ct(modulus, data):
+    _bulk('inverse_many_ct', len(data)).inverse_many_ct(modulus, data)
+
+
+def _select_backend_from_environment():
+    name = os.environ.get('GF256_BACKEND') or None
+    if name == 'calibrate':
+        select_backend()
+        calibrate()
+    else:
+        select_backend(name)
+
+
+_backends['python'] = _PythonBackend()
+_select_backend_from_environment()
+
+
+def available_region_kernels():
+    """
+    Returns a tuple with the names of the kernels that :func:`mul_region` and
+    :func:`muladd_region` can use on this CPU, fastest first.
+
+    With the speedups these are some of `'gfni_avx2'`, `'avx2'` and `'ssse3'`,
+    which process 32 or 16 bytes per instruction, followed by `'portable'`.
+    Without the speedups this is `('python',)`.
+    """
+    if not _speedups:
+        return ('python',)
+    kernels = []
+    while True:
+        name = _speedups.available_region_kernel(len(kernels))
+        if name == _ffi.NULL:
+            return tuple(kernels)
+        kernels.append(_ffi.string(name).decode('ascii'))
+
+
+def region_kernel():
+    """
+    Returns the name of the kernel used by :func:`mul_region` and
+    :func:`muladd_region`.
+    """
+    if not _speedups:
+        return 'python'
+    return _ffi.string(_speedups.selected_region_kernel()).decode('ascii')
+
+
+def select_region_kernel(name=None):
+    """
+    Selects the kernel called `name` for use by :func:`mul_region` and
+    :func:`muladd_region`. If `name` is `None`, the fastest available kernel
+    is selected, which also happens when :mod:`gf256` is imported.
+
+    Raises :exc:`ValueError`, if `name` isn't one of
+    :func:`available_region_kernels`.
+    """
+    if name is None:
+        name = available_region_kernels()[0]
+    if name not in available_region_kernels():
+        raise ValueError('{!r} is not an available kernel'.format(name))
+    if _speedups:
+        _speedups.select_region_kernel(name.encode('ascii'))
+
+
+select_region_kernel()
+
+
+def _regions(src, dst):
+    """
+    Returns byte views of `src` and a writable `dst` of the same length.
+    """
+    src = _byte_view(src)
+    dst = _byte_view(dst, writable=True)
+    if len(src) != len(dst):
+        raise ValueError(
+            'src and dst have different lengths: {} != {}'.format(
+                len(src), len(dst)
+            )
+        )
+    return src, dst
+
+
+#: The smallest number of bytes, that is processed by one thread, if
+#: operations are given more than one thread.
+_THREAD_CHUNK_SIZE = 2 ** 20
+
+_thread_pool = None
+_thread_pool_size = 0
+
+
+def _threads_pool(threads):
+    """
+    Returns a thread pool with at least `threads` threads, which is shared
+    by all operations, so that threads are only started once.
+    """
+    global _thread_pool, _thread_pool_size
+    if _thread_pool_size < threads:
+        # The previous pool is not shut down, calls still using it finish
+        # and its threads exit once it's garbage collected.
+        _thread_pool = ThreadPoolExecutor(max_workers=threads)
+        _thread_pool_size = threads
+    return _thread_pool
+
+
+def _in_threads(threads, function, src, dst, *args, **kwargs):
+    """
+    Calls `function(*args, src, dst, **kwargs)` with chunks of the byte views
+    `src` and `dst`, in up to `threads` threads at once.
+
+    Chunks are at least :data:`_THREAD_CHUNK_SIZE` bytes long and start at
+    multiples of 64 bytes, so that threads don't share cache lines. The
+    threads run in parallel only while the backend releases the GIL, as the
+    speedups do.
+    """
+    if threads < 1:
+        raise ValueError('threads must be at least 1, got {}'.format(threads))
+    chunks = min(threads, len(dst) // _THREAD_CHUNK_SIZE)
+    if chunks <= 1:
+        function(*(args + (src, dst)), **kwargs)
+        return
+    chunk_size = (-(-len(dst) // chunks) + 63) & ~63
+    pool = _threads_pool(threads)
+    futures = []
+    for start in range(0, len(dst), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        futures.append(pool.submit(
+            function, *(args + (src[chunk], dst[chunk])), **kwargs
+        ))
+    for future in futures:
+        future.result()
+
+
+def _region_operation(c, src, dst, add, threads=1):
+    if not isinstance(c, _GF256Base):
+        raise TypeError('{!r} is not a GF256 or GF256LT object'.format(c))
+    src, dst = _regions(src, dst)
+    if isinstance(c, _GF256LTBase):
+        _in_threads(
+            threads, _mul_region, src, dst, c._multiplication_row(c.n),
+            add=add
+        )
+    else:
+        _in_threads(
+            threads, _mul_region_ct, src, dst, c.n, c.irreducible_polynomial,
+            add=add
+        )
+
+
+def mul_region(c, src, dst, threads=1):
+    """
+    Multiplies every byte in `src` with `c` and writes the products to `dst`::
+
+        dst[i] = c * src[i]
+
+    `c` is a :class:`GF256` or :class:`GF256LT` object or an element of a
+    class returned by :func:`field`, the type of which determines how the
+    multiplication is performed. `src` and `dst` are
+    objects of the same size, that support the buffer protocol, such as
+    :class:`bytes` or :class:`bytearray`. `dst` has to be writable, it may be
+    the same object as `src`.
+
+    If the speedups are available, the entire region is processed by a single
+    call into C, during which the GIL is released. With `threads` greater
+    than `1`, large regions are split into chunks of at least a megabyte,
+    which are processed by up to `threads` threads at once.
+    """
+    _region_operation(c, src, dst, add=False, threads=threads)
+
+
+def muladd_region(c, src, dst, threads=1):
+    """
+    Multiplies every byte in `src` with `c` and adds the products to
+    `dst`::
+
+        dst[i] = dst[i] + c * src[i]
+
+    Otherwise works like :func:`mul_region`.
+    """
+    _region_operation(c, src, dst, add=True, threads=threads)
+
+
+def _check_nonzero(data):
+    """
+    Raises :exc:`ZeroDivisionError`, if `data` contains a `0`, with the
+    position of the first one.
+    """
+    position = _find_zero(data)
+    if position != -1:
+        raise ZeroDivisionError(
+            'division by zero at position {}'.format(position)
+        )
+
+
+def _inverse_operation(field, src, dst, many, threads=1):
+    if issubclass(field, _GF256LTBase):
+        _in_threads(threads, _lookup_region, src, dst, field._inverse_table())
+    elif many:
+        dst[:] = src
+        _inverse_many_ct(field.irreducible_polynomial, dst)
+    else:
+        _in_threads(
+            threads, _inverse_region_ct, src, dst, field.irreducible_polynomial
+        )
+
+
+def inverse_region(src, dst, field=GF256, threads=1):
+    """
+    Writes the multiplicative inverse of every byte in `src` to `dst`::
+
+        dst[i] = field(src[i]) ** -1
+
+    `0`, which has no inverse, is mapped to `0`, as in the S-box of AES.
+    `src` and `dst` are like in :func:`mul_region`.
+
+    With the default `field`, :class:`GF256`, every inverse is computed as
+    `src[i] ** 254` with the same sequence of multiplications, so that the
+    runtime doesn't depend on the data. Table based fields, such as
+    :class:`GF256LT`, look the inverses up in a table instead. `threads` is
+    like in :func:`mul_region`.
+    """
+    src, dst = _regions(src, dst)
+    _inverse_operation(field, src, dst, many=False, threads=threads)
+
+
+def inverse_many(buffer, field=GF256, out=None):
+    """
+    Returns a :class:`bytearray` with the multiplicative inverse of every
+    byte in `buffer`, a bytes-like object. If `out` is given, the inverses are
+    written to `out` instead, which is returned. `out` may be `buffer` itself.
+
+    Raises :exc:`ZeroDivisionError` with the position of the first `0` in
+    `buffer`, if there is one.
+
+    With the default `field`, :class:`GF256`, Montgomery's trick is used: The
+    inverses are derived from the products of all prefixes of `buffer` and
+    the inverse of the product of all bytes, which takes three
+    multiplications per byte and a single inversion. Like
+    :func:`inverse_region`, this doesn't use the data as an index into a
+    table. Table based fields, such as :class:`GF256LT`, look the inverses
+    up in a table instead.
+    """
+    src = _byte_view(buffer)
+    _check_nonzero(src)
+    out = _output_buffer(out, len(src))
+    dst = _byte_view(out, writable=True)
+    _inverse_operation(field, src, dst, many=True)
+    return out
+
+
+class GF256Array:
+    """
+    A mutable sequence of :class:`GF256LT` elements, stored as bytes.
+
+    `data` may be an integer, in which case an array of that many zeros is
+    created, a bytes-like object or an iterable of `field` objects. `field`
+    is :class:`GF256LT` by default or a class returned by :func:`field`,
+    :exc:`TypeError` is raised for fields, that aren't table based, like
+    :class:`GF256`.
+
+    Arrays support `+`, `-`, `*` and `/` elementwise, with another array of
+    the same length and field or with a single `field` element. These
+    operations process the entire buffer at once, without creating an object
+    per element, and are performed in a single C loop, if the speedups are
+    available.
+
+    Indexing an array returns `field` objects, slicing returns a new array.
+    Use `bytes()` to get the contents of an array as bytes.
+    """
+
+    #: The :class:`bytearray` storing the elements.
+    data = None
+
+    def __init__(self, data=0, field=GF256LT):
+        if not issubclass(field, _GF256LTBase):
+            raise TypeError(
+                '{} is not a table based field'.format(field.__name__)
+            )
+        self.field = field
+        if isinstance(data, int):
+            self.data = bytearray(data)
+        else:
+            try:
+                self.data = bytearray(memoryview(data).cast('B'))
+            except TypeError:
+                self.data = bytearray(map(self._element_to_int, data))
+
+    def _element_to_int(self, element):
+        if not isinstance(element, self.field):
+            raise TypeError('{!r} is not a {} object'.format(
+                element, self.field.__name__
+            ))
+        return element.n
+
+    def _is_compatible(self, other):
+        return isinstance(other, GF256Array) and other.field is self.field
+
+    def _other_data(self, other):
+        """
+        Returns the data of `other` for use in an elementwise operation with
+        this array.
+        """
+        if len(other) != len(self):
+            raise ValueError(
+                'arrays have different lengths: {} != {}'.format(
+                    len(self), len(other)
+                )
+            )
+        return other.data
+
+    def _add(self, other, dst):
+        if self._is_compatible(other):
+            _add_regions(self.data, self._other_data(other), dst)
+        elif isinstance(other, self.field):
+            _lookup_region(_addition_row(other.n), self.data, dst)
+        else:
+            return NotImplemented
+        return dst
+
+    def _mul(self, other, dst):
+        if self._is_compatible(other):
+            _mul_regions(
+                self.field._multiplication_table(),
+                self.data, self._other_data(other), dst
+            )
+        elif isinstance(other, self.field):
+            mul_region(other, self.data, dst)
+        else:
+            return NotImplemented
+        return dst
+
+    def _truediv(self, other, dst):
+        if self._is_compatible(other):
+            other_data = self._other_data(other)
+            _check_nonzero(other_data)
+            inverses = bytearray(len(other_data))
+            _lookup_region(self.field._inverse_table(), other_data, inverses)
+            _mul_regions(
+                self.field._multiplication_table(), self.data, inverses, dst
+            )
+        elif isinstance(other, self.field):
+            mul_region(other._multiplicative_inverse(), self.data, dst)
+        else:
+            return NotImplemented
+        return dst
+
+    def _operation(self, operation, other, in_place=False):
+        dst = self.data if in_place else bytearray(len(self))
+        if operation(self, other, dst) is NotImplemented:
+            return NotImplemented
+        if in_place:
+            return self
+        result = self.__class__(field=self.field)
+        result.data = dst
+        return result
+
+    def __add__(self, other):
+        return self._operation(GF256Array._add, other)
+
+    __radd__ = __sub__ = __rsub__ = __add__
+
+    def __iadd__(self, other):
+        return self._operation(GF256Array._add, other, in_place=True)
+
+    __isub__ = __iadd__
+
+    def __mul__(self, other):
+        return self._operation(GF256Array._mul, other)
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other):
+        return self._operation(GF256Array._mul, other, in_place=True)
+
+    def __truediv__(self, other):
+        return self._operation(GF256Array._truediv, other)
+
+    def __itruediv__(self, other):
+        return self._operation(GF256Array._truediv, other, in_place=True)
+
+    def __rtruediv__(self, other):
+        if isinstance(other, self.field):
+            _check_nonzero(self.data)
+            result = self.__class__(len(self), field=self.field)
+            _lookup_region(self.field._inverse_table(), self.data, result.data)
+            mul_region(other, result.data, result.data)
+            return result
+        return NotImplemented
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(self.data[index], field=self.field)
+        return self.field._instances[self.data[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            if not self._is_compatible(value):
+                raise TypeError(
+                    '{!r} is not a GF256Array object of the same field'.format(
+                        value
+                    )
+                )
+            self.data[index] = value.data
+        else:
+            self.data[index] = self._element_to_int(value)
+
+    def __iter__(self):
+        return map(self.field._instances.__getitem__, self.data)
+
+    def __bytes__(self):
+        return bytes(self.data)
+
+    def __eq__(self, other):
+        if isinstance(other, GF256Array):
+            return self.field is other.field and self.data == other.data
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self.field is GF256LT:
+            return '{}({!r})'.format(
+                self.__class__.__qualname__, bytes(self.data)
+            )
+        return '{}({!r}, field={})'.format(
+            self.__class__.__qualname__, bytes(self.data),
+            self.field.__qualname__
         )
@@ -0,0 +1,295 @@
+"""
+    gf256.ecc
+    ~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from gf256 import GF256LT, _byte_view, _GF256LTBase, muladd_region
+from gf256.polynomial import Polynomial
+
+
+#: The number of bytes of codewords, whose syndromes are computed together.
+_BLOCK_SIZE = 2 ** 24
+
+#: The number of bytes of codewords, that are transposed together.
+_TRANSPOSE_SIZE = 2 ** 18
+
+
+def _columns(buffer, length, count):
+    """
+    Returns a list of `length` :class:`bytearray` objects, the `j`-th of
+    which contains the byte at position `j` of each of the `count`
+    codewords in `buffer`.
+    """
+    columns = [bytearray(count) for _ in range(length)]
+    # Gathering a position from all codewords at once touches the entire
+    # buffer for every position. Gathering from blocks, that fit into the
+    # cache, is several times faster.
+    block_count = max(_TRANSPOSE_SIZE // length, 1)
+    for start in range(0, count, block_count):
+        block = buffer[start * length:(start + block_count) * length]
+        block = block.tobytes()
+        for j, column in enumerate(columns):
+            column[start:start + block_count] = block[j::length]
+    return columns
+
+
+class ReedSolomon:
+    """
+    A systematic Reed-Solomon error correcting code, that appends
+    `parity_symbols` bytes of parity to data and corrects up to
+    `parity_symbols // 2` corrupted bytes per codeword, without knowing
+    their positions.
+
+    A codeword consists of the data followed by the parity, the first byte
+    being the coefficient of the highest power of `x`. Codewords are
+    multiples of the generator polynomial, which has the roots
+    `alpha ** i` for `i` in `range(parity_symbols)`, `alpha` being the
+    generator of `field`. They are at most 255 bytes long.
+
+    `field` is :class:`~gf256.GF256LT` or another table based field returned
+    by :func:`~gf256.field`. Raises :exc:`ValueError`, if `parity_symbols`
+    is not in `range(1, 255)`, and :exc:`TypeError`, if `field` is not table
+    based.
+    """
+
+    def __init__(self, parity_symbols, field=GF256LT):
+        if not 0 < parity_symbols < 255:
+            raise ValueError('parity_symbols must be in range(1, 255)')
+        if not issubclass(field, _GF256LTBase):
+            raise TypeError(
+                '{} is not a table based field'.format(field.__name__)
+            )
+        self.parity_symbols = parity_symbols
+        self.field = field
+
+        generator_polynomial = Polynomial(b'\1', field=field)
+        for i in range(parity_symbols):
+            generator_polynomial *= Polynomial(
+                bytes([self._power(i), 1]), field=field
+            )
+        #: The generator polynomial as a
+        #: :class:`~gf256.polynomial.Polynomial`.
+        self.generator_polynomial = generator_polynomial
+
+    def _power(self, exponent):
+        """
+        Returns `alpha ** exponent` as an integer.
+        """
+        return self.field.exponentiation_table[exponent % 255]
+
+    def encode(self, data):
+        """
+        Returns a codeword, that consists of the bytes-like object `data`
+        followed by the parity, as a :class:`bytearray`.
+
+        Raises :exc:`ValueError`, if the codeword would be longer than 255
+        bytes.
+        """
+        data = _byte_view(data)
+        if len(data) + self.parity_symbols > 255:
+            raise ValueError(
+                'data must be at most {} bytes long, got {}'.format(
+                    255 - self.parity_symbols, len(data)
+                )
+            )
+        # The data is shifted by `parity_symbols` and the remainder of the
+        # division by the generator polynomial added to it, which makes the
+        # codeword a multiple of the generator polynomial.
+        shifted = Polynomial(
+            bytes(self.parity_symbols) + data.tobytes()[::-1],
+            field=self.field
+        )
+        remainder = shifted % self.generator_polynomial
+        return bytearray(data) + remainder.coefficients.ljust(
+            self.parity_symbols, b'\0'
+        )[::-1]
+
+    def _check_length(self, buffer, length):
+        if length is None:
+            length = len(buffer)
+        if not self.parity_symbols <= length <= 255:
+            raise ValueError(
+                'codewords must be between {} and 255 bytes long, '
+                'got {}'.format(self.parity_symbols, length)
+            )
+        if len(buffer) % length:
+            raise ValueError(
+                'buffer is not a multiple of {} bytes long'.format(length)
+            )
+        return length
+
+    def syndromes(self, buffer, length=None):
+        """
+        Returns the syndromes of the codewords in `buffer`, a bytes-like
+        object that contains codewords of `length` bytes back to back.
+        `length` defaults to `len(buffer)`, a single codeword.
+
+        The result is a list of `parity_symbols` :class:`bytearray` objects,
+        `result[i][k]` is the codeword `k` evaluated at `alpha ** i`. All
+        syndromes of a codeword are `0`, if and only if it has no errors that
+        are detectable.
+
+        The syndromes of many codewords are computed at once: Every position
+        of the codewords is gathered into one region, which is added to each
+        syndrome with :func:`~gf256.muladd_region`. Codewords, that are clean,
+        don't need any further work in :meth:`correct`.
+        """
+        buffer = _byte_view(buffer)
+        length = self._check_length(buffer, length)
+        count = len(buffer) // length
+        syndromes = [bytearray(count) for _ in range(self.parity_symbols)]
+        if count * 8 < length * self.parity_symbols:
+            # Evaluating the codewords one by one takes one call per
+            # codeword, instead of one per position and syndrome, which is
+            # faster for a few codewords.
+            points = bytes(
+                self._power(i) for i in range(self.parity_symbols)
+            )
+            for k in range(count):
+                codeword = buffer[k * length:(k + 1) * length].tobytes()
+                values = Polynomial(
+                    codeword[::-1], field=self.field
+                ).evaluate(points)
+                for syndrome, value in zip(syndromes, values):
+                    syndrome[k] = value
+            return syndromes
+        coefficients = [
+            [self.field(self._power(i * degree)) for degree in range(length)]
+            for i in range(self.parity_symbols)
+        ]
+        block_count = max(_BLOCK_SIZE // length, 1)
+        for start in range(0, count, block_count):
+            end = min(start + block_count, count)
+            columns = _columns(
+                buffer[start * length:end * length], length, end - start
+            )
+            for i, syndrome in enumerate(syndromes):
+                syndrome = memoryview(syndrome)[start:end]
+                for j, column in enumerate(columns):
+                    muladd_region(
+                        coefficients[i][length - 1 - j], column, syndrome
+                    )
+        return syndromes
+
+    def _berlekamp_massey(self, syndromes):
+        """
+        Returns the error locator polynomial, that has the inverses of
+        `alpha ** degree` as roots, `degree` being the degree of each
+        corrupted coefficient.
+        """
+        field = self.field
+        locator = previous = Polynomial(b'\1', field=field)
+        errors = 0
+        shift = 1
+        previous_discrepancy = field(1)
+        for n in range(len(syndromes)):
+            coefficients = locator.coefficients.ljust(errors + 1, b'\0')
+            discrepancy = field(syndromes[n])
+            for i in range(1, errors + 1):
+                discrepancy += field(coefficients[i]) * field(syndromes[n - i])
+            if discrepancy == field(0):
+                shift += 1
+                continue
+            update = Polynomial(
+                bytes(shift) + previous.coefficients, field=field
+            ) * (discrepancy / previous_discrepancy)
+            if 2 * errors <= n:
+                previous = locator
+                errors = n + 1 - errors
+                previous_discrepancy = discrepancy
+                shift = 1
+            else:
+                shift += 1
+            locator = locator - update
+        return locator
+
+    def _correct_codeword(self, k, codeword, syndromes, chien_points):
+        """
+        Corrects `codeword`, the codeword `k` of a buffer, in place and
+        returns the number of corrected bytes.
+
+        Raises :exc:`ValueError`, if there are too many errors.
+        """
+        field = self.field
+        locator = self._berlekamp_massey(syndromes)
+        # The roots of the locator are found by evaluating it at the inverse
+        # of `alpha ** degree` of every position at once.
+        values = locator.evaluate(chien_points)
+        positions = [j for j, value in enumerate(values) if value == 0]
+        if 2 * locator.degree > self.parity_symbols or (
+            len(positions) != locator.degree
+        ):
+            raise ValueError(
+                'codeword {} has too many errors to correct'.format(k)
+            )
+
+        # Forney's algorithm computes the magnitudes from the evaluator and
+        # the formal derivative of the locator.
+        evaluator = Polynomial(
+            (Polynomial(syndromes, field=field) * locator).coefficients[
+                :self.parity_symbols
+            ],
+            field=field
+        )
+        derivative = Polynomial(bytes(
+            0 if i % 2 else coefficient
+            for i, coefficient in enumerate(locator.coefficients[1:])
+        ), field=field)
+        for j in positions:
+            x = field(self._power(len(codeword) - 1 - j))
+            point = field(chien_points[j])
+            magnitude = x * evaluator(point) / derivative(point)
+            codeword[j] ^= magnitude.n
+        return len(positions)
+
+    def correct(self, buffer, length=None):
+        """
+        Corrects the codewords in `buffer` in place and returns the number of
+        corrected bytes.
+
+        `buffer` is a writable buffer, that contains codewords of `length`
+        bytes back to back, like in :meth:`syndromes`. Codewords whose
+        syndromes are all `0` are left as they are, the error locator of the
+        others is found with the Berlekamp-Massey algorithm, its roots with a
+        Chien search and the error magnitudes with Forney's algorithm.
+
+        Raises :exc:`ValueError` with the index of the first codeword that
+        has more errors than can be corrected. Codewords before it have been
+        corrected at that point.
+        """
+        view = _byte_view(buffer, writable=True)
+        length = self._check_length(view, length)
+        syndromes = self.syndromes(view, length)
+        zeros = bytes(len(view) // length)
+        corrupted = set()
+        for syndrome in syndromes:
+            if syndrome != zeros:
+                corrupted.update(
+                    k for k, value in enumerate(syndrome) if value
+                )
+        if not corrupted:
+            return 0
+
+        chien_points = bytes(
+            self._power(j + 1 - length) for j in range(length)
+        )
+        corrected = 0
+        for k in sorted(corrupted):
+            corrected += self._correct_codeword(
+                k, view[k * length:(k + 1) * length],
+                bytes(syndrome[k] for syndrome in syndromes), chien_points
+            )
+        return corrected
+
+    def decode(self, codeword):
+        """
+        Returns the data of a single `codeword`, a bytes-like object, as a
+        :class:`bytearray`, after correcting it.
+
+        Raises :exc:`ValueError`, if there are too many errors to correct.
+        """
+        codeword = bytearray(codeword)
+        self.correct(codeword)
+        return codeword[:len(codeword) - self.parity_symbols]
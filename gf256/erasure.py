@@ -0,0 +1,218 @@
+"""
+    gf256.erasure
+    ~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from functools import lru_cache
+
+from gf256 import (
+    GF256LT, _byte_view, _load_cache, _output_buffer, _store_cache,
+    inverse_many, mul_region, muladd_region
+)
+from gf256.matrix import Matrix
+
+
+class ReedSolomon:
+    """
+    A systematic Reed-Solomon erasure code, that turns `data_shards` shards
+    of data into `parity_shards` additional shards of parity, such that the
+    data can be reconstructed from any `data_shards` of the shards.
+
+    The generator matrix is an identity matrix, so that the data shards are
+    kept as they are, on top of a Cauchy matrix. Every square submatrix of a
+    Cauchy matrix is invertible, which guarantees that any combination of
+    shards can be used for reconstruction. Shards are processed using
+    :func:`~gf256.muladd_region`.
+
+    `field` is the class of the elements used, :class:`~gf256.GF256LT` by
+    default. Raises :exc:`ValueError`, if there are no data shards or more
+    than 256 shards in total.
+
+    The decode matrices used by :meth:`reconstruct` are kept in a least
+    recently used cache, keyed by the shards that are present, so that
+    reconstructing many stripes with the same missing shards inverts a
+    matrix only once. `cache_size` is the maximum number of matrices kept,
+    `None` for no limit and `0` to disable the cache. Use
+    :meth:`cache_info` to find out how well the cache works.
+    """
+
+    def __init__(self, data_shards, parity_shards, field=GF256LT,
+                 cache_size=128):
+        if data_shards < 1:
+            raise ValueError('at least one data shard is required')
+        if parity_shards < 0:
+            raise ValueError('parity_shards must not be negative')
+        if data_shards + parity_shards > 256:
+            raise ValueError('at most 256 shards are supported')
+        self.data_shards = data_shards
+        self.parity_shards = parity_shards
+        self.field = field
+
+        rows = [
+            [field(int(i == j)) for j in range(data_shards)]
+            for i in range(data_shards)
+        ]
+        # The Cauchy matrix has `1 / ((data_shards + i) ^ j)` in row `i` and
+        # column `j`, all of which are inverted at once.
+        cauchy = inverse_many(bytes(
+            (data_shards + i) ^ j
+            for i in range(parity_shards)
+            for j in range(data_shards)
+        ), field=field)
+        rows += [
+            cauchy[i * data_shards:(i + 1) * data_shards]
+            for i in range(parity_shards)
+        ]
+        #: The `(data_shards + parity_shards) x data_shards` generator matrix.
+        #: Multiplying it with the data shards gives you all shards.
+        self.matrix = Matrix(rows, field=field)
+        self._decode_rows = lru_cache(maxsize=cache_size)(self._decode_rows)
+
+    @property
+    def total_shards(self):
+        """
+        The number of data and parity shards combined.
+        """
+        return self.data_shards + self.parity_shards
+
+    def _combine(self, coefficients, sources, dst):
+        """
+        Writes the linear combination of `sources` with `coefficients`, a
+        bytes-like object, to `dst`.
+        """
+        first = True
+        for coefficient, source in zip(coefficients, sources):
+            if first:
+                mul_region(self.field(coefficient), source, dst)
+                first = False
+            else:
+                muladd_region(self.field(coefficient), source, dst)
+
+    def _row(self, matrix, i):
+        columns = matrix.shape[1]
+        return bytes(matrix)[i * columns:(i + 1) * columns]
+
+    def _decode_rows(self, present):
+        """
+        Returns the rows of the inverse of the generator matrix rows of the
+        shards at the indices `present`, as bytes-like objects.
+
+        The matrix is read from or written to the cache set with
+        :func:`~gf256.set_cache_directory`, if there is one. Rows read from
+        the cache are read-only views of the mapped cache entry, which all
+        processes using the cache share.
+        """
+        # The matrices only depend on the irreducible polynomial, not on the
+        # implementation of the field.
+        name = 'reed-solomon-{:#x}-{}-{}-{:x}'.format(
+            self.field.irreducible_polynomial, self.data_shards,
+            self.parity_shards, sum(1 << i for i in present)
+        )
+        size = self.data_shards * self.data_shards
+        mapping = _load_cache(name, size)
+        if mapping is None:
+            data = bytes(Matrix(
+                [self._row(self.matrix, i) for i in present], field=self.field
+            ).inverse())
+            _store_cache(name, data)
+        else:
+            # The mapping stays open for as long as the rows exist.
+            data = memoryview(mapping)
+        return [
+            data[i * self.data_shards:(i + 1) * self.data_shards]
+            for i in range(self.data_shards)
+        ]
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, maximum and current size of the cache of
+        decode matrices as a named tuple, like
+        :meth:`functools.lru_cache` does.
+        """
+        return self._decode_rows.cache_info()
+
+    def cache_clear(self):
+        """
+        Removes all decode matrices from the cache and resets the counters.
+        """
+        self._decode_rows.cache_clear()
+
+    def _check_sizes(self, shards):
+        sizes = {len(_byte_view(shard)) for shard in shards}
+        if len(sizes) > 1:
+            raise ValueError('shards have different sizes')
+        return sizes.pop()
+
+    def _check_count(self, shards, expected, name='shards'):
+        if len(shards) != expected:
+            raise ValueError('expected {} {}, got {}'.format(
+                expected, name, len(shards)
+            ))
+
+    def encode(self, data, out=None):
+        """
+        Returns a list of parity shards, given a sequence of data shards.
+
+        The data shards are bytes-like objects of equal size, the parity
+        shards are :class:`bytearray` objects of the same size. If `out` is
+        given, it is a sequence of writable buffers, such as memory mapped
+        files, into which the parity shards are written instead. `out` is
+        then returned as a list.
+        """
+        self._check_count(data, self.data_shards, 'data shards')
+        size = self._check_sizes(data)
+        if out is None:
+            out = [None] * self.parity_shards
+        self._check_count(out, self.parity_shards, 'parity shards')
+        parity = []
+        for i, shard in enumerate(out, self.data_shards):
+            shard = _output_buffer(shard, size)
+            self._combine(self._row(self.matrix, i), data, shard)
+            parity.append(shard)
+        return parity
+
+    def reconstruct(self, shards, out=None):
+        """
+        Reconstructs missing shards in place.
+
+        `shards` is a list of all data shards followed by all parity shards,
+        with missing shards being `None`. Each missing shard is replaced with
+        a reconstructed :class:`bytearray`. If `out` is given, it is a
+        sequence as long as `shards`, and missing shards are written to the
+        writable buffers at the same positions in `out` instead, which then
+        replace the missing shards. Entries of `out` for present shards are
+        ignored.
+
+        Raises :exc:`ValueError`, if fewer than `data_shards` shards are
+        present.
+        """
+        self._check_count(shards, self.total_shards)
+        if out is None:
+            out = [None] * self.total_shards
+        self._check_count(out, self.total_shards)
+        present = [i for i, shard in enumerate(shards) if shard is not None]
+        if len(present) < self.data_shards:
+            raise ValueError(
+                'at least {} shards are required, got {}'.format(
+                    self.data_shards, len(present)
+                )
+            )
+        if len(present) == self.total_shards:
+            return
+        size = self._check_sizes([shards[i] for i in present])
+
+        present = tuple(present[:self.data_shards])
+        sources = [shards[i] for i in present]
+        decode_rows = self._decode_rows(present)
+        for i in range(self.data_shards):
+            if shards[i] is None:
+                shards[i] = _output_buffer(out[i], size)
+                self._combine(decode_rows[i], sources, shards[i])
+
+        data = shards[:self.data_shards]
+        for i in range(self.data_shards, self.total_shards):
+            if shards[i] is None:
+                shards[i] = _output_buffer(out[i], size)
+                self._combine(self._row(self.matrix, i), data, shards[i])
@@ -0,0 +1,280 @@
+"""
+    gf256.instrumentation
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import sys
+from collections import namedtuple
+from time import perf_counter
+
+import gf256
+from gf256 import GF256, GF256LT, _GF256Base, _GF256LTBase, matrix, polynomial
+
+
+#: The number of calls of an operation and the number of bytes they
+#: processed, as returned by :func:`counters`.
+Count = namedtuple('Count', ['calls', 'bytes'])
+
+#: The methods of elements, that are instrumented, and the names of the
+#: operations they perform.
+_METHODS = [
+    ('__mul__', 'mul'),
+    ('__truediv__', 'div'),
+    ('__pow__', 'pow'),
+    ('_multiplicative_inverse', 'inverse'),
+]
+
+_counts = {}
+_histograms = {}
+_hooks = []
+
+#: Maps `(owner, name)` to the original attribute, while instrumentation is
+#: enabled.
+_originals = {}
+
+#: Whether durations are measured, while instrumentation is enabled.
+_timing = False
+
+
+def _record(operation, backend, size, duration):
+    key = operation, backend
+    count = _counts.get(key, (0, 0))
+    _counts[key] = Count(count[0] + 1, count[1] + size)
+    if duration is not None:
+        bucket = 1 << int(duration * 1e9).bit_length()
+        histogram = _histograms.setdefault(key, {})
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    for hook in _hooks:
+        hook(operation, backend, size, duration)
+
+
+def _instrumented(function, describe, timing):
+    """
+    Returns a function that calls `function` and records the operation,
+    backend and size, that `describe` returns given the same arguments.
+    """
+    if timing:
+        def instrumented(*args, **kwargs):
+            start = perf_counter()
+            result = function(*args, **kwargs)
+            duration = perf_counter() - start
+            if result is not NotImplemented:
+                _record(*describe(*args, **kwargs), duration=duration)
+            return result
+    else:
+        def instrumented(*args, **kwargs):
+            result = function(*args, **kwargs)
+            if result is not NotImplemented:
+                _record(*describe(*args, **kwargs), duration=None)
+            return result
+    return instrumented
+
+
+def _describe_method(operation, backend):
+    def describe(self, *args):
+        return operation, backend or self.__class__.__qualname__, 1
+    return describe
+
+
+class _Backend:
+    """
+    Performs the bulk `operation` on `size` bytes like `backend`, counting
+    it.
+    """
+
+    def __init__(self, backend, operation, size, timing):
+        self.name = backend.name
+        setattr(self, operation, _instrumented(
+            getattr(backend, operation),
+            lambda *args, **kwargs: (operation, backend.name, size), timing
+        ))
+
+
+def _instrument_bulk(bulk, timing):
+    def instrumented(operation, size):
+        return _Backend(bulk(operation, size), operation, size, timing)
+    return instrumented
+
+
+#: The functions of the speedups, that :mod:`gf256.matrix` and
+#: :mod:`gf256.polynomial` call directly, and the number of bytes they
+#: process, given their arguments.
+_SPEEDUPS_FUNCTIONS = {
+    'matrix_mul': lambda table, a, b, product, rows, inner, columns: (
+        rows * inner * columns
+    ),
+    'matrix_reduce': lambda table, inverses, data, rows, columns, pivots: (
+        rows * columns
+    ),
+    'poly_eval': lambda table, coefficients, length, points, results, count: (
+        length * count
+    ),
+    'poly_mul': lambda table, a, a_length, b, b_length, result: (
+        a_length * b_length
+    ),
+    'poly_divmod': (
+        lambda table, inverses, remainder, remainder_length, divisor,
+        divisor_length, quotient:
+        (remainder_length - divisor_length + 1) * divisor_length
+    ),
+    'poly_interpolate_newton': (
+        lambda table, inverses, xs, ys, length, coefficients: length * length
+    ),
+}
+
+
+class _Speedups:
+    """
+    Provides the functions of the `speedups`, counting those in
+    :data:`_SPEEDUPS_FUNCTIONS`.
+    """
+
+    def __init__(self, speedups, timing):
+        self._speedups = speedups
+        self._timing = timing
+
+    def __getattr__(self, name):
+        function = getattr(self._speedups, name)
+        if name not in _SPEEDUPS_FUNCTIONS:
+            return function
+
+        def describe(*args):
+            return name, 'speedups', _SPEEDUPS_FUNCTIONS[name](*args)
+        return _instrumented(function, describe, self._timing)
+
+
+def _instrument_method(describe):
+    def instrument(method, timing):
+        return _instrumented(method, describe, timing)
+    return instrument
+
+
+def _patches():
+    """
+    Yields `(owner, name, instrument)` for every attribute, that is replaced
+    with `instrument(original, timing)`.
+    """
+    for owner in [_GF256Base, GF256, _GF256LTBase, GF256LT]:
+        # Operations of these classes are performed in C, if the speedups
+        # are available. The others are always performed in Python.
+        backend = None
+        if gf256.backend() == 'speedups' and owner in (GF256, GF256LT):
+            backend = 'speedups'
+        for name, operation in _METHODS:
+            if name in owner.__dict__:
+                yield owner, name, _instrument_method(
+                    _describe_method(operation, backend)
+                )
+    # All bulk operations get the backend, that performs them, from
+    # `_bulk`, which takes the calibration into account.
+    yield gf256, '_bulk', _instrument_bulk
+    if gf256._speedups is not None:
+        # These modules call functions of the speedups directly. NumPy is
+        # only imported, if it's used already.
+        for module in [matrix, polynomial, sys.modules.get('gf256.np')]:
+            if module is not None:
+                yield module, '_speedups', _Speedups
+
+
+def enable(timing=False):
+    """
+    Enables the instrumentation.
+
+    Multiplications, divisions, exponentiations and inversions of elements
+    are then counted, along with the bytes they process, for each backend,
+    `'speedups'` for operations performed in C, otherwise the name of the
+    class of the elements, such as `'GF256'` or `'GF256LT'`. Operations
+    performed by other operations are counted as well, a division for
+    example is also counted as an inversion and a multiplication.
+
+    Bulk operations on entire buffers, such as those of
+    :func:`~gf256.mul_region`, :class:`~gf256.GF256Array` or
+    :class:`~gf256.maps.ElementMap`, are counted with the names
+    :func:`~gf256.calibrate` uses, like `'mul_region'`, `'mul_region_ct'` or
+    `'lookup_region'`, and the name of the backend, that performed them,
+    which may depend on the size of the buffer after calibrating. The
+    functions of the speedups, that :mod:`gf256.matrix` and
+    :mod:`gf256.polynomial` call, are counted as well, like `'matrix_mul'`
+    or `'poly_mul'`, their bytes being the number of multiplications.
+
+    If `timing` is true, the duration of each operation is measured as
+    well, see :func:`histograms`.
+
+    Instrumentation works by replacing methods and functions with variants
+    that count, which are removed again by :func:`disable`, so that there
+    is no overhead at all while it's disabled. Selecting another backend
+    with :func:`~gf256.select_backend` while it's enabled instruments the
+    methods of that backend instead.
+    """
+    global _timing
+    disable()
+    _timing = timing
+    for owner, name, instrument in _patches():
+        original = getattr(owner, name)
+        _originals[owner, name] = original
+        setattr(owner, name, instrument(original, timing))
+
+
+def disable():
+    """
+    Disables the instrumentation, keeping the counters.
+    """
+    for (owner, name), original in _originals.items():
+        setattr(owner, name, original)
+    _originals.clear()
+
+
+def is_enabled():
+    """
+    Returns `True`, if the instrumentation is enabled.
+    """
+    return bool(_originals)
+
+
+def reset():
+    """
+    Resets all counters and histograms.
+    """
+    _counts.clear()
+    _histograms.clear()
+
+
+def counters():
+    """
+    Returns a dictionary, that maps `(operation, backend)` to a
+    :class:`Count` of the calls and the bytes processed. Operations on
+    single elements process one byte.
+    """
+    return dict(_counts)
+
+
+def histograms():
+    """
+    Returns a dictionary, that maps `(operation, backend)` to a histogram of
+    the durations of the operation, if :func:`enable` was called with
+    `timing=True`.
+
+    A histogram is a dictionary, that maps powers of two to the number of
+    operations that took less than that many nanoseconds, but at least
+    half as many.
+    """
+    return {key: dict(histogram) for key, histogram in _histograms.items()}
+
+
+def add_hook(hook):
+    """
+    Adds a callable, that is called as `hook(operation, backend, size,
+    duration)` for every counted operation, for example to forward it to a
+    metrics exporter. `size` is the number of bytes processed and `duration`
+    the duration in seconds or `None`, if timing is disabled.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """
+    Removes a hook added with :func:`add_hook`.
+    """
+    _hooks.remove(hook)
@@ -0,0 +1,158 @@
+"""
+    gf256.maps
+    ~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from functools import lru_cache
+
+from gf256 import GF256LT, _GF256Base, _GF256LTBase, _lookup_region, _regions
+
+
+@lru_cache(maxsize=256)
+def _function_table(function, field):
+    table = bytearray(256)
+    for n in range(256):
+        value = function(field(n))
+        if not isinstance(value, field):
+            raise TypeError('{!r} is not a {} object'.format(
+                value, field.__name__
+            ))
+        table[n] = value.n
+    return bytes(table)
+
+
+@lru_cache(maxsize=256)
+def _power_table(exponent, field):
+    # `0` has no inverse, it's mapped to `0` like by `inverse_region`.
+    zero = 1 if exponent == 0 else 0
+    return bytes([zero]) + bytes(
+        (field(n) ** exponent).n for n in range(1, 256)
+    )
+
+
+class ElementMap:
+    """
+    A function `function`, that maps elements of `field` to elements of
+    `field`, compiled into a table of its 256 values. `field` is
+    :class:`~gf256.GF256LT` by default or any other class of elements.
+
+    The function is called once for each element, when the map is created,
+    the table is memoized for the same `function` and `field`. Applying the
+    map to a buffer with :meth:`apply` only looks up each byte in the table,
+    which is as fast as :meth:`bytes.translate` or the speedups. Maps are
+    composed with :meth:`compose`, which composes their tables.
+
+    Maps for common functions are created with :meth:`multiplication`,
+    :meth:`inverse` and :meth:`power`, those of table based fields use the
+    tables of the field. Note that looking up elements in a table takes
+    time that depends on their value, even for :class:`~gf256.GF256`.
+    """
+
+    def __init__(self, function, field=GF256LT):
+        self.field = field
+        #: The 256 byte long table as :class:`bytes`, that maps every
+        #: element to its image.
+        self.table = _function_table(function, field)
+
+    @classmethod
+    def from_table(cls, table, field=GF256LT):
+        """
+        Returns a map, that maps every element `n` to `field(table[n])`.
+
+        Raises :exc:`ValueError`, if the bytes-like object `table` is not
+        256 bytes long.
+        """
+        table = memoryview(table).cast('B').tobytes()
+        if len(table) != 256:
+            raise ValueError(
+                'table must be 256 bytes long, got {}'.format(len(table))
+            )
+        element_map = cls.__new__(cls)
+        element_map.field = field
+        element_map.table = table
+        return element_map
+
+    @classmethod
+    def multiplication(cls, c):
+        """
+        Returns the map, that multiplies with the element `c`, of the field
+        of `c`.
+        """
+        if not isinstance(c, _GF256Base):
+            raise TypeError('{!r} is not a GF256 or GF256LT object'.format(c))
+        field = c.__class__
+        if issubclass(field, _GF256LTBase):
+            return cls.from_table(field._multiplication_row(c.n), field)
+        return cls(c.__mul__, field)
+
+    @classmethod
+    def inverse(cls, field=GF256LT):
+        """
+        Returns the map, that maps every element to its multiplicative
+        inverse and `0` to `0`.
+        """
+        if issubclass(field, _GF256LTBase):
+            return cls.from_table(field._inverse_table(), field)
+        return cls.power(-1, field)
+
+    @classmethod
+    def power(cls, exponent, field=GF256LT):
+        """
+        Returns the map, that raises every element to the integer power
+        `exponent`. Squaring, the Frobenius automorphism, is `power(2)`.
+
+        Negative exponents are powers of the inverse, `0` is then mapped to
+        `0`.
+        """
+        return cls.from_table(_power_table(exponent, field), field)
+
+    def compose(self, other):
+        """
+        Returns the map, that applies `other` first and then this map.
+
+        Raises :exc:`TypeError`, if the maps have different fields.
+        """
+        if self.field is not other.field:
+            raise TypeError(
+                '{!r} and {!r} have different fields'.format(self, other)
+            )
+        return self.from_table(other.table.translate(self.table), self.field)
+
+    def apply(self, src, dst):
+        """
+        Maps every byte in `src` and writes the images to `dst`::
+
+            dst[i] = map(src[i])
+
+        `src` and `dst` are objects of the same size, that support the buffer
+        protocol, like for :func:`~gf256.mul_region`. `dst` has to be
+        writable, it may be the same object as `src`.
+        """
+        src, dst = _regions(src, dst)
+        _lookup_region(self.table, src, dst)
+
+    def __call__(self, element):
+        if not isinstance(element, self.field):
+            raise TypeError('{!r} is not a {} object'.format(
+                element, self.field.__name__
+            ))
+        return self.field(self.table[element.n])
+
+    def __eq__(self, other):
+        if isinstance(other, ElementMap):
+            return self.field is other.field and self.table == other.table
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.field, self.table))
+
+    def __repr__(self):
+        if self.field is GF256LT:
+            return '{}.from_table({!r})'.format(
+                self.__class__.__qualname__, self.table
+            )
+        return '{}.from_table({!r}, field={})'.format(
+            self.__class__.__qualname__, self.table, self.field.__qualname__
+        )
@@ -0,0 +1,316 @@
+"""
+    gf256.matrix
+    ~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from gf256 import (
+    GF256LT, GF256Array, _ffi, _GF256LTBase, _speedups, _speedups_selected,
+    mul_region, muladd_region
+)
+
+
+class Matrix:
+    """
+    Represents a matrix with elements in `GF(2 ** 8)`.
+
+    `rows` is an iterable of rows, each of which is either a bytes-like object
+    or an iterable of `field` objects. All rows must have the same length.
+    `field` is the class of the elements, :class:`~gf256.GF256LT` by default.
+    Any class returned by :func:`~gf256.field` is table based as well.
+
+    The elements are stored contiguously, row by row, as bytes. Matrices can
+    be multiplied with `*` by another matrix, a :class:`~gf256.GF256Array`
+    that is treated as a column vector, or a single element. Row operations
+    work on entire rows at once, using the same kernels as
+    :func:`~gf256.mul_region`. With the speedups and a table based `field`,
+    products and Gaussian elimination are performed entirely in C.
+
+    Use `matrix[i, j]` to get or set the element in row `i` and column `j`.
+    """
+
+    def __init__(self, rows=(), field=GF256LT):
+        self.field = field
+        data = bytearray()
+        lengths = set()
+        row_count = 0
+        for row in rows:
+            try:
+                row = memoryview(row).cast('B')
+            except TypeError:
+                row = bytes(map(self._element_to_int, row))
+            lengths.add(len(row))
+            data += row
+            row_count += 1
+        if len(lengths) > 1:
+            raise ValueError('rows have different lengths')
+        self._data = data
+        self.shape = (row_count, lengths.pop() if lengths else 0)
+
+    @classmethod
+    def _from_data(cls, rows, columns, data, field):
+        matrix = cls(field=field)
+        matrix._data = bytearray(data)
+        matrix.shape = (rows, columns)
+        return matrix
+
+    @classmethod
+    def zeros(cls, rows, columns, field=GF256LT):
+        """
+        Returns a `rows` x `columns` matrix, all elements of which are `0`.
+        """
+        return cls._from_data(rows, columns, bytes(rows * columns), field)
+
+    @classmethod
+    def identity(cls, n, field=GF256LT):
+        """
+        Returns the `n` x `n` identity matrix.
+        """
+        matrix = cls.zeros(n, n, field=field)
+        matrix._data[::n + 1] = bytes([1]) * n
+        return matrix
+
+    def _element_to_int(self, element):
+        if not isinstance(element, self.field):
+            raise TypeError('{!r} is not a {} object'.format(
+                element, self.field.__name__
+            ))
+        return element.n
+
+    def _index(self, index):
+        row, column = index
+        rows, columns = self.shape
+        if not (0 <= row < rows and 0 <= column < columns):
+            raise IndexError('{!r} is out of range'.format(index))
+        return row * columns + column
+
+    def _row(self, data, index):
+        columns = self.shape[1]
+        return memoryview(data)[index * columns:(index + 1) * columns]
+
+    def _uses_speedups(self):
+        return _speedups_selected() and issubclass(self.field, _GF256LTBase)
+
+    def _multiply(self, other_data, other_columns):
+        """
+        Returns the data of the product with a matrix, that has as many rows
+        as this one has columns.
+        """
+        rows, inner = self.shape
+        product = bytearray(rows * other_columns)
+        if self._uses_speedups():
+            _speedups.matrix_mul(
+                _ffi.from_buffer(self.field._multiplication_table()),
+                _ffi.from_buffer(self._data), _ffi.from_buffer(other_data),
+                _ffi.from_buffer(product),
+                rows, inner, other_columns
+            )
+        else:
+            other_data = memoryview(other_data)
+            product_view = memoryview(product)
+            for i in range(rows):
+                product_row = product_view[
+                    i * other_columns:(i + 1) * other_columns
+                ]
+                for k in range(inner):
+                    factor = self._data[i * inner + k]
+                    if factor:
+                        muladd_region(
+                            self.field(factor),
+                            other_data[
+                                k * other_columns:(k + 1) * other_columns
+                            ],
+                            product_row
+                        )
+        return product
+
+    def _reduce(self, pivot_columns):
+        """
+        Transforms the matrix in place into reduced row echelon form, using
+        the first `pivot_columns` columns as pivots, and returns the rank.
+        """
+        rows, columns = self.shape
+        if self._uses_speedups():
+            return _speedups.matrix_reduce(
+                _ffi.from_buffer(self.field._multiplication_table()),
+                self.field._inverse_table(),
+                _ffi.from_buffer(self._data),
+                rows, columns, pivot_columns
+            )
+        data = self._data
+        rank = 0
+        for column in range(pivot_columns):
+            if rank == rows:
+                break
+            for row in range(rank, rows):
+                if data[row * columns + column]:
+                    break
+            else:
+                continue
+            if row != rank:
+                pivot_row = self._row(data, rank).tobytes()
+                self._row(data, rank)[:] = self._row(data, row)
+                self._row(data, row)[:] = pivot_row
+            pivot_row = self._row(data, rank)[column:]
+            mul_region(
+                self.field(pivot_row[0])._multiplicative_inverse(),
+                pivot_row, pivot_row
+            )
+            for row in range(rows):
+                factor = data[row * columns + column]
+                if row != rank and factor:
+                    muladd_region(
+                        self.field(factor), pivot_row,
+                        self._row(data, row)[column:]
+                    )
+            rank += 1
+        return rank
+
+    def _augmented(self, other_data, other_columns):
+        """
+        Returns the matrix `[self | other]`.
+        """
+        rows, columns = self.shape
+        data = bytearray()
+        for row in range(rows):
+            data += self._row(self._data, row)
+            data += other_data[
+                row * other_columns:(row + 1) * other_columns
+            ]
+        return self._from_data(rows, columns + other_columns, data, self.field)
+
+    def _right_columns(self, start):
+        """
+        Returns the data of the columns starting with `start`.
+        """
+        data = bytearray()
+        for row in range(self.shape[0]):
+            data += self._row(self._data, row)[start:]
+        return data
+
+    def copy(self):
+        """
+        Returns a copy of the matrix.
+        """
+        return self._from_data(*self.shape, data=self._data, field=self.field)
+
+    def rank(self):
+        """
+        Returns the rank of the matrix.
+        """
+        return self.copy()._reduce(self.shape[1])
+
+    def inverse(self):
+        """
+        Returns the inverse of the matrix, such that
+        `matrix * matrix.inverse()` is the identity matrix.
+
+        Raises :exc:`ValueError`, if the matrix is not square or singular.
+        """
+        rows, columns = self.shape
+        if rows != columns:
+            raise ValueError('{}x{} matrix is not square'.format(*self.shape))
+        identity = self.identity(rows, field=self.field)
+        augmented = self._augmented(identity._data, columns)
+        if augmented._reduce(columns) < rows:
+            raise ValueError('matrix is singular')
+        return self._from_data(
+            rows, columns, augmented._right_columns(columns), self.field
+        )
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix) and other.field is self.field:
+            if self.shape[1] != other.shape[0]:
+                raise ValueError('cannot multiply {}x{} and {}x{}'.format(
+                    *self.shape + other.shape
+                ))
+            return self._from_data(
+                self.shape[0], other.shape[1],
+                self._multiply(other._data, other.shape[1]), self.field
+            )
+        elif isinstance(other, GF256Array) and other.field is self.field:
+            if self.shape[1] != len(other):
+                raise ValueError(
+                    'cannot multiply {}x{} matrix and vector of length '
+                    '{}'.format(*self.shape + (len(other), ))
+                )
+            result = GF256Array(field=self.field)
+            result.data = self._multiply(other.data, 1)
+            return result
+        elif isinstance(other, self.field):
+            data = bytearray(len(self._data))
+            mul_region(other, self._data, data)
+            return self._from_data(*self.shape, data=data, field=self.field)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, self.field):
+            return self * other
+        return NotImplemented
+
+    def __getitem__(self, index):
+        return self.field(self._data[self._index(index)])
+
+    def __setitem__(self, index, value):
+        self._data[self._index(index)] = self._element_to_int(value)
+
+    def __bytes__(self):
+        return bytes(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix):
+            return (
+                self.field is other.field and
+                self.shape == other.shape and
+                self._data == other._data
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        rows = [
+            self._row(self._data, row).tobytes()
+            for row in range(self.shape[0])
+        ]
+        if self.field is GF256LT:
+            return '{}({!r})'.format(self.__class__.__qualname__, rows)
+        return '{}({!r}, field={})'.format(
+            self.__class__.__qualname__, rows, self.field.__qualname__
+        )
+
+
+def solve(a, b):
+    """
+    Returns `x` such that `a * x == b`.
+
+    `a` is a square :class:`Matrix`. `b` is either a :class:`Matrix` with the
+    same number of rows, each column of which is a right-hand side, or a
+    :class:`~gf256.GF256Array`. `x` is of the same type as `b`.
+
+    Raises :exc:`ValueError`, if `a` is singular or the shapes don't match,
+    and :exc:`TypeError`, if `a` and `b` have different fields.
+    """
+    rows, columns = a.shape
+    if rows != columns:
+        raise ValueError('{}x{} matrix is not square'.format(*a.shape))
+    if b.field is not a.field:
+        raise TypeError('{!r} and {!r} have different fields'.format(a, b))
+    if isinstance(b, GF256Array):
+        b_data, b_columns = b.data, 1
+    else:
+        b_data, b_columns = b._data, b.shape[1]
+    if len(b_data) != rows * b_columns:
+        raise ValueError('right-hand side does not match {}x{} matrix'.format(
+            *a.shape
+        ))
+    augmented = a._augmented(b_data, b_columns)
+    if augmented._reduce(columns) < rows:
+        raise ValueError('matrix is singular')
+    x_data = augmented._right_columns(columns)
+    if isinstance(b, GF256Array):
+        x = GF256Array(field=a.field)
+        x.data = x_data
+        return x
+    return a._from_data(rows, b_columns, x_data, a.field)
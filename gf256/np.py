@@ -0,0 +1,263 @@
+"""
+    gf256.np
+    ~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from functools import lru_cache
+
+import numpy
+
+from gf256 import (
+    GF256LT, _ffi, _GF256LTBase, _speedups, _speedups_selected
+)
+
+
+def _elements(a):
+    """
+    Returns `a` as an array of :data:`numpy.uint8`.
+
+    Arrays of other integer types are converted, if all their elements are in
+    `range(0, 256)`.
+    """
+    a = numpy.asarray(a)
+    if a.dtype != numpy.uint8:
+        if a.dtype.kind not in 'iu':
+            raise TypeError('expected integers, got {}'.format(a.dtype))
+        if a.size and (a.min() < 0 or a.max() > 255):
+            raise ValueError('elements must be in range(0, 256)')
+        a = a.astype(numpy.uint8)
+    return a
+
+
+def _check_field(field):
+    if not issubclass(field, _GF256LTBase):
+        raise TypeError('{} is not a table based field'.format(field.__name__))
+
+
+def _check_nonzero(a):
+    if not a.all():
+        position = numpy.unravel_index(numpy.argmin(a), a.shape)
+        raise ZeroDivisionError('division by zero at position {}'.format(
+            tuple(int(i) for i in position)
+        ))
+
+
+def _result(result, out):
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def _multiplication_table(field):
+    _check_field(field)
+    return numpy.frombuffer(field._multiplication_table(), dtype=numpy.uint8)
+
+
+def _inverse_table(field):
+    _check_field(field)
+    return numpy.frombuffer(field._inverse_table(), dtype=numpy.uint8)
+
+
+@lru_cache(maxsize=None)
+def _power_tables(field):
+    """
+    Returns the exponentiation table and a logarithm table, that maps `0` to
+    `0`, as arrays.
+    """
+    _check_field(field)
+    exponentiation = numpy.array(field.exponentiation_table, dtype=numpy.uint8)
+    logarithm = numpy.array([0] + field.logarithm_table, dtype=numpy.intp)
+    return exponentiation, logarithm
+
+
+def add(a, b, out=None):
+    """
+    Returns the elementwise sum of the arrays `a` and `b`.
+
+    Like all functions in this module, the arrays are broadcast against each
+    other and the result is written to `out`, if given. Arrays of
+    :data:`numpy.uint8` are used as they are, other integer arrays and
+    array-likes are converted, if their elements are in `range(0, 256)`.
+    """
+    return numpy.bitwise_xor(_elements(a), _elements(b), out=out)
+
+
+#: Returns the elementwise difference of `a` and `b`, which is the same as
+#: their sum.
+subtract = add
+
+
+def multiply(a, b, out=None, field=GF256LT):
+    """
+    Returns the elementwise product of the arrays `a` and `b`.
+
+    `field` is :class:`~gf256.GF256LT` or another table based field returned
+    by :func:`~gf256.field`, whose multiplication table is indexed with all
+    pairs of elements at once.
+    """
+    a, b = _elements(a), _elements(b)
+    index = numpy.bitwise_or(numpy.left_shift(a, 8, dtype=numpy.intp), b)
+    return numpy.take(_multiplication_table(field), index, out=out)
+
+
+def inverse(a, out=None, field=GF256LT):
+    """
+    Returns the multiplicative inverse of every element of `a`.
+
+    Raises :exc:`ZeroDivisionError` with the position of the first `0`, if
+    there is one.
+    """
+    a = _elements(a)
+    _check_nonzero(a)
+    return numpy.take(_inverse_table(field), a, out=out)
+
+
+def divide(a, b, out=None, field=GF256LT):
+    """
+    Returns the elementwise quotient of the arrays `a` and `b`.
+
+    Raises :exc:`ZeroDivisionError` with the position of the first `0` in
+    `b`, if there is one.
+    """
+    return multiply(a, inverse(b, field=field), out=out, field=field)
+
+
+def power(a, exponent, out=None, field=GF256LT):
+    """
+    Returns the elements of `a` raised to the integer powers `exponent`,
+    computed with a logarithm and an exponentiation table.
+
+    Negative exponents are powers of the inverse. Raises
+    :exc:`ZeroDivisionError`, if `0` is raised to a negative power.
+    """
+    a = _elements(a)
+    exponent = numpy.asarray(exponent)
+    if exponent.dtype.kind not in 'iu':
+        raise TypeError('expected integers, got {}'.format(exponent.dtype))
+    exponentiation, logarithm = _power_tables(field)
+    zero = a == 0
+    if numpy.any(zero & (exponent < 0)):
+        raise ZeroDivisionError('0 cannot be raised to a negative power')
+    # The logarithms are smaller than 255, so reducing the exponent first
+    # ensures that the product doesn't overflow.
+    index = logarithm[a] * (exponent % 255).astype(numpy.intp) % 255
+    result = numpy.where(zero, exponent == 0, exponentiation[index])
+    return _result(result.astype(numpy.uint8), out)
+
+
+def matmul(a, b, out=None, field=GF256LT):
+    """
+    Returns the matrix product of the two-dimensional array `a` and `b`,
+    which is either a two-dimensional array or a vector.
+
+    With the speedups, the product is computed by the same C function as
+    the products of :class:`gf256.matrix.Matrix`. Otherwise every column of
+    `a` is multiplied with the corresponding row of `b` by indexing the
+    multiplication table.
+
+    Raises :exc:`ValueError`, if the shapes don't match.
+    """
+    a, b = _elements(a), _elements(b)
+    if a.ndim != 2 or b.ndim not in (1, 2):
+        raise ValueError('expected a matrix and a matrix or vector')
+    vector = b.ndim == 1
+    if vector:
+        b = b[:, None]
+    (rows, inner), (b_rows, columns) = a.shape, b.shape
+    if inner != b_rows:
+        raise ValueError('cannot multiply {}x{} and {}x{}'.format(
+            rows, inner, b_rows, columns
+        ))
+    _check_field(field)
+    if _speedups_selected():
+        a = numpy.ascontiguousarray(a)
+        b = numpy.ascontiguousarray(b)
+        result = numpy.empty((rows, columns), dtype=numpy.uint8)
+        _speedups.matrix_mul(
+            _ffi.from_buffer(field._multiplication_table()),
+            _ffi.from_buffer(a), _ffi.from_buffer(b), _ffi.from_buffer(result),
+            rows, inner, columns
+        )
+    else:
+        table = _multiplication_table(field).reshape(256, 256)
+        result = numpy.zeros((rows, columns), dtype=numpy.uint8)
+        for k in range(inner):
+            result ^= table[a[:, k, None], b[None, k, :]]
+    if vector:
+        result = result[:, 0]
+    return _result(result, out)
+
+
+def _region(data):
+    return numpy.frombuffer(data, dtype=numpy.uint8)
+
+
+def _multiply_ct(a, b, modulus):
+    """
+    Returns the elementwise product of the arrays `a` and `b`, reduced by
+    `modulus`, computed with the same operations for all elements.
+    """
+    reduction = numpy.uint8(modulus & 0xff)
+    product = numpy.zeros(numpy.broadcast(a, b).shape, dtype=numpy.uint8)
+    for i in range(8):
+        # The mask is 0xff, if bit `i` of `b` is set, and 0 otherwise.
+        mask = ((b >> numpy.uint8(i)) & numpy.uint8(1)) * numpy.uint8(0xff)
+        product ^= a & mask
+        a = (a << numpy.uint8(1)) ^ ((a >> numpy.uint8(7)) * reduction)
+    return product
+
+
+class _NumPyBackend:
+    """
+    Performs bulk operations on regions with NumPy, see
+    :func:`gf256.select_backend`.
+    """
+
+    name = 'numpy'
+
+    def find_zero(self, data):
+        data = _region(data)
+        if not data.size:
+            return -1
+        position = int(data.argmin())
+        return position if data[position] == 0 else -1
+
+    def add_regions(self, a, b, dst):
+        numpy.bitwise_xor(_region(a), _region(b), out=_region(dst))
+
+    def mul_regions(self, table, a, b, dst):
+        index = numpy.left_shift(_region(a), 8, dtype=numpy.intp)
+        index |= _region(b)
+        numpy.take(_region(table), index, out=_region(dst))
+
+    def lookup_region(self, table, src, dst, add=False):
+        products = numpy.take(_region(table), _region(src))
+        if add:
+            numpy.bitwise_xor(_region(dst), products, out=_region(dst))
+        else:
+            _region(dst)[:] = products
+
+    mul_region = lookup_region
+
+    def mul_region_ct(self, c, modulus, src, dst, add=False):
+        products = _multiply_ct(_region(src), numpy.uint8(c), modulus)
+        if add:
+            numpy.bitwise_xor(_region(dst), products, out=_region(dst))
+        else:
+            _region(dst)[:] = products
+
+    def inverse_region_ct(self, modulus, src, dst):
+        # `x ** 254` is the inverse of `x`, and `254` is the sum of the powers
+        # of two from `2` to `128`.
+        square = _region(src)
+        inverse = numpy.ones(square.shape, dtype=numpy.uint8)
+        for _ in range(7):
+            square = _multiply_ct(square, square, modulus)
+            inverse = _multiply_ct(inverse, square, modulus)
+        _region(dst)[:] = inverse
+
+    def inverse_many_ct(self, modulus, data):
+        self.inverse_region_ct(modulus, data, data)
@@ -0,0 +1,287 @@
+"""
+    gf256.polynomial
+    ~~~~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from gf256 import (
+    GF256LT, _add_regions, _byte_view, _ffi, _GF256LTBase, _output_buffer,
+    _speedups, _speedups_selected, mul_region, muladd_region
+)
+
+
+class Polynomial:
+    """
+    Represents a polynomial with coefficients in `GF(2 ** 8)`.
+
+    `coefficients` are given lowest degree first, either as a bytes-like
+    object or as an iterable of `field` objects, `field` being
+    :class:`~gf256.GF256LT` by default. Leading zeros are removed, the
+    remaining coefficients are available as :class:`bytes` through the
+    :attr:`coefficients` attribute.
+
+    Polynomials are immutable and support `+`, `-`, `*` (with polynomials and
+    single elements), `//`, `%` and :func:`divmod`. Calling a polynomial with
+    an element evaluates it at that point, use :meth:`evaluate` to evaluate
+    it at many points at once.
+
+    With the speedups and a table based `field`, evaluation, multiplication,
+    division and interpolation are performed in C. Otherwise multiplication
+    and division still work on entire rows of coefficients using
+    :func:`~gf256.muladd_region`.
+    """
+
+    def __init__(self, coefficients=b'', field=GF256LT):
+        self.field = field
+        #: The coefficients as :class:`bytes`, lowest degree first.
+        self.coefficients = self._to_bytes(coefficients, field).rstrip(b'\0')
+
+    @staticmethod
+    def _to_bytes(values, field):
+        try:
+            return memoryview(values).cast('B').tobytes()
+        except TypeError:
+            pass
+        result = bytearray()
+        for value in values:
+            if not isinstance(value, field):
+                raise TypeError('{!r} is not a {} object'.format(
+                    value, field.__name__
+                ))
+            result.append(value.n)
+        return bytes(result)
+
+    @classmethod
+    def _uses_speedups(cls, field):
+        return _speedups_selected() and issubclass(field, _GF256LTBase)
+
+    @property
+    def degree(self):
+        """
+        The degree of the polynomial, `-1` for the zero polynomial.
+        """
+        return len(self.coefficients) - 1
+
+    def evaluate(self, points, out=None):
+        """
+        Evaluates the polynomial at each of the given `points` and returns
+        the results as a :class:`bytearray`. If `out` is given, the results
+        are written to this writable buffer instead, which is returned.
+
+        `points` is a bytes-like object or an iterable of `field` objects.
+        """
+        try:
+            points = _byte_view(points)
+        except TypeError:
+            points = self._to_bytes(points, self.field)
+        out = _output_buffer(out, len(points))
+        results = _byte_view(out, writable=True)
+        if self._uses_speedups(self.field):
+            _speedups.poly_eval(
+                _ffi.from_buffer(self.field._multiplication_table()),
+                self.coefficients, len(self.coefficients),
+                _ffi.from_buffer(points), _ffi.from_buffer(results),
+                len(points)
+            )
+        else:
+            coefficients = [self.field(c) for c in self.coefficients[::-1]]
+            for i, point in enumerate(points):
+                point = self.field(point)
+                result = self.field(0)
+                for coefficient in coefficients:
+                    result = result * point + coefficient
+                results[i] = result.n
+        return out
+
+    def __call__(self, x):
+        if not isinstance(x, self.field):
+            raise TypeError('{!r} is not a {} object'.format(
+                x, self.field.__name__
+            ))
+        return self.field(self.evaluate(bytes([x.n]))[0])
+
+    def _new(self, coefficients):
+        return self.__class__(coefficients, field=self.field)
+
+    def _is_compatible(self, other):
+        return isinstance(other, Polynomial) and other.field is self.field
+
+    def __add__(self, other):
+        if self._is_compatible(other):
+            length = max(len(self.coefficients), len(other.coefficients))
+            result = bytearray(length)
+            _add_regions(
+                self.coefficients.ljust(length, b'\0'),
+                other.coefficients.ljust(length, b'\0'),
+                result
+            )
+            return self._new(result)
+        return NotImplemented
+
+    __sub__ = __add__
+
+    def __mul__(self, other):
+        if self._is_compatible(other):
+            if not self.coefficients or not other.coefficients:
+                return self._new(b'')
+            a, b = self.coefficients, other.coefficients
+            result = bytearray(len(a) + len(b) - 1)
+            if self._uses_speedups(self.field):
+                _speedups.poly_mul(
+                    _ffi.from_buffer(self.field._multiplication_table()),
+                    a, len(a), b, len(b), _ffi.from_buffer(result)
+                )
+            else:
+                view = memoryview(result)
+                for i, coefficient in enumerate(a):
+                    if coefficient:
+                        muladd_region(
+                            self.field(coefficient), b, view[i:i + len(b)]
+                        )
+            return self._new(result)
+        elif isinstance(other, self.field):
+            result = bytearray(len(self.coefficients))
+            mul_region(other, self.coefficients, result)
+            return self._new(result)
+        return NotImplemented
+
+    def __rmul__(self, other):
+        if isinstance(other, self.field):
+            return self * other
+        return NotImplemented
+
+    def __divmod__(self, other):
+        if not self._is_compatible(other):
+            return NotImplemented
+        divisor = other.coefficients
+        if not divisor:
+            raise ZeroDivisionError()
+        if len(self.coefficients) < len(divisor):
+            return self._new(b''), self
+        remainder = bytearray(self.coefficients)
+        quotient = bytearray(len(remainder) - len(divisor) + 1)
+        if self._uses_speedups(self.field):
+            _speedups.poly_divmod(
+                _ffi.from_buffer(self.field._multiplication_table()),
+                self.field._inverse_table(),
+                _ffi.from_buffer(remainder), len(remainder),
+                divisor, len(divisor), _ffi.from_buffer(quotient)
+            )
+        else:
+            leading_inverse = self.field(divisor[-1])._multiplicative_inverse()
+            view = memoryview(remainder)
+            for i in reversed(range(len(quotient))):
+                factor = (
+                    self.field(remainder[i + len(divisor) - 1]) *
+                    leading_inverse
+                )
+                quotient[i] = factor.n
+                muladd_region(factor, divisor, view[i:i + len(divisor)])
+        return self._new(quotient), self._new(remainder)
+
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        if result is NotImplemented:
+            return result
+        return result[0]
+
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        if result is NotImplemented:
+            return result
+        return result[1]
+
+    def __eq__(self, other):
+        if isinstance(other, Polynomial):
+            return (
+                self.field is other.field and
+                self.coefficients == other.coefficients
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.field, self.coefficients))
+
+    def __repr__(self):
+        if self.field is GF256LT:
+            return '{}({!r})'.format(
+                self.__class__.__qualname__, self.coefficients
+            )
+        return '{}({!r}, field={})'.format(
+            self.__class__.__qualname__, self.coefficients,
+            self.field.__qualname__
+        )
+
+    @classmethod
+    def _points(cls, xs, ys, field):
+        xs = cls._to_bytes(xs, field)
+        ys = cls._to_bytes(ys, field)
+        if len(xs) != len(ys):
+            raise ValueError('xs and ys have different lengths')
+        if len(set(xs)) != len(xs):
+            raise ValueError('xs must be distinct')
+        return xs, ys
+
+    @classmethod
+    def interpolate_lagrange(cls, xs, ys, field=GF256LT):
+        """
+        Returns the polynomial `p` of degree less than `len(xs)` with
+        `p(xs[i]) == ys[i]`, computed as a sum of Lagrange basis
+        polynomials.
+
+        `xs` and `ys` are bytes-like objects or iterables of `field` objects.
+        Raises :exc:`ValueError`, if the `xs` are not distinct.
+        """
+        xs, ys = cls._points(xs, ys, field)
+        # All basis polynomials are the product of all `(x - xs[j])` divided
+        # by the one with `i == j`, scaled such that they are 1 at `xs[i]`.
+        product = cls(b'\1', field=field)
+        for x in xs:
+            product *= cls(bytes([x, 1]), field=field)
+        result = bytearray(len(xs))
+        for x, y in zip(xs, ys):
+            basis = product // cls(bytes([x, 1]), field=field)
+            scale = field(y) / basis(field(x))
+            muladd_region(
+                scale, basis.coefficients,
+                memoryview(result)[:len(basis.coefficients)]
+            )
+        return cls(result, field=field)
+
+    @classmethod
+    def interpolate_newton(cls, xs, ys, field=GF256LT):
+        """
+        Returns the polynomial `p` of degree less than `len(xs)` with
+        `p(xs[i]) == ys[i]`, computed using Newton's divided differences.
+
+        `xs` and `ys` are bytes-like objects or iterables of `field` objects.
+        Raises :exc:`ValueError`, if the `xs` are not distinct.
+        """
+        xs, ys = cls._points(xs, ys, field)
+        if not xs:
+            return cls(b'', field=field)
+        coefficients = bytearray(len(xs))
+        if cls._uses_speedups(field):
+            _speedups.poly_interpolate_newton(
+                _ffi.from_buffer(field._multiplication_table()),
+                field._inverse_table(),
+                xs, _ffi.from_buffer(bytearray(ys)), len(xs),
+                _ffi.from_buffer(coefficients)
+            )
+            return cls(coefficients, field=field)
+        xs = [field(x) for x in xs]
+        differences = [field(y) for y in ys]
+        for level in range(1, len(xs)):
+            for i in reversed(range(level, len(xs))):
+                differences[i] = (
+                    (differences[i] - differences[i - 1]) /
+                    (xs[i] - xs[i - level])
+                )
+        result = cls(bytes([differences[-1].n]), field=field)
+        for x, difference in zip(xs[-2::-1], differences[-2::-1]):
+            result = (
+                result * cls(bytes([x.n, 1]), field=field) +
+                cls(bytes([difference.n]), field=field)
+            )
+        return result
@@ -0,0 +1,105 @@
+"""
+    gf256.shamir
+    ~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import os
+from functools import lru_cache
+
+from gf256 import (
+    GF256, _byte_view, _output_buffer, inverse_many, mul_region,
+    muladd_region
+)
+
+
+def split(secret, threshold, shares, field=GF256):
+    """
+    Splits `secret` into `shares` shares using Shamir's secret sharing, such
+    that any `threshold` of them can be combined to recover it.
+
+    Returns a list of `(x, y)` tuples, where `x` is an integer in
+    `range(1, 256)` and `y` a :class:`bytearray` as long as `secret`.
+
+    Each byte of `secret` is the constant term of a random polynomial of
+    degree `threshold - 1`, `y` consists of these polynomials evaluated at
+    `x`. All bytes are processed at once using :func:`~gf256.muladd_region`.
+
+    `field` is the class of the elements used. The default,
+    :class:`~gf256.GF256`, doesn't use the secret as an index into a table and
+    is therefore safe against timing side channel attacks. Pass
+    :class:`~gf256.GF256LT` for speed, if that is not a concern.
+    """
+    if threshold < 1:
+        raise ValueError('threshold must be at least 1')
+    if shares < threshold:
+        raise ValueError('shares must be at least threshold')
+    if shares > 255:
+        raise ValueError('at most 255 shares are supported')
+    secret = _byte_view(secret)
+    coefficients = [secret] + [
+        os.urandom(len(secret)) for _ in range(threshold - 1)
+    ]
+    result = []
+    for x in range(1, shares + 1):
+        y = bytearray(len(secret))
+        power = field(1)
+        for coefficient in coefficients:
+            muladd_region(power, coefficient, y)
+            power *= field(x)
+        result.append((x, y))
+    return result
+
+
+@lru_cache(maxsize=128)
+def _lagrange_coefficients(xs, field):
+    """
+    Returns the coefficients `l`, such that for a polynomial `p` of degree
+    `len(xs) - 1`, `p(0) == sum(l[i] * p(xs[i]))`.
+    """
+    xs = [field(x) for x in xs]
+    numerators = []
+    denominators = bytearray()
+    for i, x_i in enumerate(xs):
+        numerator = denominator = field(1)
+        for j, x_j in enumerate(xs):
+            if i != j:
+                numerator *= x_j
+                denominator *= x_j - x_i
+        numerators.append(numerator)
+        denominators.append(denominator.n)
+    return [
+        numerator * field(inverse)
+        for numerator, inverse in zip(
+            numerators, inverse_many(denominators, field=field)
+        )
+    ]
+
+
+def combine(shares, field=GF256, out=None):
+    """
+    Returns the secret as a :class:`bytearray`, given a sequence of at least
+    `threshold` shares returned by :func:`split`. The `y` of a share can be
+    any bytes-like object. If `out` is given, the secret is written to this
+    writable buffer instead, which is returned.
+
+    The Lagrange coefficients are computed once for all bytes, using the
+    same shares again reuses them.
+    """
+    if not shares:
+        raise ValueError('at least one share is required')
+    xs = tuple(x for x, _ in shares)
+    if len(set(xs)) != len(xs):
+        raise ValueError('shares must be distinct')
+    if not all(1 <= x < 256 for x in xs):
+        raise ValueError('x must be in range(1, 256)')
+    ys = [_byte_view(y) for _, y in shares]
+    if len({len(y) for y in ys}) > 1:
+        raise ValueError('shares have different lengths')
+    secret = _output_buffer(out, len(ys[0]))
+    coefficients = _lagrange_coefficients(xs, field)
+    mul_region(coefficients[0], ys[0], secret)
+    for coefficient, y in zip(coefficients[1:], ys[1:]):
+        muladd_region(coefficient, y, secret)
+    return secret
@@ -22,9 +22,99 @@ ffibuilder.cdef("""
     uint32_t polymulmodlt(uint32_t a, uint32_t b);
     uint32_t modinverselt(uint32_t n);
     uint32_t polydivmodlt(uint32_t a, uint32_t b);
+
+    size_t region_find_zero(const uint8_t *data, size_t length);
+    void region_xor(
+        const uint8_t *a, const uint8_t *b, uint8_t *dst, size_t length
+    );
+    void region_mul(
+        const uint8_t *table,
+        const uint8_t *a, const uint8_t *b, uint8_t *dst, size_t length
+    );
+    void region_lookup(
+        const uint8_t *table, const uint8_t *src, uint8_t *dst, size_t length
+    );
+    void region_lookup_xor(
+        const uint8_t *table, const uint8_t *src, uint8_t *dst, size_t length
+    );
+    void region_mul_ct(
+        uint32_t c, uint32_t modulus,
+        const uint8_t *src, uint8_t *dst, size_t length
+    );
+    void region_muladd_ct(
+        uint32_t c, uint32_t modulus,
+        const uint8_t *src, uint8_t *dst, size_t length
+    );
+    void region_inverse_ct(
+        uint32_t modulus, const uint8_t *src, uint8_t *dst, size_t length
+    );
+    void region_inverse_many_ct(
+        uint32_t modulus, uint8_t *data, uint8_t *products, size_t length
+    );
+
+    const char *available_region_kernel(size_t index);
+    int select_region_kernel(const char *name);
+    const char *selected_region_kernel(void);
+    void region_mul_constant(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length
+    );
+    void region_muladd_constant(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length
+    );
+
+    size_t matrix_reduce(
+        const uint8_t *table, const uint8_t *inverses, uint8_t *data,
+        size_t rows, size_t columns, size_t pivot_columns
+    );
+    void matrix_mul(
+        const uint8_t *table, const uint8_t *a, const uint8_t *b, uint8_t *dst,
+        size_t rows, size_t inner, size_t columns
+    );
+
+    void poly_eval(
+        const uint8_t *table, const uint8_t *coefficients, size_t length,
+        const uint8_t *points, uint8_t *results, size_t count
+    );
+    void poly_mul(
+        const uint8_t *table,
+        const uint8_t *a, size_t a_length, const uint8_t *b, size_t b_length,
+        uint8_t *dst
+    );
+    void poly_divmod(
+        const uint8_t *table, const uint8_t *inverses,
+        uint8_t *remainder, size_t length,
+        const uint8_t *divisor, size_t divisor_length, uint8_t *quotient
+    );
+    void poly_interpolate_newton(
+        const uint8_t *table, const uint8_t *inverses,
+        const uint8_t *xs, uint8_t *ys, size_t count, uint8_t *coefficients
+    );
 """)
 
 ffibuilder.set_source('gf256._speedups', """
+    #include <string.h>
+
+    #if defined(__x86_64__) || defined(__i386__) || \\
+        defined(_M_X64) || defined(_M_IX86)
+    #  if defined(__GNUC__)
+    #    define GF256_SIMD
+    #    define GF256_TARGET(features) __attribute__((target(features)))
+    #    include <cpuid.h>
+    #    include <immintrin.h>
+    #    if (defined(__clang__) && __clang_major__ >= 7) || \\
+            (!defined(__clang__) && __GNUC__ >= 8)
+    #      define GF256_GFNI
+    #    endif
+    #  elif defined(_MSC_VER)
+    #    define GF256_SIMD
+    #    define GF256_TARGET(features)
+    #    include <intrin.h>
+    #    if _MSC_VER >= 1920
+    #      define GF256_GFNI
+    #    endif
+    #  endif
+    #endif
+
     static uint32_t EXPONENTIATION_TABLE[255] = {%(exponentiation_table)s};
     static uint32_t LOGARITHM_TABLE[255] = {%(logarithm_table)s};
 
@@ -70,22 +160,21 @@ ffibuilder.set_source('gf256._speedups', """
         return quotient;
     }
 
+    /* Computes `n ** 254`, which is the inverse of `n` or `0` for `0`, with
+     * the same fixed addition chain as `_modinverse` in `gf256/__init__.py`.
+     */
     uint32_t modinverse(uint32_t n, uint32_t modulus) {
-        uint32_t old_t = 0;
-        uint32_t t = 1;
-        uint32_t old_r = modulus;
-        uint32_t r = n;
-        uint32_t temp;
-        while (r != 0) {
-            uint32_t quotient = polydiv(old_r, r);
-            temp = r;
-            r = old_r ^ polymul(quotient, r);
-            old_r = temp;
-            temp = t;
-            t = old_t ^ polymul(quotient, t);
-            old_t = temp;
-        }
-        return old_t;
+        uint32_t n2 = polymulmod(n, n, modulus);
+        uint32_t n3 = polymulmod(n2, n, modulus);
+        uint32_t n12, n240;
+        n12 = polymulmod(n3, n3, modulus);
+        n12 = polymulmod(n12, n12, modulus);
+        n240 = polymulmod(n12, n3, modulus);
+        n240 = polymulmod(n240, n240, modulus);
+        n240 = polymulmod(n240, n240, modulus);
+        n240 = polymulmod(n240, n240, modulus);
+        n240 = polymulmod(n240, n240, modulus);
+        return polymulmod(polymulmod(n240, n12, modulus), n2, modulus);
     }
 
     uint32_t polydivmod(uint32_t a, uint32_t b, uint32_t modulus) {
@@ -108,6 +197,698 @@ ffibuilder.set_source('gf256._speedups', """
     uint32_t polydivmodlt(uint32_t a, uint32_t b) {
         return polymulmodlt(a, modinverselt(b));
     }
+
+    /* Returns the position of the first `0` in `data` or `length`, if there
+     * is none.
+     */
+    size_t region_find_zero(const uint8_t *data, size_t length) {
+        const uint8_t *zero = memchr(data, 0, length);
+        return zero ? (size_t)(zero - data) : length;
+    }
+
+    void region_xor(
+        const uint8_t *a, const uint8_t *b, uint8_t *dst, size_t length
+    ) {
+        size_t i;
+        for (i = 0; i < length; i++) {
+            dst[i] = a[i] ^ b[i];
+        }
+    }
+
+    /* `table` is a full multiplication table with the product of `a` and `b`
+     * at index `a << 8 | b`.
+     */
+    void region_mul(
+        const uint8_t *table,
+        const uint8_t *a, const uint8_t *b, uint8_t *dst, size_t length
+    ) {
+        size_t i;
+        for (i = 0; i < length; i++) {
+            dst[i] = table[a[i] << 8 | b[i]];
+        }
+    }
+
+    /* `table` maps each of the 256 possible bytes to another one. */
+    void region_lookup(
+        const uint8_t *table, const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        size_t i;
+        for (i = 0; i < length; i++) {
+            dst[i] = table[src[i]];
+        }
+    }
+
+    void region_lookup_xor(
+        const uint8_t *table, const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        size_t i;
+        for (i = 0; i < length; i++) {
+            dst[i] ^= table[src[i]];
+        }
+    }
+
+    /* Bit-sliced constant time arithmetic
+     * ====================================
+     *
+     * Unlike the lookup based functions, these do not use the bytes in `src`
+     * as an index and don't branch on them, so they are safe to use with
+     * secret data.
+     *
+     * Eight bytes are processed at once as the lanes of a 64-bit word. For
+     * every bit position, `lane_mask` turns that bit of every byte into a
+     * byte of either `0x00` or `0xff`, with which we select the terms of a
+     * product using only AND and XOR. Multiplication by a constant `c` is
+     * linear, so `c * n` is the sum of `c * x ** i` over all bits `i` set in
+     * `n`. Remaining bytes at the end are processed by `polymulmod`.
+     */
+    #define LANES_LOW UINT64_C(0x0101010101010101)
+    #define LANES_HIGH_CLEAR UINT64_C(0x7f7f7f7f7f7f7f7f)
+
+    static uint64_t lane_mask(uint64_t word, int bit) {
+        uint64_t bits = (word >> bit) & LANES_LOW;
+        return (bits << 8) - bits;
+    }
+
+    static uint64_t load_lanes(const uint8_t *bytes) {
+        uint64_t word;
+        memcpy(&word, bytes, sizeof(word));
+        return word;
+    }
+
+    static void store_lanes(uint8_t *bytes, uint64_t word) {
+        memcpy(bytes, &word, sizeof(word));
+    }
+
+    /* Multiplies the lanes of `a` and `b` modulo `modulus`, like
+     * `polymulmod` does for single bytes.
+     */
+    static uint64_t lanes_mul(uint64_t a, uint64_t b, uint64_t reduction) {
+        uint64_t product = 0;
+        int bit;
+        for (bit = 0; bit < 8; bit++) {
+            product ^= lane_mask(a, bit) & b;
+            b = ((b & LANES_HIGH_CLEAR) << 1) ^ (lane_mask(b, 7) & reduction);
+        }
+        return product;
+    }
+
+    static void region_mul_ct_lanes(
+        uint32_t c, uint32_t modulus,
+        const uint8_t *src, uint8_t *dst, size_t length, int add
+    ) {
+        uint64_t multiples[8];
+        uint64_t product;
+        uint32_t multiple = c;
+        size_t i;
+        int bit;
+        for (bit = 0; bit < 8; bit++) {
+            multiples[bit] = (multiple & 0xff) * LANES_LOW;
+            multiple = (multiple << 1) ^ ((multiple >> 7) * modulus);
+        }
+        for (i = 0; i + 8 <= length; i += 8) {
+            uint64_t word = load_lanes(src + i);
+            product = add ? load_lanes(dst + i) : 0;
+            for (bit = 0; bit < 8; bit++) {
+                product ^= lane_mask(word, bit) & multiples[bit];
+            }
+            store_lanes(dst + i, product);
+        }
+        for (; i < length; i++) {
+            dst[i] = (add ? dst[i] : 0) ^ polymulmod(c, src[i], modulus);
+        }
+    }
+
+    void region_mul_ct(
+        uint32_t c, uint32_t modulus,
+        const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        region_mul_ct_lanes(c, modulus, src, dst, length, 0);
+    }
+
+    void region_muladd_ct(
+        uint32_t c, uint32_t modulus,
+        const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        region_mul_ct_lanes(c, modulus, src, dst, length, 1);
+    }
+
+    /* Uses the same addition chain as `modinverse` on eight bytes at once. */
+    void region_inverse_ct(
+        uint32_t modulus, const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        uint64_t reduction = (modulus & 0xff) * LANES_LOW;
+        uint64_t n, n2, n3, n12, n240;
+        size_t i;
+        int j;
+        for (i = 0; i + 8 <= length; i += 8) {
+            n = load_lanes(src + i);
+            n2 = lanes_mul(n, n, reduction);
+            n3 = lanes_mul(n2, n, reduction);
+            n12 = lanes_mul(n3, n3, reduction);
+            n12 = lanes_mul(n12, n12, reduction);
+            n240 = lanes_mul(n12, n3, reduction);
+            for (j = 0; j < 4; j++) {
+                n240 = lanes_mul(n240, n240, reduction);
+            }
+            store_lanes(dst + i, lanes_mul(
+                lanes_mul(n240, n12, reduction), n2, reduction
+            ));
+        }
+        for (; i < length; i++) {
+            dst[i] = modinverse(src[i], modulus);
+        }
+    }
+
+    static uint64_t lanes_inverse(uint64_t n, uint64_t reduction) {
+        uint64_t n2, n3, n12, n240;
+        int j;
+        n2 = lanes_mul(n, n, reduction);
+        n3 = lanes_mul(n2, n, reduction);
+        n12 = lanes_mul(n3, n3, reduction);
+        n12 = lanes_mul(n12, n12, reduction);
+        n240 = lanes_mul(n12, n3, reduction);
+        for (j = 0; j < 4; j++) {
+            n240 = lanes_mul(n240, n240, reduction);
+        }
+        return lanes_mul(lanes_mul(n240, n12, reduction), n2, reduction);
+    }
+
+    /* Replaces every byte in `data`, none of which may be `0`, with its
+     * inverse using Montgomery's trick: With the prefix products
+     * `p[k] = data[0] * ... * data[k]`, only `p[-1]` needs to be inverted,
+     * the inverse of `data[k]` is `p[k - 1] / p[k]` and the inverse of
+     * `p[k - 1]` is `data[k] / p[k]`. This takes three multiplications per
+     * byte and a single inversion, instead of an inversion per byte.
+     *
+     * Each of the eight lanes of a word is an independent sequence, so the
+     * arithmetic is bit-sliced like above. `products` is scratch space of
+     * `length` bytes.
+     */
+    void region_inverse_many_ct(
+        uint32_t modulus, uint8_t *data, uint8_t *products, size_t length
+    ) {
+        uint64_t reduction = (modulus & 0xff) * LANES_LOW;
+        uint64_t product = LANES_LOW;
+        uint64_t inverse;
+        size_t words = length / 8;
+        size_t i;
+        if (words > 0) {
+            for (i = 0; i < words; i++) {
+                product = lanes_mul(
+                    product, load_lanes(data + i * 8), reduction
+                );
+                store_lanes(products + i * 8, product);
+            }
+            inverse = lanes_inverse(product, reduction);
+            for (i = words - 1; i > 0; i--) {
+                uint64_t word = load_lanes(data + i * 8);
+                store_lanes(data + i * 8, lanes_mul(
+                    inverse, load_lanes(products + (i - 1) * 8), reduction
+                ));
+                inverse = lanes_mul(inverse, word, reduction);
+            }
+            store_lanes(data, inverse);
+        }
+        for (i = words * 8; i < length; i++) {
+            data[i] = modinverse(data[i], modulus);
+        }
+    }
+
+    /* Multiplication by a constant
+     * ============================
+     *
+     * `row` is the row of the multiplication table for the constant `c`, that
+     * is `row[n] == c * n`. Multiplication by a constant is linear, so for
+     * `n = (high << 4) ^ low` we have `row[n] == row[high << 4] ^ row[low]`.
+     * With the two 16 byte tables `row[low]` and `row[high << 4]`, the SIMD
+     * kernels can use a byte shuffle to look up 16 or 32 bytes at once.
+     *
+     * Every kernel with `add` set adds the products to `dst` instead of
+     * overwriting it. `src` and `dst` may be the same region.
+     */
+
+    typedef void (*region_kernel_function)(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length,
+        int add
+    );
+
+    static void region_kernel_portable(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length,
+        int add
+    ) {
+        size_t i;
+        if (add) {
+            for (i = 0; i < length; i++) {
+                dst[i] ^= row[src[i]];
+            }
+        } else {
+            for (i = 0; i < length; i++) {
+                dst[i] = row[src[i]];
+            }
+        }
+    }
+
+    #define CPU_SSSE3 1
+    #define CPU_AVX2 2
+    #define CPU_GFNI 4
+
+    #ifdef GF256_SIMD
+    static void cpuid(uint32_t leaf, uint32_t registers[4]) {
+    #ifdef _MSC_VER
+        int info[4];
+        int i;
+        __cpuidex(info, (int)leaf, 0);
+        for (i = 0; i < 4; i++) {
+            registers[i] = (uint32_t)info[i];
+        }
+    #else
+        __cpuid_count(
+            leaf, 0, registers[0], registers[1], registers[2], registers[3]
+        );
+    #endif
+    }
+
+    static uint64_t xgetbv(void) {
+    #ifdef _MSC_VER
+        return _xgetbv(0);
+    #else
+        uint32_t eax, edx;
+        __asm__ __volatile__ ("xgetbv" : "=a"(eax), "=d"(edx) : "c"(0));
+        return ((uint64_t)edx << 32) | eax;
+    #endif
+    }
+
+    static int cpu_features(void) {
+        uint32_t registers[4];
+        uint32_t max_leaf;
+        int features = 0;
+        int avx_usable;
+
+        cpuid(0, registers);
+        max_leaf = registers[0];
+        if (max_leaf < 1) {
+            return features;
+        }
+        cpuid(1, registers);
+        if (registers[2] & (1 << 9)) {
+            features |= CPU_SSSE3;
+        }
+        /* AVX registers can only be used, if the CPU supports AVX and the
+         * operating system saves their state (OSXSAVE and XCR0).
+         */
+        avx_usable = (
+            (registers[2] & (1 << 27)) && (registers[2] & (1 << 28)) &&
+            (xgetbv() & 6) == 6
+        );
+        if (max_leaf >= 7 && avx_usable) {
+            cpuid(7, registers);
+            if (registers[1] & (1 << 5)) {
+                features |= CPU_AVX2;
+                if (registers[2] & (1 << 8)) {
+                    features |= CPU_GFNI;
+                }
+            }
+        }
+        return features;
+    }
+
+    GF256_TARGET("ssse3")
+    static void region_kernel_ssse3(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length,
+        int add
+    ) {
+        uint8_t high[16];
+        __m128i low_table, high_table, mask, n, product;
+        size_t i;
+
+        for (i = 0; i < 16; i++) {
+            high[i] = row[i << 4];
+        }
+        low_table = _mm_loadu_si128((const __m128i *)row);
+        high_table = _mm_loadu_si128((const __m128i *)high);
+        mask = _mm_set1_epi8(0x0f);
+        for (i = 0; i + 16 <= length; i += 16) {
+            n = _mm_loadu_si128((const __m128i *)(src + i));
+            product = _mm_xor_si128(
+                _mm_shuffle_epi8(low_table, _mm_and_si128(n, mask)),
+                _mm_shuffle_epi8(
+                    high_table, _mm_and_si128(_mm_srli_epi64(n, 4), mask)
+                )
+            );
+            if (add) {
+                product = _mm_xor_si128(
+                    product, _mm_loadu_si128((const __m128i *)(dst + i))
+                );
+            }
+            _mm_storeu_si128((__m128i *)(dst + i), product);
+        }
+        region_kernel_portable(row, src + i, dst + i, length - i, add);
+    }
+
+    GF256_TARGET("avx2")
+    static void region_kernel_avx2(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length,
+        int add
+    ) {
+        uint8_t high[16];
+        __m256i low_table, high_table, mask, n, product;
+        size_t i;
+
+        for (i = 0; i < 16; i++) {
+            high[i] = row[i << 4];
+        }
+        low_table = _mm256_broadcastsi128_si256(
+            _mm_loadu_si128((const __m128i *)row)
+        );
+        high_table = _mm256_broadcastsi128_si256(
+            _mm_loadu_si128((const __m128i *)high)
+        );
+        mask = _mm256_set1_epi8(0x0f);
+        for (i = 0; i + 32 <= length; i += 32) {
+            n = _mm256_loadu_si256((const __m256i *)(src + i));
+            product = _mm256_xor_si256(
+                _mm256_shuffle_epi8(low_table, _mm256_and_si256(n, mask)),
+                _mm256_shuffle_epi8(
+                    high_table,
+                    _mm256_and_si256(_mm256_srli_epi64(n, 4), mask)
+                )
+            );
+            if (add) {
+                product = _mm256_xor_si256(
+                    product, _mm256_loadu_si256((const __m256i *)(dst + i))
+                );
+            }
+            _mm256_storeu_si256((__m256i *)(dst + i), product);
+        }
+        region_kernel_portable(row, src + i, dst + i, length - i, add);
+    }
+
+    #ifdef GF256_GFNI
+    /* GF2P8MULB hard codes the AES polynomial, GF2P8AFFINEQB however
+     * multiplies every byte with an arbitrary 8x8 bit matrix. Multiplication
+     * by a constant is linear, so we can express it as such a matrix: Bit `i`
+     * of the product is the parity of `n` masked by byte `7 - i` of the
+     * matrix, bit `k` of that byte is therefore bit `i` of `row[1 << k]`.
+     */
+    static uint64_t affine_matrix(const uint8_t *row) {
+        uint64_t matrix = 0;
+        int i, k;
+        for (i = 0; i < 8; i++) {
+            for (k = 0; k < 8; k++) {
+                matrix |= (
+                    (uint64_t)((row[1 << k] >> i) & 1) << (8 * (7 - i) + k)
+                );
+            }
+        }
+        return matrix;
+    }
+
+    GF256_TARGET("gfni,avx2")
+    static void region_kernel_gfni_avx2(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length,
+        int add
+    ) {
+        __m256i matrix, product;
+        size_t i;
+
+        matrix = _mm256_set1_epi64x((long long)affine_matrix(row));
+        for (i = 0; i + 32 <= length; i += 32) {
+            product = _mm256_gf2p8affine_epi64_epi8(
+                _mm256_loadu_si256((const __m256i *)(src + i)), matrix, 0
+            );
+            if (add) {
+                product = _mm256_xor_si256(
+                    product, _mm256_loadu_si256((const __m256i *)(dst + i))
+                );
+            }
+            _mm256_storeu_si256((__m256i *)(dst + i), product);
+        }
+        region_kernel_portable(row, src + i, dst + i, length - i, add);
+    }
+    #endif
+    #else
+    static int cpu_features(void) {
+        return 0;
+    }
+    #endif
+
+    static const struct {
+        const char *name;
+        int required_features;
+        region_kernel_function function;
+    } REGION_KERNELS[] = {
+    #ifdef GF256_GFNI
+        {"gfni_avx2", CPU_GFNI | CPU_AVX2, region_kernel_gfni_avx2},
+    #endif
+    #ifdef GF256_SIMD
+        {"avx2", CPU_AVX2, region_kernel_avx2},
+        {"ssse3", CPU_SSSE3, region_kernel_ssse3},
+    #endif
+        {"portable", 0, region_kernel_portable}
+    };
+
+    #define REGION_KERNEL_COUNT \\
+        (sizeof(REGION_KERNELS) / sizeof(*REGION_KERNELS))
+
+    static size_t selected_kernel = REGION_KERNEL_COUNT - 1;
+
+    /* Returns the name of the `index`th kernel supported by this CPU, ordered
+     * by preference, or NULL if there is no such kernel.
+     */
+    const char *available_region_kernel(size_t index) {
+        int features = cpu_features();
+        size_t i;
+        for (i = 0; i < REGION_KERNEL_COUNT; i++) {
+            if ((REGION_KERNELS[i].required_features & features) ==
+                    REGION_KERNELS[i].required_features) {
+                if (index == 0) {
+                    return REGION_KERNELS[i].name;
+                }
+                index--;
+            }
+        }
+        return NULL;
+    }
+
+    /* Selects the kernel called `name` or the preferred one, if `name` is
+     * NULL. Returns -1, if the kernel doesn't exist or isn't supported.
+     */
+    int select_region_kernel(const char *name) {
+        int features = cpu_features();
+        size_t i;
+        for (i = 0; i < REGION_KERNEL_COUNT; i++) {
+            if ((REGION_KERNELS[i].required_features & features) !=
+                    REGION_KERNELS[i].required_features) {
+                continue;
+            }
+            if (name == NULL || strcmp(name, REGION_KERNELS[i].name) == 0) {
+                selected_kernel = i;
+                return 0;
+            }
+        }
+        return -1;
+    }
+
+    const char *selected_region_kernel(void) {
+        return REGION_KERNELS[selected_kernel].name;
+    }
+
+    void region_mul_constant(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        REGION_KERNELS[selected_kernel].function(row, src, dst, length, 0);
+    }
+
+    void region_muladd_constant(
+        const uint8_t *row, const uint8_t *src, uint8_t *dst, size_t length
+    ) {
+        REGION_KERNELS[selected_kernel].function(row, src, dst, length, 1);
+    }
+
+    /* Matrices
+     * ========
+     *
+     * Matrices are stored row by row. `table` is a full multiplication table
+     * with the product of `a` and `b` at index `a << 8 | b` and `inverses`
+     * maps every element to its multiplicative inverse. All row operations
+     * are performed by the selected region kernel.
+     */
+
+    /* Transforms the matrix into reduced row echelon form, using only the
+     * first `pivot_columns` columns as pivots, and returns the rank.
+     */
+    size_t matrix_reduce(
+        const uint8_t *table, const uint8_t *inverses, uint8_t *data,
+        size_t rows, size_t columns, size_t pivot_columns
+    ) {
+        region_kernel_function kernel =
+            REGION_KERNELS[selected_kernel].function;
+        size_t rank = 0;
+        size_t column, row, i;
+        uint8_t *pivot_row;
+        uint8_t factor, temp;
+
+        for (column = 0; column < pivot_columns && rank < rows; column++) {
+            for (row = rank; row < rows; row++) {
+                if (data[row * columns + column] != 0) {
+                    break;
+                }
+            }
+            if (row == rows) {
+                continue;
+            }
+            pivot_row = data + rank * columns;
+            /* All columns left of `column` are zero in both rows. */
+            for (i = column; i < columns && row != rank; i++) {
+                temp = pivot_row[i];
+                pivot_row[i] = data[row * columns + i];
+                data[row * columns + i] = temp;
+            }
+            kernel(
+                table + (inverses[pivot_row[column]] << 8),
+                pivot_row + column, pivot_row + column, columns - column, 0
+            );
+            for (row = 0; row < rows; row++) {
+                factor = data[row * columns + column];
+                if (row != rank && factor != 0) {
+                    kernel(
+                        table + (factor << 8), pivot_row + column,
+                        data + row * columns + column, columns - column, 1
+                    );
+                }
+            }
+            rank++;
+        }
+        return rank;
+    }
+
+    /* Multiplies the `rows` x `inner` matrix `a` with the `inner` x `columns`
+     * matrix `b`.
+     */
+    void matrix_mul(
+        const uint8_t *table, const uint8_t *a, const uint8_t *b, uint8_t *dst,
+        size_t rows, size_t inner, size_t columns
+    ) {
+        region_kernel_function kernel =
+            REGION_KERNELS[selected_kernel].function;
+        size_t i, k;
+
+        memset(dst, 0, rows * columns);
+        for (i = 0; i < rows; i++) {
+            for (k = 0; k < inner; k++) {
+                if (a[i * inner + k] != 0) {
+                    kernel(
+                        table + (a[i * inner + k] << 8), b + k * columns,
+                        dst + i * columns, columns, 1
+                    );
+                }
+            }
+        }
+    }
+
+    /* Polynomials
+     * ===========
+     *
+     * Polynomials are stored as their coefficients, lowest degree first.
+     */
+
+    /* Evaluates the polynomial at each of the `count` points, using Horner's
+     * method.
+     */
+    void poly_eval(
+        const uint8_t *table, const uint8_t *coefficients, size_t length,
+        const uint8_t *points, uint8_t *results, size_t count
+    ) {
+        size_t i, j;
+        uint8_t result;
+        for (j = 0; j < count; j++) {
+            result = 0;
+            for (i = length; i > 0; i--) {
+                result = table[result << 8 | points[j]] ^ coefficients[i - 1];
+            }
+            results[j] = result;
+        }
+    }
+
+    /* `dst` must have room for `a_length + b_length - 1` coefficients. */
+    void poly_mul(
+        const uint8_t *table,
+        const uint8_t *a, size_t a_length, const uint8_t *b, size_t b_length,
+        uint8_t *dst
+    ) {
+        region_kernel_function kernel =
+            REGION_KERNELS[selected_kernel].function;
+        size_t i;
+
+        memset(dst, 0, a_length + b_length - 1);
+        for (i = 0; i < a_length; i++) {
+            if (a[i] != 0) {
+                kernel(table + (a[i] << 8), b, dst + i, b_length, 1);
+            }
+        }
+    }
+
+    /* Divides the polynomial in `remainder` by `divisor`, whose leading
+     * coefficient must not be zero, leaving the remainder in `remainder`.
+     * `quotient` must have room for `length - divisor_length + 1`
+     * coefficients.
+     */
+    void poly_divmod(
+        const uint8_t *table, const uint8_t *inverses,
+        uint8_t *remainder, size_t length,
+        const uint8_t *divisor, size_t divisor_length, uint8_t *quotient
+    ) {
+        region_kernel_function kernel =
+            REGION_KERNELS[selected_kernel].function;
+        uint8_t leading_inverse = inverses[divisor[divisor_length - 1]];
+        uint8_t factor;
+        size_t i;
+
+        for (i = length - divisor_length + 1; i > 0; i--) {
+            factor = table[
+                remainder[i + divisor_length - 2] << 8 | leading_inverse
+            ];
+            quotient[i - 1] = factor;
+            if (factor != 0) {
+                kernel(
+                    table + (factor << 8), divisor, remainder + i - 1,
+                    divisor_length, 1
+                );
+            }
+        }
+    }
+
+    /* Computes the coefficients of the polynomial of degree `count - 1`
+     * through the points `(xs[i], ys[i])`, which must have distinct `xs`.
+     * `ys` is overwritten with the divided differences of the Newton form.
+     */
+    void poly_interpolate_newton(
+        const uint8_t *table, const uint8_t *inverses,
+        const uint8_t *xs, uint8_t *ys, size_t count, uint8_t *coefficients
+    ) {
+        size_t level, i;
+
+        for (level = 1; level < count; level++) {
+            for (i = count - 1; i >= level; i--) {
+                ys[i] = table[
+                    (ys[i] ^ ys[i - 1]) << 8 | inverses[xs[i] ^ xs[i - level]]
+                ];
+            }
+        }
+        /* p = ys[count - 1], then p = p * (x - xs[k]) + ys[k] for every
+         * remaining k, in descending order.
+         */
+        memset(coefficients, 0, count);
+        coefficients[0] = ys[count - 1];
+        for (level = count - 1; level > 0; level--) {
+            for (i = count - level; i > 0; i--) {
+                coefficients[i] = coefficients[i - 1] ^
+                    table[xs[level - 1] << 8 | coefficients[i]];
+            }
+            coefficients[0] = table[xs[level - 1] << 8 | coefficients[0]] ^
+                ys[level - 1];
+        }
+    }
 """ % {
     'exponentiation_table': ', '.join(map(str, GF256LT.exponentiation_table)),
     'logarithm_table': ', '.join(map(str, GF256LT.logarithm_table)),
@@ -0,0 +1,227 @@
+"""
+    gf256.striping
+    ~~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+
+from gf256 import GF256, _byte_view, _GF256LTBase, field
+from gf256.erasure import ReedSolomon
+
+
+#: The number of bytes of each shard, that a single task processes.
+_STRIPE_SIZE = 2 ** 22
+
+
+def _field_parameters(code):
+    """
+    Returns the parameters of the field of `code`, from which workers
+    create the same field with :func:`_code`.
+    """
+    if issubclass(code.field, _GF256LTBase):
+        return code.field.irreducible_polynomial, code.field.generator
+    return None
+
+
+@lru_cache(maxsize=None)
+def _code(data_shards, parity_shards, field_parameters):
+    """
+    Returns the code used by a worker.
+    """
+    if field_parameters is None:
+        return ReedSolomon(data_shards, parity_shards, field=GF256)
+    return ReedSolomon(
+        data_shards, parity_shards, field=field(*field_parameters)
+    )
+
+
+def _process_stripe(name, parameters, size, missing, start, stop):
+    """
+    Encodes or, if `missing` is not `None`, reconstructs the bytes from
+    `start` to `stop` of the shards in the shared memory called `name`, each
+    of which is `size` bytes long.
+    """
+    code = _code(*parameters)
+    memory = SharedMemory(name)
+    try:
+        shards = [
+            memory.buf[i * size + start:i * size + stop]
+            for i in range(code.total_shards)
+        ]
+        try:
+            if missing is None:
+                code.encode(
+                    shards[:code.data_shards], out=shards[code.data_shards:]
+                )
+            else:
+                code.reconstruct([
+                    None if i in missing else shard
+                    for i, shard in enumerate(shards)
+                ], out=shards)
+        finally:
+            for shard in shards:
+                shard.release()
+    finally:
+        memory.close()
+
+
+def _run(code, memory, size, missing, processes, stripe_size, executor):
+    """
+    Processes the shards in `memory` in stripes of `stripe_size` bytes,
+    which are submitted to `executor` or, if it's `None`, to a new process
+    pool with `processes` processes.
+    """
+    if stripe_size < 1:
+        raise ValueError(
+            'stripe_size must be at least 1, got {}'.format(stripe_size)
+        )
+    parameters = (
+        code.data_shards, code.parity_shards, _field_parameters(code)
+    )
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(processes or os.cpu_count())
+    try:
+        futures = [
+            executor.submit(
+                _process_stripe, memory.name, parameters, size, missing,
+                start, min(start + stripe_size, size)
+            )
+            for start in range(0, size, stripe_size)
+        ]
+        for future in futures:
+            future.result()
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def _shard_size(code, length):
+    if length % code.total_shards:
+        raise ValueError(
+            'expected a multiple of {} bytes, got {}'.format(
+                code.total_shards, length
+            )
+        )
+    return length // code.total_shards
+
+
+def _check_missing(code, missing):
+    missing = frozenset(missing)
+    if not missing <= set(range(code.total_shards)):
+        raise ValueError('missing contains invalid shard indices')
+    if len(missing) > code.parity_shards:
+        raise ValueError(
+            'at most {} shards can be missing, got {}'.format(
+                code.parity_shards, len(missing)
+            )
+        )
+    return missing
+
+
+def _process(code, shards, missing, processes, stripe_size, executor):
+    """
+    Processes `shards`, a writable buffer or shared memory, in place.
+    """
+    if isinstance(shards, SharedMemory):
+        size = _shard_size(code, shards.size)
+        _run(code, shards, size, missing, processes, stripe_size, executor)
+        return
+    view = _byte_view(shards, writable=True)
+    size = _shard_size(code, len(view))
+    memory = SharedMemory(create=True, size=max(len(view), 1))
+    try:
+        memory.buf[:len(view)] = view
+        _run(code, memory, size, missing, processes, stripe_size, executor)
+        view[:] = memory.buf[:len(view)]
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def encode(code, shards, processes=None, stripe_size=_STRIPE_SIZE,
+           executor=None):
+    """
+    Encodes the data shards in `shards` with the
+    :class:`~gf256.erasure.ReedSolomon` `code`, using several processes, and
+    writes the parity shards to `shards` in place.
+
+    `shards` is a writable buffer, that contains all shards back to back,
+    the data shards followed by room for the parity shards, or a
+    :class:`~multiprocessing.shared_memory.SharedMemory` that does. Each
+    shard is split into stripes of `stripe_size` bytes, which are encoded by
+    the processes of `executor` or, if it's `None`, of a new
+    :class:`~concurrent.futures.ProcessPoolExecutor` with `processes`
+    processes, one per CPU by default.
+
+    The processes attach to shared memory, that contains the shards, so
+    that no shards are pickled. A buffer, that isn't shared memory, is
+    copied into shared memory and back once.
+
+    Raises :exc:`ValueError`, if the size of `shards` isn't a multiple of
+    `code.total_shards`.
+    """
+    _process(code, shards, None, processes, stripe_size, executor)
+
+
+def reconstruct(code, shards, missing, processes=None,
+                stripe_size=_STRIPE_SIZE, executor=None):
+    """
+    Reconstructs the shards in `shards`, whose indices are in `missing`, in
+    place.
+
+    `shards` and the other arguments are like for :func:`encode`, the
+    missing shards may contain anything. Raises :exc:`ValueError`, if more
+    than `code.parity_shards` shards are missing.
+    """
+    missing = _check_missing(code, missing)
+    _process(code, shards, missing, processes, stripe_size, executor)
+
+
+def _process_file(code, path, missing, processes, stripe_size, executor):
+    length = os.path.getsize(path)
+    size = _shard_size(code, length)
+    memory = SharedMemory(create=True, size=max(length, 1))
+    try:
+        with open(path, 'r+b') as file:
+            file.readinto(memory.buf[:length])
+            _run(code, memory, size, missing, processes, stripe_size, executor)
+            written = (
+                range(code.data_shards, code.total_shards)
+                if missing is None else sorted(missing)
+            )
+            for i in written:
+                file.seek(i * size)
+                file.write(memory.buf[i * size:(i + 1) * size])
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def encode_file(code, path, processes=None, stripe_size=_STRIPE_SIZE,
+                executor=None):
+    """
+    Encodes the data shards in the file at `path` like :func:`encode` and
+    writes the parity shards to the file in place.
+
+    The file contains all shards back to back, the data shards followed by
+    room for the parity shards. It's read into shared memory directly and
+    only the parity shards are written back.
+    """
+    _process_file(code, path, None, processes, stripe_size, executor)
+
+
+def reconstruct_file(code, path, missing, processes=None,
+                     stripe_size=_STRIPE_SIZE, executor=None):
+    """
+    Reconstructs the shards in the file at `path`, whose indices are in
+    `missing`, like :func:`reconstruct` and writes them to the file in
+    place.
+    """
+    missing = _check_missing(code, missing)
+    _process_file(code, path, missing, processes, stripe_size, executor)
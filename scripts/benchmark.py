@@ -10,9 +10,12 @@
 """
 import timeit
 
+import gf256
+
 
 REPEAT = 3
 NUMBER = 1000000
+REGION_SIZE = 64 * 1024 * 1024
 
 
 def benchmark(stmt, **kwargs):
@@ -59,19 +62,44 @@ def benchmark_implementation(class_name, repeat=REPEAT, number=NUMBER):
         yield label, execution_time
 
 
+def benchmark_region_kernels(size=REGION_SIZE, repeat=REPEAT, number=10):
+    setup = '\n'.join([
+        'from gf256 import GF256LT, muladd_region',
+        'src = bytes(range(256)) * ({size} // 256)',
+        'dst = bytearray(len(src))',
+        'c = GF256LT(0x53)'
+    ]).format(size=size)
+    try:
+        for kernel in gf256.available_region_kernels():
+            gf256.select_region_kernel(kernel)
+            execution_time = min(timeit.repeat(
+                'muladd_region(c, src, dst)',
+                setup=setup, repeat=repeat, number=number
+            ))
+            throughput = size * number / execution_time / 1e9
+            yield kernel, '{:.3} GB/s'.format(throughput)
+    finally:
+        gf256.select_region_kernel()
+
+
+def print_results(results):
+    max_label_length = max(len(label) for label, _ in results)
+    for operation, execution_time in results:
+        print('{}: {} {}'.format(
+            operation,
+            ' ' * (max_label_length - len(operation)),
+            execution_time
+        ))
+    print()
+
+
 def main():
     implementations = ['GF256', 'GF256LT']
     for implementation in implementations:
         print('Benchmarking: {}'.format(implementation))
-        results = list(benchmark_implementation(implementation))
-        max_label_length = max(len(label) for label, _ in results)
-        for operation, execution_time in results:
-            print('{}: {} {}'.format(
-                operation,
-                ' ' * (max_label_length - len(operation)),
-                execution_time
-            ))
-        print()
+        print_results(list(benchmark_implementation(implementation)))
+    print('Benchmarking: muladd_region ({} MiB)'.format(REGION_SIZE >> 20))
+    print_results(list(benchmark_region_kernels()))
 
 
 if __name__ == '__main__':
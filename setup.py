@@ -35,8 +35,8 @@ if os.environ.get('GF256_WITHOUT_SPEEDUPS', '1') == '1':
     keywords = {}
 else:
     keywords = {
-        'setup_requires': ['cffi>=1.7.0'],
-        'install_requires': ['cffi>=1.7.0'],
+        'setup_requires': ['cffi>=1.8.0'],
+        'install_requires': ['cffi>=1.8.0'],
         'cffi_modules': ['gf256/speedups_build.py:ffibuilder'],
     }
 
@@ -52,8 +52,12 @@ setup(
         'License :: OSI Approved :: BSD License',
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: Implementation :: CPython'
     ],
     packages=['gf256'],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     **keywords
 )
@@ -0,0 +1,135 @@
+"""
+    test_ecc
+    ~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+from hypothesis import given
+from hypothesis.strategies import binary, data, integers, lists, sampled_from
+
+import gf256.ecc
+from gf256 import GF256, GF256LT, field
+from gf256.ecc import ReedSolomon
+from gf256.polynomial import Polynomial
+
+
+QR = field(0b100011101, 2)
+fields = sampled_from([GF256LT, QR])
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        ReedSolomon(0)
+    with pytest.raises(ValueError):
+        ReedSolomon(255)
+    with pytest.raises(TypeError):
+        ReedSolomon(2, field=GF256)
+
+
+def test_encode_known_codeword():
+    # The same codeword is produced by other implementations, that use the
+    # field of QR codes.
+    assert ReedSolomon(10, field=QR).encode(b'hello world') == bytearray(
+        b'hello world\xed%T\xc4\xfd\xfd\x89\xf3\xa8\xaa'
+    )
+
+
+@given(integers(min_value=1, max_value=32), binary(max_size=64), fields)
+def test_encode(parity_symbols, data, field):
+    code = ReedSolomon(parity_symbols, field=field)
+    codeword = code.encode(data)
+    assert codeword[:len(data)] == data
+    assert len(codeword) == len(data) + parity_symbols
+    remainder = Polynomial(codeword[::-1], field=field) % (
+        code.generator_polynomial
+    )
+    assert remainder.degree == -1
+    assert not any(map(any, code.syndromes(codeword)))
+
+
+def test_encode_too_much_data():
+    with pytest.raises(ValueError):
+        ReedSolomon(10).encode(bytes(246))
+    assert len(ReedSolomon(10).encode(bytes(245))) == 255
+
+
+@given(
+    integers(min_value=1, max_value=32), binary(max_size=64), fields, data()
+)
+def test_decode(parity_symbols, message, field, draw):
+    code = ReedSolomon(parity_symbols, field=field)
+    codeword = code.encode(message)
+    positions = draw.draw(lists(
+        sampled_from(range(len(codeword))),
+        max_size=parity_symbols // 2, unique=True
+    ))
+    for position in positions:
+        codeword[position] ^= draw.draw(integers(min_value=1, max_value=255))
+    assert code.decode(bytes(codeword)) == message
+
+
+def test_decode_too_many_errors():
+    code = ReedSolomon(4)
+    codeword = code.encode(b'hello world')
+    codeword[0] ^= 1
+    codeword[1] ^= 1
+    codeword[2] ^= 1
+    with pytest.raises(ValueError):
+        code.decode(codeword)
+
+
+@pytest.mark.parametrize('count', [1, 10, 100])
+@given(fields, data())
+def test_correct_many(count, field, draw):
+    code = ReedSolomon(4, field=field)
+    messages = draw.draw(lists(
+        binary(min_size=11, max_size=11), min_size=count, max_size=count
+    ))
+    expected = b''.join(map(code.encode, messages))
+    buffer = bytearray(expected)
+    corrupted = draw.draw(lists(
+        integers(min_value=0, max_value=count - 1), unique=True
+    ))
+    for k in corrupted:
+        position = k * 15 + draw.draw(integers(min_value=0, max_value=14))
+        buffer[position] ^= draw.draw(integers(min_value=1, max_value=255))
+    assert code.correct(memoryview(buffer), 15) == len(corrupted)
+    assert buffer == expected
+
+
+def test_syndromes_in_blocks(monkeypatch):
+    code = ReedSolomon(4)
+    buffer = b''.join(code.encode(bytes([i]) * 11) for i in range(100))
+    buffer = bytearray(buffer)
+    buffer[15 * 42] ^= 1
+    expected = code.syndromes(buffer, 15)
+    monkeypatch.setattr(gf256.ecc, '_BLOCK_SIZE', 15 * 30)
+    monkeypatch.setattr(gf256.ecc, '_TRANSPOSE_SIZE', 15 * 7)
+    assert code.syndromes(buffer, 15) == expected
+    assert [
+        k for k in range(100) if any(syndrome[k] for syndrome in expected)
+    ] == [42]
+
+
+def test_correct_reports_codeword():
+    code = ReedSolomon(2)
+    buffer = code.encode(b'\x01\x02') + code.encode(b'\x03\x04')
+    buffer[4] ^= 1
+    buffer[5] ^= 1
+    with pytest.raises(ValueError) as error:
+        code.correct(buffer, 4)
+    assert 'codeword 1' in str(error.value)
+
+
+def test_correct_with_wrong_length():
+    code = ReedSolomon(4)
+    with pytest.raises(ValueError):
+        code.correct(bytearray(3))
+    with pytest.raises(ValueError):
+        code.correct(bytearray(256))
+    with pytest.raises(ValueError):
+        code.correct(bytearray(10), 4)
+    with pytest.raises(TypeError):
+        code.correct(bytes(4))
@@ -0,0 +1,218 @@
+"""
+    test_erasure
+    ~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import mmap
+from itertools import combinations
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import binary, data, integers, lists, sampled_from
+
+import gf256
+from gf256 import GF256, GF256LT, field, set_cache_directory
+from gf256.erasure import ReedSolomon
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        ReedSolomon(0, 1)
+    with pytest.raises(ValueError):
+        ReedSolomon(1, -1)
+    with pytest.raises(ValueError):
+        ReedSolomon(200, 57)
+    assert ReedSolomon(200, 56).total_shards == 256
+
+
+def test_encode_keeps_data():
+    # With a single data shard every parity shard is a multiple of it and the
+    # first parity shard, with coefficient 1 / (1 - 0), is equal to it.
+    code = ReedSolomon(1, 2)
+    assert code.encode([b'\x01\x02']) == [
+        bytearray(b'\x01\x02'), bytearray(b'\x8d\x01')
+    ]
+
+
+@given(lists(binary(min_size=4, max_size=4), min_size=3, max_size=3))
+def test_encode(data):
+    code = ReedSolomon(3, 2)
+    expected = [
+        bytes(
+            int(sum(
+                (code.matrix[i, j] * GF256LT(data[j][k]) for j in range(3)),
+                GF256LT(0)
+            ))
+            for k in range(4)
+        )
+        for i in range(3, 5)
+    ]
+    assert code.encode(data) == expected
+
+
+def test_encode_into_out():
+    code = ReedSolomon(2, 2)
+    data = [b'\x01\x02', b'\x03\x04']
+    buffer = mmap.mmap(-1, 4)
+    out = [memoryview(buffer)[:2], memoryview(buffer)[2:]]
+    parity = code.encode(data, out=out)
+    assert parity == out
+    assert parity[0] is out[0] and parity[1] is out[1]
+    assert buffer[:] == b''.join(code.encode(data))
+
+
+def test_encode_with_wrong_out():
+    code = ReedSolomon(2, 2)
+    data = [b'\x01\x02', b'\x03\x04']
+    with pytest.raises(ValueError):
+        code.encode(data, out=[bytearray(2)])
+    with pytest.raises(ValueError):
+        code.encode(data, out=[bytearray(2), bytearray(3)])
+    with pytest.raises(TypeError):
+        code.encode(data, out=[bytearray(2), bytes(2)])
+
+
+def test_encode_with_wrong_number_of_shards():
+    with pytest.raises(ValueError):
+        ReedSolomon(2, 1).encode([b'\x01'])
+
+
+def test_encode_with_different_sizes():
+    with pytest.raises(ValueError):
+        ReedSolomon(2, 1).encode([b'\x01', b'\x01\x02'])
+
+
+@pytest.mark.parametrize('field', [
+    GF256, GF256LT, field(0b100011101, 2)
+])
+@pytest.mark.parametrize(('data_shards', 'parity_shards'), [
+    (1, 1), (2, 2), (3, 2), (4, 3)
+])
+def test_reconstruct_every_combination(field, data_shards, parity_shards):
+    code = ReedSolomon(data_shards, parity_shards, field=field)
+    data = [bytes(range(i, i + 10)) for i in range(data_shards)]
+    original = data + code.encode(data)
+    for present in combinations(range(code.total_shards), data_shards):
+        shards = [
+            shard if i in present else None
+            for i, shard in enumerate(original)
+        ]
+        code.reconstruct(shards)
+        assert shards == original
+
+
+@given(
+    integers(min_value=1, max_value=10), integers(min_value=0, max_value=10),
+    integers(min_value=0, max_value=64), data()
+)
+def test_reconstruct(data_shards, parity_shards, size, draw):
+    code = ReedSolomon(data_shards, parity_shards)
+    data = draw.draw(lists(
+        binary(min_size=size, max_size=size),
+        min_size=data_shards, max_size=data_shards
+    ))
+    original = data + code.encode(data)
+    missing = draw.draw(lists(
+        sampled_from(range(code.total_shards)),
+        max_size=parity_shards, unique=True
+    ))
+    shards = [
+        None if i in missing else shard for i, shard in enumerate(original)
+    ]
+    code.reconstruct(shards)
+    assert shards == original
+
+
+def test_reconstruct_nothing_missing():
+    code = ReedSolomon(2, 1)
+    shards = [b'\x01', b'\x02', b'\x03']
+    code.reconstruct(shards)
+    assert shards == [b'\x01', b'\x02', b'\x03']
+
+
+def test_reconstruct_into_out():
+    code = ReedSolomon(2, 2)
+    original = [b'\x01\x02', b'\x03\x04'] + code.encode(
+        [b'\x01\x02', b'\x03\x04']
+    )
+    shards = [None, original[1], original[2], None]
+    out = [bytearray(2), None, None, memoryview(bytearray(2))]
+    code.reconstruct(shards, out=out)
+    assert shards[0] is out[0] and shards[3] is out[3]
+    assert shards == original
+
+
+def test_reconstruct_with_wrong_out():
+    code = ReedSolomon(2, 1)
+    with pytest.raises(ValueError):
+        code.reconstruct([b'\x01', None, b'\x03'], out=[None])
+    with pytest.raises(ValueError):
+        code.reconstruct(
+            [b'\x01', None, b'\x03'], out=[None, bytearray(2), None]
+        )
+
+
+def test_reconstruct_too_many_missing():
+    with pytest.raises(ValueError):
+        ReedSolomon(2, 1).reconstruct([b'\x01', None, None])
+
+
+def test_reconstruct_with_wrong_number_of_shards():
+    with pytest.raises(ValueError):
+        ReedSolomon(2, 1).reconstruct([b'\x01', None])
+
+
+def test_reconstruct_caches_decode_matrices():
+    code = ReedSolomon(2, 2)
+    original = [b'\x01\x02', b'\x03\x04'] + code.encode(
+        [b'\x01\x02', b'\x03\x04']
+    )
+    for missing in [0, 0, 1, 0]:
+        shards = [
+            None if i == missing else shard
+            for i, shard in enumerate(original)
+        ]
+        code.reconstruct(shards)
+        assert shards == original
+    info = code.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (
+        2, 2, 128, 2
+    )
+    code.cache_clear()
+    assert code.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize(('cache_size', 'currsize'), [(0, 0), (1, 1)])
+def test_reconstruct_with_cache_size(cache_size, currsize):
+    code = ReedSolomon(2, 2, cache_size=cache_size)
+    original = [b'\x01', b'\x02'] + code.encode([b'\x01', b'\x02'])
+    for missing in [0, 1, 0]:
+        shards = [
+            None if i == missing else shard
+            for i, shard in enumerate(original)
+        ]
+        code.reconstruct(shards)
+        assert shards == original
+    info = code.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 3, currsize)
+
+
+@pytest.mark.parametrize('field', [GF256, GF256LT])
+def test_reconstruct_with_cache_directory(field, tmpdir, monkeypatch):
+    monkeypatch.setattr(gf256, '_cache_directory', None)
+    set_cache_directory(str(tmpdir))
+    data = [bytes(range(i, i + 10)) for i in range(3)]
+    original = data + ReedSolomon(3, 2, field=field).encode(data)
+    for _ in range(2):
+        # The second code finds the decode matrix in the cache.
+        code = ReedSolomon(3, 2, field=field)
+        shards = [None, None] + original[2:]
+        code.reconstruct(shards)
+        assert shards == original
+    # The rows of the second decode matrix are views of the cache entry.
+    rows = code._decode_rows((2, 3, 4))
+    assert all(isinstance(row, memoryview) and row.readonly for row in rows)
+    entries = tmpdir.join('gf256-{}'.format(gf256.__version__)).listdir()
+    assert len(entries) == 1
@@ -5,11 +5,29 @@
     :copyright: 2016 by Daniel Neuhäuser
     :license: BSD, see LICENSE.rst for details
 """
+import copy
+import pickle
+from array import array
+from contextlib import contextmanager
+
 import pytest
 from hypothesis import assume, given
-from hypothesis.strategies import integers
+from hypothesis.strategies import binary, integers, tuples
+
+import gf256
+from gf256 import (
+    GF256, GF256LT, GF256Array, _field_tables, _modinverse, _polydiv,
+    _polymulmod, _swar_mul, available_backends, available_region_kernels,
+    backend, calibrate, field, inverse_many, inverse_region, mul_region,
+    muladd_region, region_kernel, select_backend, select_region_kernel,
+    set_cache_directory
+)
+from gf256.matrix import Matrix
+from gf256.polynomial import Polynomial
 
-from gf256 import GF256, GF256LT, _polydiv
+
+#: The field used by QR codes.
+QR = field(0b100011101, 2)
 
 
 def test_polydiv():
@@ -56,7 +74,8 @@ def create_test_class(GF256):
 
         @given(gf256s)
         def test_repr_evals_to_equal_obj(self, a):
-            evaluated = eval(repr(a), {}, {GF256.__name__: GF256})
+            namespace = {GF256.__name__: GF256, 'field': field}
+            evaluated = eval(repr(a), {}, namespace)
             assert evaluated == a
 
         @given(gf256s, gf256s)
@@ -208,6 +227,26 @@ def create_test_class(GF256):
         @given(gf256s)
         def test_pow_of_one(self, a):
             assert a ** GF256(0) == GF256(1)
+            assert a ** 0 == GF256(1)
+
+        @given(gf256s, integers(min_value=0, max_value=1000))
+        def test_pow_with_int(self, a, b):
+            power_manually = GF256(1)
+            for _ in range(b):
+                power_manually *= a
+            assert a ** b == power_manually
+
+        @given(gf256s, integers(min_value=1, max_value=1000))
+        def test_pow_with_negative_int(self, a, b):
+            assume(a != GF256(0))
+            assert a ** -b == GF256(1) / a ** b
+            assert a ** -b * a ** b == GF256(1)
+
+        @given(integers(min_value=1, max_value=1000))
+        def test_pow_of_zero(self, b):
+            assert GF256(0) ** b == GF256(0)
+            with pytest.raises(ZeroDivisionError):
+                GF256(0) ** -b
 
         @given(gf256s, gf256s)
         def test_equality(self, a, b):
@@ -238,6 +277,28 @@ def create_test_class(GF256):
         def test_int_coercion(self, a):
             assert int(GF256(a)) == a
 
+        @given(gf256s, gf256s)
+        def test_elements_are_interned(self, a, b):
+            assert GF256(int(a)) is a
+            assert a * b is GF256(int(a * b))
+            assert a + b is GF256(int(a + b))
+
+        def test_immutable(self):
+            a = GF256(1)
+            with pytest.raises(AttributeError):
+                a.n = 2
+            with pytest.raises(AttributeError):
+                del a.n
+            with pytest.raises(AttributeError):
+                a.spam = 2
+            assert a == GF256(1)
+
+        @given(gf256s)
+        def test_pickle(self, a):
+            assert pickle.loads(pickle.dumps(a)) is a
+            assert copy.copy(a) is a
+            assert copy.deepcopy(a) is a
+
         def test_addition_with_different_type(self):
             with pytest.raises(TypeError):
                 GF256(1) + 1
@@ -252,7 +313,7 @@ def create_test_class(GF256):
 
         def test_pow_with_different_type(self):
             with pytest.raises(TypeError):
-                GF256(1) ** 1
+                GF256(1) ** 1.0
 
         def test_truediv_with_different_type(self):
             with pytest.raises(TypeError):
@@ -264,6 +325,7 @@ def create_test_class(GF256):
 
 TestGF256 = create_test_class(GF256)
 TestGF256LT = create_test_class(GF256LT)
+TestQR = create_test_class(QR)
 
 
 class TestImplementationEquality:
@@ -285,3 +347,667 @@ class TestImplementationEquality:
     def test_division(self, a, b):
         assume(b != 0)
         assert int(GF256(a) / GF256(b)) == int(GF256LT(a) / GF256LT(b))
+
+    @given(gf256s, integers())
+    def test_pow(self, a, b):
+        assume(a != 0 or b >= 0)
+        assert int(GF256(a) ** b) == int(GF256LT(a) ** b)
+
+    def test_tables(self):
+        generator = GF256(GF256LT.generator)
+        for i, power in enumerate(GF256LT.exponentiation_table):
+            assert power == int(generator ** i)
+            assert GF256LT.logarithm_table[power - 1] == i
+
+
+class TestField:
+    gf256s = integers(min_value=0, max_value=255)
+
+    def test_default(self):
+        assert field() is GF256LT
+        assert field(GF256.irreducible_polynomial, 3) is GF256LT
+
+    def test_memoized(self):
+        assert field(0b100011101, 2) is QR
+        assert field(0b100011101, generator=2) is QR
+        assert field(GF256.irreducible_polynomial, 5) is not GF256LT
+
+    @given(gf256s, gf256s)
+    def test_multiplication(self, a, b):
+        assert int(QR(a) * QR(b)) == _polymulmod(a, b, 0b100011101)
+
+    @given(gf256s, gf256s)
+    def test_generator_does_not_change_arithmetic(self, a, b):
+        other = field(GF256.irreducible_polynomial, 5)
+        assert int(other(a) * other(b)) == int(GF256(a) * GF256(b))
+
+    def test_tables(self):
+        assert QR.exponentiation_table[:9] == [1, 2, 4, 8, 16, 32, 64, 128, 29]
+        assert sorted(QR.exponentiation_table) == list(range(1, 256))
+        assert QR(2) ** 255 == QR(1)
+
+    def test_elements_of_different_fields(self):
+        with pytest.raises(TypeError):
+            QR(1) * GF256LT(1)
+        with pytest.raises(TypeError):
+            GF256LT(1) * QR(1)
+        with pytest.raises(TypeError):
+            QR(1) / GF256LT(1)
+        assert not isinstance(QR(1), GF256LT)
+
+    @pytest.mark.parametrize('irreducible_polynomial', [
+        0b11011,  # degree 4
+        0b1000011011,  # degree 9
+        0b100000000,  # x ** 8
+        0b100011100,  # divisible by x
+        0b100011111,  # divisible by x + 1
+    ])
+    def test_reducible_polynomial(self, irreducible_polynomial):
+        with pytest.raises(ValueError):
+            field(irreducible_polynomial, 3)
+
+    @pytest.mark.parametrize('generator', [0, 1, 2, 256])
+    def test_invalid_generator(self, generator):
+        with pytest.raises(ValueError):
+            field(GF256.irreducible_polynomial, generator)
+
+
+def binary_tuples(count):
+    """
+    Returns a strategy for tuples of `count` byte strings of equal length.
+    """
+    return integers(min_value=0, max_value=64).flatmap(
+        lambda size: tuples(*[binary(min_size=size, max_size=size)] * count)
+    )
+
+
+class TestGF256Array:
+    gf256lts = integers(min_value=0, max_value=255).map(GF256LT)
+
+    def test_init_with_size(self):
+        assert bytes(GF256Array(3)) == b'\x00\x00\x00'
+
+    @given(binary())
+    def test_init_with_bytes(self, data):
+        assert bytes(GF256Array(data)) == data
+        assert bytes(GF256Array(bytearray(data))) == data
+        assert bytes(GF256Array(memoryview(data))) == data
+
+    @given(binary())
+    def test_init_with_elements(self, data):
+        assert GF256Array(map(GF256LT, data)) == GF256Array(data)
+
+    def test_init_with_wrong_elements(self):
+        with pytest.raises(TypeError):
+            GF256Array([GF256(1)])
+        with pytest.raises(TypeError):
+            GF256Array([1])
+
+    def test_init_with_wrong_field(self):
+        with pytest.raises(TypeError) as error:
+            GF256Array(b'\x01', field=GF256)
+        assert 'GF256 is not a table based field' in str(error.value)
+
+    @given(binary())
+    def test_sequence(self, data):
+        array = GF256Array(data)
+        assert len(array) == len(data)
+        assert list(array) == list(map(GF256LT, data))
+        assert [array[i] for i in range(len(data))] == list(array)
+        assert array[1:] == GF256Array(data[1:])
+
+    def test_setitem(self):
+        array = GF256Array(3)
+        array[0] = GF256LT(1)
+        array[1:] = GF256Array(b'\x02\x03')
+        assert bytes(array) == b'\x01\x02\x03'
+        with pytest.raises(TypeError):
+            array[0] = 1
+        with pytest.raises(TypeError):
+            array[1:] = b'\x02\x03'
+
+    @given(binary())
+    def test_repr_evals_to_equal_obj(self, data):
+        namespace = {'GF256Array': GF256Array, 'field': field}
+        array = GF256Array(data)
+        assert eval(repr(array), {}, namespace) == array
+        array = GF256Array(data, field=QR)
+        assert eval(repr(array), {}, namespace) == array
+
+    @given(binary_tuples(2))
+    def test_field(self, data):
+        a, b = (GF256Array(x, field=QR) for x in data)
+        assert list(a * b) == [x * y for x, y in zip(a, b)]
+        assert list(a * QR(3)) == [x * QR(3) for x in a]
+        assert a[:1].field is QR
+        assert GF256Array(list(a), field=QR) == a
+        assert GF256Array(bytes(a)) != a
+
+    @pytest.mark.parametrize('operation', [
+        lambda a, b: a + b,
+        lambda a, b: a * b,
+        lambda a, b: a / b,
+        lambda a, b: a * GF256LT(1),
+        lambda a, b: GF256LT(1) / a,
+    ])
+    def test_operation_with_different_field(self, operation):
+        with pytest.raises(TypeError):
+            operation(GF256Array(b'\x01', field=QR), GF256Array(b'\x01'))
+
+    def test_setitem_with_different_field(self):
+        array = GF256Array(1, field=QR)
+        with pytest.raises(TypeError):
+            array[0] = GF256LT(1)
+        with pytest.raises(TypeError):
+            array[:] = GF256Array(1)
+
+    def test_unhashable(self):
+        with pytest.raises(TypeError):
+            hash(GF256Array(1))
+
+    def test_equality_with_different_type(self):
+        assert GF256Array(b'\x01') != b'\x01'
+
+    @pytest.mark.parametrize('operation', [
+        lambda a, b: a + b,
+        lambda a, b: a - b,
+        lambda a, b: a * b,
+        lambda a, b: a / b,
+    ])
+    def test_operation_with_different_lengths(self, operation):
+        with pytest.raises(ValueError):
+            operation(GF256Array(b'\x01'), GF256Array(b'\x01\x02'))
+
+    @pytest.mark.parametrize('operation', [
+        lambda a, b: a + b,
+        lambda a, b: a - b,
+        lambda a, b: a * b,
+        lambda a, b: a / b,
+        lambda a, b: b / a,
+    ])
+    def test_operation_with_different_type(self, operation):
+        with pytest.raises(TypeError):
+            operation(GF256Array(b'\x01'), 1)
+
+    @given(binary_tuples(2))
+    def test_addition(self, data):
+        a, b = map(GF256Array, data)
+        expected = GF256Array([x + y for x, y in zip(a, b)])
+        assert a + b == expected
+        assert a - b == expected
+        a += b
+        assert a == expected
+
+    @given(binary_tuples(2))
+    def test_multiplication(self, data):
+        a, b = map(GF256Array, data)
+        expected = GF256Array([x * y for x, y in zip(a, b)])
+        assert a * b == expected
+        a *= b
+        assert a == expected
+
+    @given(binary_tuples(2))
+    def test_division(self, data):
+        a, b = map(GF256Array, data)
+        assume(GF256LT(0) not in b)
+        expected = GF256Array([x / y for x, y in zip(a, b)])
+        assert a / b == expected
+        a /= b
+        assert a == expected
+
+    def test_division_by_zero(self):
+        with pytest.raises(ZeroDivisionError) as excinfo:
+            GF256Array(b'\x01\x02') / GF256Array(b'\x01\x00')
+        assert 'position 1' in str(excinfo.value)
+
+    @given(binary(), gf256lts)
+    def test_scalar_addition(self, data, b):
+        a = GF256Array(data)
+        expected = GF256Array([x + b for x in a])
+        assert a + b == expected
+        assert b + a == expected
+        assert a - b == expected
+        assert b - a == expected
+
+    @given(binary(), gf256lts)
+    def test_scalar_multiplication(self, data, b):
+        a = GF256Array(data)
+        expected = GF256Array([x * b for x in a])
+        assert a * b == expected
+        assert b * a == expected
+        a *= b
+        assert a == expected
+
+    @given(binary(), gf256lts)
+    def test_scalar_division(self, data, b):
+        a = GF256Array(data)
+        assume(b != GF256LT(0))
+        assert a / b == GF256Array([x / b for x in a])
+
+    @given(binary(), gf256lts)
+    def test_division_of_scalar(self, data, b):
+        a = GF256Array(data)
+        assume(GF256LT(0) not in a)
+        assert b / a == GF256Array([b / x for x in a])
+
+    def test_scalar_division_by_zero(self):
+        with pytest.raises(ZeroDivisionError):
+            GF256Array(b'\x01') / GF256LT(0)
+        with pytest.raises(ZeroDivisionError):
+            GF256LT(1) / GF256Array(b'\x00')
+
+
+@pytest.mark.parametrize('GF256', [GF256, GF256LT, QR])
+class TestRegions:
+    @given(binary_tuples(2), integers(min_value=0, max_value=255))
+    def test_mul_region(self, GF256, data, c):
+        src, dst = data
+        dst = bytearray(dst)
+        mul_region(GF256(c), src, dst)
+        assert dst == bytes(int(GF256(c) * GF256(n)) for n in src)
+
+    @given(binary_tuples(2), integers(min_value=0, max_value=255))
+    def test_muladd_region(self, GF256, data, c):
+        src, dst = data
+        expected = bytes(
+            int(GF256(m) + GF256(c) * GF256(n)) for n, m in zip(src, dst)
+        )
+        dst = bytearray(dst)
+        muladd_region(GF256(c), src, dst)
+        assert dst == expected
+
+    def test_in_place(self, GF256):
+        data = bytearray(b'\x01\x02\x03')
+        mul_region(GF256(2), data, data)
+        assert data == b'\x02\x04\x06'
+        muladd_region(GF256(1), data, data)
+        assert data == b'\x00\x00\x00'
+
+    def test_buffer_types(self, GF256):
+        src = array('H', [0x0201, 0x0403])
+        dst = memoryview(bytearray(4))
+        mul_region(GF256(1), src, dst[:4])
+        assert dst.tobytes() == src.tobytes()
+
+    def test_dst_not_writable(self, GF256):
+        with pytest.raises(TypeError):
+            mul_region(GF256(1), b'\x01', b'\x00')
+        with pytest.raises(TypeError):
+            muladd_region(GF256(1), b'\x01', b'\x00')
+
+    def test_different_lengths(self, GF256):
+        with pytest.raises(ValueError):
+            mul_region(GF256(1), b'\x01', bytearray(2))
+
+    def test_c_with_different_type(self, GF256):
+        with pytest.raises(TypeError):
+            mul_region(1, b'\x01', bytearray(1))
+
+
+def test_modinverse():
+    assert _modinverse(0, GF256.irreducible_polynomial) == 0
+    for n in range(1, 256):
+        inverse = _modinverse(n, GF256.irreducible_polynomial)
+        assert _polymulmod(n, inverse, GF256.irreducible_polynomial) == 1
+
+
+@pytest.mark.parametrize('GF256', [GF256, QR])
+def test_swar_mul(GF256):
+    a = bytes(range(256)) * 256
+    b = bytes(n for n in range(256) for _ in range(256))
+    products = _swar_mul(
+        int.from_bytes(a, 'little'), int.from_bytes(b, 'little'),
+        GF256.irreducible_polynomial & 0xff, len(a)
+    )
+    assert products.to_bytes(len(a), 'little') == bytes(
+        _polymulmod(m, n, GF256.irreducible_polynomial) for m, n in zip(a, b)
+    )
+
+
+@pytest.mark.parametrize('GF256', [GF256, GF256LT, QR])
+class TestInverseRegion:
+    def test_inverse_region(self, GF256):
+        src = bytes(range(256))
+        dst = bytearray(256)
+        inverse_region(src, dst, field=GF256)
+        assert dst[0] == 0
+        for n in range(1, 256):
+            assert GF256(dst[n]) == GF256(n) ** -1
+
+    def test_in_place(self, GF256):
+        data = bytearray(b'\x00\x01\x02')
+        inverse_region(data, data, field=GF256)
+        inverse_region(data, data, field=GF256)
+        assert data == b'\x00\x01\x02'
+
+    def test_dst_not_writable(self, GF256):
+        with pytest.raises(TypeError):
+            inverse_region(b'\x01', b'\x00', field=GF256)
+
+    def test_different_lengths(self, GF256):
+        with pytest.raises(ValueError):
+            inverse_region(b'\x01', bytearray(2), field=GF256)
+
+
+@pytest.mark.parametrize('GF256', [GF256, GF256LT, QR])
+class TestInverseMany:
+    @given(binary(max_size=64))
+    def test_inverse_many(self, GF256, data):
+        data = bytes(n or 1 for n in data)
+        expected = bytes(int(GF256(n) ** -1) for n in data)
+        assert inverse_many(data, field=GF256) == expected
+        assert inverse_many(memoryview(data), field=GF256) == expected
+
+    def test_result_is_new_bytearray(self, GF256):
+        data = bytearray(b'\x02')
+        result = inverse_many(data, field=GF256)
+        assert isinstance(result, bytearray)
+        assert data == b'\x02'
+
+    @given(binary(max_size=64))
+    def test_out(self, GF256, data):
+        data = bytes(n or 1 for n in data)
+        expected = inverse_many(data, field=GF256)
+        out = memoryview(bytearray(len(data)))
+        assert inverse_many(data, field=GF256, out=out) is out
+        assert out == expected
+        buffer = bytearray(data)
+        inverse_many(buffer, field=GF256, out=buffer)
+        assert buffer == expected
+
+    def test_wrong_out(self, GF256):
+        with pytest.raises(ValueError):
+            inverse_many(b'\x01', field=GF256, out=bytearray(2))
+        with pytest.raises(TypeError):
+            inverse_many(b'\x01', field=GF256, out=bytes(1))
+
+    @given(binary(min_size=1, max_size=64), integers(min_value=0))
+    def test_zero(self, GF256, data, position):
+        data = bytearray(n or 1 for n in data)
+        position %= len(data)
+        data[position] = 0
+        with pytest.raises(ZeroDivisionError) as error:
+            inverse_many(data, field=GF256)
+        assert 'position {}'.format(position) in str(error.value)
+
+
+class TestThreads:
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        monkeypatch.setattr(gf256, '_THREAD_CHUNK_SIZE', 64)
+
+    @pytest.mark.parametrize('threads', [2, 3, 16])
+    @pytest.mark.parametrize('GF256', [GF256, GF256LT, QR])
+    def test_regions(self, threads, GF256):
+        src = bytes(range(256)) * 3 + b'\x01\x02\x03'
+        expected = [bytearray(src), bytearray(src), bytearray(len(src))]
+        mul_region(GF256(7), src, expected[0])
+        muladd_region(GF256(7), src, expected[1])
+        inverse_region(src, expected[2], field=GF256)
+        result = [bytearray(src), bytearray(src), bytearray(len(src))]
+        mul_region(GF256(7), src, result[0], threads=threads)
+        muladd_region(GF256(7), src, result[1], threads=threads)
+        inverse_region(src, result[2], field=GF256, threads=threads)
+        assert result == expected
+
+    def test_pool_reused(self, monkeypatch):
+        monkeypatch.setattr(gf256, '_thread_pool', None)
+        monkeypatch.setattr(gf256, '_thread_pool_size', 0)
+        data = bytearray(1024)
+        mul_region(GF256LT(2), data, data, threads=4)
+        pool = gf256._thread_pool
+        mul_region(GF256LT(2), data, data, threads=2)
+        assert gf256._thread_pool is pool
+        mul_region(GF256LT(2), data, data, threads=8)
+        assert gf256._thread_pool is not pool
+
+    def test_invalid_threads(self):
+        with pytest.raises(ValueError):
+            mul_region(GF256LT(2), b'\x01', bytearray(1), threads=0)
+
+
+@contextmanager
+def region_kernel_selected(name):
+    select_region_kernel(name)
+    try:
+        yield
+    finally:
+        select_region_kernel()
+
+
+class TestRegionKernels:
+    def test_fastest_kernel_selected(self):
+        assert region_kernel() == available_region_kernels()[0]
+
+    @pytest.mark.parametrize('kernel', available_region_kernels())
+    def test_select_kernel(self, kernel):
+        with region_kernel_selected(kernel):
+            assert region_kernel() == kernel
+
+    def test_select_unavailable_kernel(self):
+        with pytest.raises(ValueError):
+            select_region_kernel('spam')
+
+    @pytest.mark.parametrize('kernel', available_region_kernels())
+    @given(
+        binary(min_size=0, max_size=100),
+        integers(min_value=0, max_value=255)
+    )
+    def test_mul_region(self, kernel, src, c):
+        expected = bytes(int(GF256LT(c) * GF256LT(n)) for n in src)
+        dst = bytearray(len(src))
+        with region_kernel_selected(kernel):
+            mul_region(GF256LT(c), src, dst)
+            assert dst == expected
+            muladd_region(GF256LT(c), src, dst)
+            assert dst == bytes(len(src))
+
+
+@contextmanager
+def backend_selected(name):
+    previous = backend()
+    select_backend(name)
+    try:
+        yield
+    finally:
+        select_backend(previous)
+
+
+class TestBackends:
+    def test_fastest_backend_selected(self):
+        with backend_selected(None):
+            assert backend() == available_backends()[0]
+        assert available_backends()[-1] == 'python'
+
+    @pytest.mark.parametrize('name', available_backends())
+    def test_select_backend(self, name):
+        with backend_selected(name):
+            assert backend() == name
+
+    def test_available_backends_without_numpy(self, monkeypatch):
+        monkeypatch.setattr(gf256, 'find_spec', lambda name: None)
+        assert 'numpy' not in available_backends()
+
+    def test_select_unavailable_backend(self):
+        with pytest.raises(ValueError):
+            select_backend('spam')
+
+    @pytest.mark.parametrize('name', available_backends())
+    @given(
+        integers(min_value=0, max_value=255),
+        integers(min_value=1, max_value=255)
+    )
+    def test_elements(self, name, a, b):
+        expected = [
+            (GF256(a) * GF256(b), GF256(a) / GF256(b), GF256(b) ** -1),
+            (GF256LT(a) * GF256LT(b), GF256LT(a) / GF256LT(b)),
+        ]
+        with backend_selected(name):
+            assert [
+                (GF256(a) * GF256(b), GF256(a) / GF256(b), GF256(b) ** -1),
+                (GF256LT(a) * GF256LT(b), GF256LT(a) / GF256LT(b)),
+            ] == expected
+            with pytest.raises(ZeroDivisionError):
+                GF256(a) / GF256(0)
+            with pytest.raises(ZeroDivisionError):
+                GF256LT(a) / GF256LT(0)
+            with pytest.raises(ZeroDivisionError):
+                GF256(0) ** -1
+            assert GF256(a).__mul__(b) is NotImplemented
+            assert GF256(a).__truediv__(b) is NotImplemented
+            assert GF256LT(a).__mul__(b) is NotImplemented
+            assert GF256LT(a).__truediv__(b) is NotImplemented
+
+    @pytest.mark.parametrize('name', available_backends())
+    @pytest.mark.parametrize('field', [GF256, GF256LT, QR])
+    @given(binary_tuples(2), integers(min_value=0, max_value=255))
+    def test_regions(self, name, field, data, c):
+        src, dst = data
+        nonzero = bytes(n or 1 for n in src)
+        expected = [
+            bytes(int(field(c) * field(n)) for n in src),
+            bytes(
+                int(field(m) + field(c) * field(n)) for n, m in zip(src, dst)
+            ),
+            bytes(int(field(n) ** -1) if n else 0 for n in src),
+            bytes(int(field(n) ** -1) for n in nonzero),
+        ]
+        with backend_selected(name):
+            result = [bytearray(dst), bytearray(dst), bytearray(len(src))]
+            mul_region(field(c), src, result[0])
+            muladd_region(field(c), src, result[1])
+            inverse_region(src, result[2], field=field)
+            result.append(inverse_many(nonzero, field=field))
+            assert result == expected
+            if 0 in src:
+                with pytest.raises(ZeroDivisionError) as error:
+                    inverse_many(src, field=field)
+                assert 'position {}'.format(src.index(0)) in str(error.value)
+
+    @pytest.mark.parametrize('name', available_backends())
+    @pytest.mark.parametrize('field', [GF256LT, QR])
+    @given(binary_tuples(2), integers(min_value=0, max_value=255))
+    def test_arrays(self, name, field, data, c):
+        a = GF256Array(data[0], field=field)
+        b = GF256Array(bytes(n or 1 for n in data[1]), field=field)
+        expected = [a + b, a * b, a / b, a + field(c), field(1) / b]
+        with backend_selected(name):
+            assert [
+                a + b, a * b, a / b, a + field(c), field(1) / b
+            ] == expected
+
+    def test_python_constant_time(self, monkeypatch):
+        # Operations on integers spanning the entire buffer aren't constant
+        # time, GF256 is multiplied and inverted byte by byte instead.
+        monkeypatch.setattr(gf256, '_swar_mul', None)
+        src = bytes(range(256))
+        with backend_selected('python'):
+            dst = bytearray(256)
+            muladd_region(GF256(0x57), src, dst)
+            assert dst == bytes(int(GF256(0x57) * GF256(n)) for n in src)
+            inverse_region(src, dst, field=GF256)
+            assert dst == bytes(int(GF256(n) ** -1) if n else 0 for n in src)
+            assert inverse_many(src[1:], field=GF256) == dst[1:]
+
+    def test_calibrate(self):
+        previous = backend()
+        try:
+            calibration = calibrate()
+            operations = {operation for operation, size in calibration}
+            assert 'mul_region' in operations
+            assert {size for operation, size in calibration} == {
+                256, 16384, None
+            }
+            assert set(calibration.values()) <= set(available_backends())
+            for size in [10, 1000, 100000]:
+                src = bytes(range(256)) * (size // 256 + 1)
+                dst = bytearray(len(src))
+                mul_region(GF256LT(2), src, dst)
+                assert dst == bytes(int(GF256LT(2) * GF256LT(n)) for n in src)
+                inverse_region(src, dst)
+                assert dst == bytes(
+                    int(GF256(n) ** -1) if n else 0 for n in src
+                )
+        finally:
+            select_backend(previous)
+        assert gf256._calibration is None
+
+    def test_environment(self, monkeypatch):
+        previous = backend()
+        try:
+            monkeypatch.setenv('GF256_BACKEND', 'python')
+            gf256._select_backend_from_environment()
+            assert backend() == 'python'
+            monkeypatch.setenv('GF256_BACKEND', 'calibrate')
+            gf256._select_backend_from_environment()
+            assert backend() == available_backends()[0]
+            assert gf256._calibration is not None
+            monkeypatch.setenv('GF256_BACKEND', 'spam')
+            with pytest.raises(ValueError):
+                gf256._select_backend_from_environment()
+        finally:
+            select_backend(previous)
+
+
+@pytest.fixture
+def cache_directory(tmpdir, monkeypatch):
+    monkeypatch.setattr(gf256, '_cache_directory', None)
+    set_cache_directory(str(tmpdir))
+    return tmpdir
+
+
+class TestCache:
+    @pytest.mark.parametrize('field', [GF256LT, QR])
+    def test_field_tables(self, field, cache_directory, monkeypatch):
+        expected = field._multiplication_table()
+        monkeypatch.delattr(field, '_cached_multiplication_table')
+        assert field._multiplication_table() == expected
+        entries = cache_directory.listdir()
+        assert len(entries) == 1
+        assert entries[0].basename == 'gf256-{}'.format(gf256.__version__)
+        assert len(entries[0].listdir()) == 1
+
+        # The second time around the tables are read from the cache.
+        monkeypatch.delattr(field, '_cached_multiplication_table')
+        monkeypatch.setattr(gf256, '_exponentiation_table', None)
+        table = field._multiplication_table()
+        assert table == expected
+        assert isinstance(table, memoryview) and table.readonly
+        tables = _field_tables(field.irreducible_polynomial, field.generator)
+        assert tables == (field.exponentiation_table, field.logarithm_table)
+
+        # The mapped table is used as it is by all operations.
+        products = bytes(int(field(3) * field(n)) for n in range(256))
+        dst = bytearray(256)
+        mul_region(field(3), bytes(range(256)), dst)
+        assert dst == products
+        a = GF256Array(bytes(range(256)), field=field)
+        assert a * GF256Array(bytes([3]) * 256, field=field) == GF256Array(
+            products, field=field
+        )
+        assert Matrix([[field(3)]], field=field) * Matrix(
+            [[field(2)]], field=field
+        ) == Matrix([[field(3) * field(2)]], field=field)
+        assert (
+            Polynomial(b'\x03', field=field) * Polynomial(b'\x02', field=field)
+        ).coefficients == bytes([int(field(3) * field(2))])
+
+    def test_invalid_entry_ignored(self, cache_directory, monkeypatch):
+        entry = cache_directory.join(
+            'gf256-{}'.format(gf256.__version__), 'field-0x11b-3'
+        )
+        entry.write(b'spam', ensure=True)
+        assert _field_tables(0x11b, 3) == (
+            GF256LT.exponentiation_table, GF256LT.logarithm_table
+        )
+        entry.write(b'')
+        assert _field_tables(0x11b, 3) == (
+            GF256LT.exponentiation_table, GF256LT.logarithm_table
+        )
+
+    def test_unwritable_directory_ignored(self, cache_directory, monkeypatch):
+        cache_directory.join('file').write('')
+        set_cache_directory(str(cache_directory.join('file')))
+        expected = GF256LT._multiplication_table()
+        monkeypatch.delattr(GF256LT, '_cached_multiplication_table')
+        assert GF256LT._multiplication_table() == expected
@@ -0,0 +1,276 @@
+"""
+    test_instrumentation
+    ~~~~~~~~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import sys
+
+import pytest
+
+import gf256
+from gf256 import (
+    GF256, GF256LT, GF256Array, field, inverse_many, inverse_region,
+    mul_region, muladd_region
+)
+from gf256 import instrumentation, matrix
+from gf256.instrumentation import Count
+from gf256.maps import ElementMap
+from gf256.matrix import Matrix
+from gf256.polynomial import Polynomial
+
+
+QR = field(0b100011101, 2)
+
+
+@pytest.fixture
+def speedups():
+    """
+    The backend of the operations of `GF256` and `GF256LT`, if they are
+    performed in C with the speedups.
+    """
+    return 'speedups' if gf256.backend() == 'speedups' else None
+
+
+@pytest.fixture(autouse=True)
+def clean_instrumentation():
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled():
+    original = GF256LT.__mul__
+    instrumentation.enable()
+    assert instrumentation.is_enabled()
+    assert GF256LT.__mul__ is not original
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    assert GF256LT.__mul__ is original
+    GF256LT(2) * GF256LT(3)
+    assert instrumentation.counters() == {}
+
+
+def test_element_operations(speedups):
+    instrumentation.enable()
+    GF256(2) * GF256(3)
+    GF256LT(2) * GF256LT(3)
+    GF256LT(2) / GF256LT(3)
+    QR(2) * QR(3)
+    QR(2) ** 3
+    QR(2) ** -1
+    assert GF256(2).__mul__(1) is NotImplemented
+    if speedups:
+        expected = {
+            ('mul', 'speedups'): Count(2, 2),
+            ('div', 'speedups'): Count(1, 1),
+        }
+    else:
+        # Dividing multiplies with the inverse.
+        expected = {
+            ('mul', 'GF256'): Count(1, 1),
+            ('mul', 'GF256LT'): Count(2, 2),
+            ('div', 'GF256LT'): Count(1, 1),
+            ('inverse', 'GF256LT'): Count(1, 1),
+        }
+    expected[('mul', 'field(0x11d, 2)')] = Count(1, 1)
+    expected[('pow', 'field(0x11d, 2)')] = Count(2, 2)
+    assert instrumentation.counters() == expected
+
+
+def test_region_operations():
+    backend = gf256.backend()
+    instrumentation.enable()
+    mul_region(GF256(2), b'\x01\x02', bytearray(2))
+    muladd_region(GF256LT(2), b'\x01\x02\x03', bytearray(3))
+    inverse_region(b'\x01', bytearray(1), field=QR)
+    inverse_many(b'\x01\x02\x03\x04')
+    assert instrumentation.counters() == {
+        ('mul_region_ct', backend): Count(1, 2),
+        ('mul_region', backend): Count(1, 3),
+        ('lookup_region', backend): Count(1, 1),
+        ('find_zero', backend): Count(1, 4),
+        ('inverse_many_ct', backend): Count(1, 4),
+    }
+
+
+def test_arrays():
+    backend = gf256.backend()
+    a = GF256Array(bytes(range(1, 256)) * 100)
+    instrumentation.enable()
+    a * a
+    a / a
+    a + a
+    a * GF256LT(3)
+    assert instrumentation.counters() == {
+        ('mul_regions', backend): Count(2, 51000),
+        ('find_zero', backend): Count(1, 25500),
+        ('lookup_region', backend): Count(1, 25500),
+        ('add_regions', backend): Count(1, 25500),
+        ('mul_region', backend): Count(1, 25500),
+    }
+
+
+def test_element_map():
+    instrumentation.enable()
+    ElementMap.inverse().apply(b'\x01\x02\x03', bytearray(3))
+    assert instrumentation.counters() == {
+        ('lookup_region', gf256.backend()): Count(1, 3),
+    }
+
+
+@pytest.mark.parametrize('name', gf256.available_backends())
+def test_matrix_and_polynomial(monkeypatch, name):
+    # `gf256.np` is only instrumented, if it has been imported.
+    monkeypatch.delitem(sys.modules, 'gf256.np', raising=False)
+    previous = gf256.backend()
+    gf256.select_backend(name)
+    try:
+        instrumentation.enable()
+        Matrix.identity(3) * Matrix.identity(3)
+        Matrix.identity(3).inverse()
+        Polynomial(b'\x01\x02') * Polynomial(b'\x03\x04\x05')
+    finally:
+        gf256.select_backend(previous)
+    counters = instrumentation.counters()
+    if name == 'speedups':
+        # Other functions of the speedups are not counted.
+        assert matrix._speedups.region_find_zero is (
+            gf256._speedups.region_find_zero
+        )
+        assert counters == {
+            ('matrix_mul', 'speedups'): Count(1, 27),
+            ('matrix_reduce', 'speedups'): Count(1, 18),
+            ('poly_mul', 'speedups'): Count(1, 6),
+        }
+    else:
+        # Rows are multiplied and added with `muladd_region` instead.
+        assert counters[('mul_region', name)].calls > 0
+
+
+def test_threads(monkeypatch):
+    backend = gf256.backend()
+    monkeypatch.setattr(gf256, '_THREAD_CHUNK_SIZE', 64)
+    instrumentation.enable()
+    mul_region(GF256LT(2), bytes(256), bytearray(256), threads=4)
+    inverse_region(bytes(256), bytearray(256), field=QR, threads=4)
+    # Every chunk is counted separately.
+    assert instrumentation.counters() == {
+        ('mul_region', backend): Count(4, 256),
+        ('lookup_region', backend): Count(4, 256),
+    }
+
+
+def test_calibrate():
+    previous = gf256.backend()
+    try:
+        calibration = gf256.calibrate()
+        instrumentation.enable()
+        for size in [100, 1000, 100000]:
+            mul_region(GF256LT(2), bytes(size), bytearray(size))
+    finally:
+        gf256.select_backend(previous)
+    expected = {}
+    for size, limit in [(100, 256), (1000, 16384), (100000, None)]:
+        key = ('mul_region', calibration[('mul_region', limit)])
+        calls, length = expected.get(key, (0, 0))
+        expected[key] = Count(calls + 1, length + size)
+    assert instrumentation.counters() == expected
+
+
+def test_failed_operations_not_counted():
+    instrumentation.enable()
+    with pytest.raises(ZeroDivisionError):
+        GF256LT(1) / GF256LT(0)
+    with pytest.raises(ValueError):
+        mul_region(GF256(2), b'\x01', bytearray(2))
+    assert instrumentation.counters() == {}
+
+
+def test_reset():
+    instrumentation.enable()
+    GF256(2) * GF256(3)
+    instrumentation.reset()
+    assert instrumentation.counters() == {}
+
+
+def test_timing(speedups):
+    instrumentation.enable()
+    GF256(2) * GF256(3)
+    assert instrumentation.histograms() == {}
+    instrumentation.enable(timing=True)
+    GF256(2) * GF256(3)
+    GF256(2) * GF256(3)
+    assert GF256(2).__mul__(1) is NotImplemented
+    mul_region(GF256(2), b'\x01\x02', bytearray(2))
+    assert instrumentation.counters()[
+        ('mul', speedups or 'GF256')
+    ] == Count(3, 3)
+    histograms = instrumentation.histograms()
+    assert set(histograms) == {
+        ('mul', speedups or 'GF256'), ('mul_region_ct', gf256.backend())
+    }
+    histogram = histograms[('mul', speedups or 'GF256')]
+    assert sum(histogram.values()) == 2
+    for bucket in histogram:
+        assert bucket & (bucket - 1) == 0
+
+
+def test_hooks():
+    calls = []
+
+    def hook(operation, backend, size, duration):
+        calls.append((operation, backend, size, duration is None))
+
+    instrumentation.add_hook(hook)
+    try:
+        instrumentation.enable()
+        mul_region(GF256(2), b'\x01\x02', bytearray(2))
+        instrumentation.enable(timing=True)
+        mul_region(GF256(2), b'\x01\x02', bytearray(2))
+    finally:
+        instrumentation.remove_hook(hook)
+    mul_region(GF256(2), b'\x01\x02', bytearray(2))
+    assert calls == [
+        ('mul_region_ct', gf256.backend(), 2, True),
+        ('mul_region_ct', gf256.backend(), 2, False),
+    ]
+
+
+@pytest.mark.skipif(
+    'numpy' not in gf256.available_backends(), reason='requires NumPy'
+)
+def test_backend():
+    previous = gf256.backend()
+    gf256.select_backend('numpy')
+    try:
+        instrumentation.enable()
+        GF256LT(2) * GF256LT(3)
+        mul_region(GF256LT(2), b'\x01\x02', bytearray(2))
+    finally:
+        gf256.select_backend(previous)
+    assert instrumentation.counters() == {
+        ('mul', 'GF256LT'): Count(1, 1),
+        ('mul_region', 'numpy'): Count(1, 2),
+    }
+
+
+@pytest.mark.parametrize('name', gf256.available_backends())
+def test_select_backend(name):
+    previous = gf256.backend()
+    try:
+        gf256.select_backend(name)
+        method = GF256.__mul__
+        gf256.select_backend(previous)
+        instrumentation.enable(timing=True)
+        gf256.select_backend(name)
+        assert instrumentation.is_enabled()
+        GF256(2) * GF256(3)
+        instrumentation.disable()
+        assert GF256.__mul__ is method
+    finally:
+        gf256.select_backend(previous)
+    expected = 'speedups' if name == 'speedups' else 'GF256'
+    assert instrumentation.counters() == {('mul', expected): Count(1, 1)}
+    assert set(instrumentation.histograms()) == {('mul', expected)}
@@ -0,0 +1,142 @@
+"""
+    test_maps
+    ~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+from hypothesis import given
+from hypothesis.strategies import binary, integers, sampled_from
+
+from gf256 import GF256, GF256LT, field
+from gf256.maps import ElementMap
+
+
+QR = field(0b100011101, 2)
+fields = sampled_from([GF256, GF256LT, QR])
+
+
+def rotate(n, shift):
+    return (n << shift | n >> (8 - shift)) & 0xff
+
+
+def affine(x):
+    n = x.n
+    return GF256LT(
+        n ^ rotate(n, 1) ^ rotate(n, 2) ^ rotate(n, 3) ^ rotate(n, 4) ^ 0x63
+    )
+
+
+@given(integers(min_value=0, max_value=255), fields)
+def test_function(n, field):
+    element_map = ElementMap(lambda x: x ** 3 + field(1), field=field)
+    assert element_map(field(n)) == field(n) ** 3 + field(1)
+    assert len(element_map.table) == 256
+
+
+def test_function_memoized():
+    calls = []
+
+    def function(x):
+        calls.append(x)
+        return x
+
+    assert ElementMap(function) == ElementMap(function)
+    assert len(calls) == 256
+
+
+def test_function_with_wrong_result():
+    with pytest.raises(TypeError):
+        ElementMap(lambda x: x.n)
+    with pytest.raises(TypeError):
+        ElementMap(lambda x: GF256(x.n))
+
+
+@given(integers(min_value=0, max_value=255), fields)
+def test_multiplication(n, field):
+    element_map = ElementMap.multiplication(field(n))
+    assert element_map.field is field
+    assert element_map == ElementMap(lambda x: field(n) * x, field=field)
+    with pytest.raises(TypeError):
+        ElementMap.multiplication(n)
+
+
+@pytest.mark.parametrize('field', [GF256, GF256LT, QR])
+def test_inverse(field):
+    element_map = ElementMap.inverse(field=field)
+    assert element_map(field(0)) == field(0)
+    for n in range(1, 256):
+        assert element_map(field(n)) == field(n) ** -1
+
+
+@given(integers(min_value=-600, max_value=600), fields)
+def test_power(exponent, field):
+    element_map = ElementMap.power(exponent, field=field)
+    for n in range(1, 256):
+        assert element_map(field(n)) == field(n) ** exponent
+    assert element_map(field(0)) == field(int(exponent == 0))
+
+
+@given(integers(min_value=0, max_value=255), fields)
+def test_compose(c, field):
+    square = ElementMap.power(2, field=field)
+    multiplication = ElementMap.multiplication(field(c))
+    composed = square.compose(multiplication)
+    assert composed == ElementMap(lambda x: (field(c) * x) ** 2, field=field)
+    other = ElementMap.power(2, field=QR if field is GF256 else GF256)
+    with pytest.raises(TypeError):
+        square.compose(other)
+
+
+def test_aes_sbox():
+    sbox = ElementMap(affine).compose(ElementMap.inverse())
+    assert sbox(GF256LT(0x00)) == GF256LT(0x63)
+    assert sbox(GF256LT(0x53)) == GF256LT(0xed)
+    assert sbox(GF256LT(0xff)) == GF256LT(0x16)
+
+
+@given(binary(), fields)
+def test_apply(data, field):
+    element_map = ElementMap.power(3, field=field)
+    dst = bytearray(len(data))
+    element_map.apply(data, dst)
+    assert dst == bytes(element_map(field(n)).n for n in data)
+    element_map.apply(dst, dst)
+    assert dst == bytes(element_map.table[element_map.table[n]] for n in data)
+
+
+def test_apply_with_wrong_buffers():
+    element_map = ElementMap.inverse()
+    with pytest.raises(ValueError):
+        element_map.apply(b'\x01', bytearray(2))
+    with pytest.raises(TypeError):
+        element_map.apply(b'\x01', b'\x00')
+
+
+def test_call_with_wrong_element():
+    with pytest.raises(TypeError):
+        ElementMap.inverse()(GF256(1))
+
+
+def test_from_table():
+    table = bytes(range(255, -1, -1))
+    element_map = ElementMap.from_table(bytearray(table), field=QR)
+    assert element_map.table == table
+    assert element_map(QR(0)) == QR(255)
+    with pytest.raises(ValueError):
+        ElementMap.from_table(table[:-1])
+
+
+@pytest.mark.parametrize('cls', [GF256LT, QR])
+def test_repr_evals_to_equal_obj(cls):
+    element_map = ElementMap.power(3, field=cls)
+    assert eval(repr(element_map)) == element_map
+    assert hash(eval(repr(element_map))) == hash(element_map)
+
+
+def test_equality():
+    assert ElementMap.power(1) == ElementMap(lambda x: x)
+    assert ElementMap.power(1) != ElementMap.power(1, field=QR)
+    assert ElementMap.power(1) != ElementMap.power(2)
+    assert ElementMap.power(1) != object()
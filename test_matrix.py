@@ -0,0 +1,211 @@
+"""
+    test_matrix
+    ~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+from hypothesis import assume, given
+from hypothesis.strategies import binary, integers, lists, sampled_from
+
+import gf256
+from gf256 import GF256, GF256LT, GF256Array
+from gf256.matrix import Matrix, solve
+
+
+fields = sampled_from([GF256, GF256LT, gf256.field(0b100011101, 2)])
+
+
+def matrices(rows, columns):
+    return lists(
+        binary(min_size=columns, max_size=columns),
+        min_size=rows, max_size=rows
+    )
+
+
+def square_matrices(max_size=8):
+    return integers(min_value=1, max_value=max_size).flatmap(
+        lambda n: matrices(n, n)
+    )
+
+
+def naive_product(a, b):
+    (rows, inner), (_, columns) = a.shape, b.shape
+    product = Matrix.zeros(rows, columns, field=a.field)
+    for i in range(rows):
+        for j in range(columns):
+            element = a.field(0)
+            for k in range(inner):
+                element += a[i, k] * b[k, j]
+            product[i, j] = element
+    return product
+
+
+def test_init():
+    matrix = Matrix([b'\x01\x02', [GF256LT(3), GF256LT(4)]])
+    assert matrix.shape == (2, 2)
+    assert bytes(matrix) == b'\x01\x02\x03\x04'
+    assert matrix[1, 0] == GF256LT(3)
+    assert Matrix().shape == (0, 0)
+
+
+def test_init_with_wrong_elements():
+    with pytest.raises(TypeError):
+        Matrix([[GF256(1)]])
+
+
+def test_init_with_different_row_lengths():
+    with pytest.raises(ValueError):
+        Matrix([b'\x01', b'\x01\x02'])
+
+
+def test_setitem():
+    matrix = Matrix.zeros(2, 3)
+    matrix[1, 2] = GF256LT(5)
+    assert bytes(matrix) == b'\x00\x00\x00\x00\x00\x05'
+    with pytest.raises(IndexError):
+        matrix[2, 0]
+    with pytest.raises(IndexError):
+        matrix[0, -1] = GF256LT(1)
+
+
+def test_identity():
+    assert Matrix.identity(2) == Matrix([b'\x01\x00', b'\x00\x01'])
+    assert Matrix.identity(0) == Matrix()
+
+
+def test_equality():
+    assert Matrix([b'\x01']) != Matrix([b'\x01'], field=GF256)
+    assert Matrix([b'\x01\x00']) != Matrix([b'\x01', b'\x00'])
+    assert Matrix([b'\x01']) != b'\x01'
+
+
+def test_unhashable():
+    with pytest.raises(TypeError):
+        hash(Matrix())
+
+
+@given(matrices(2, 3), fields)
+def test_repr_evals_to_equal_obj(rows, field):
+    matrix = Matrix(rows, field=field)
+    namespace = {
+        'Matrix': Matrix, field.__name__: field, 'field': gf256.field
+    }
+    assert eval(repr(matrix), {}, namespace) == matrix
+
+
+@given(matrices(3, 4), matrices(4, 2), fields)
+def test_product(a, b, field):
+    a, b = Matrix(a, field=field), Matrix(b, field=field)
+    assert a * b == naive_product(a, b)
+
+
+@given(matrices(3, 4), binary(min_size=4, max_size=4))
+def test_product_with_vector(a, b):
+    a = Matrix(a)
+    expected = naive_product(a, Matrix([bytes([element]) for element in b]))
+    assert bytes(a * GF256Array(b)) == bytes(expected)
+
+
+@given(matrices(3, 4), integers(min_value=0, max_value=255), fields)
+def test_product_with_scalar(a, b, field):
+    a, b = Matrix(a, field=field), field(b)
+    expected = Matrix(
+        [[a[i, j] * b for j in range(4)] for i in range(3)], field=field
+    )
+    assert a * b == expected
+    assert b * a == expected
+
+
+def test_product_with_wrong_shape():
+    with pytest.raises(ValueError):
+        Matrix.zeros(2, 3) * Matrix.zeros(2, 3)
+    with pytest.raises(ValueError):
+        Matrix.zeros(2, 3) * GF256Array(2)
+
+
+def test_product_with_different_type():
+    with pytest.raises(TypeError):
+        Matrix.zeros(2, 2) * Matrix.zeros(2, 2, field=GF256)
+    with pytest.raises(TypeError):
+        Matrix.zeros(2, 2, field=GF256) * GF256Array(2)
+    with pytest.raises(TypeError):
+        1 * Matrix.zeros(2, 2)
+
+
+@given(square_matrices(), fields)
+def test_inverse(rows, field):
+    matrix = Matrix(rows, field=field)
+    n = matrix.shape[0]
+    if matrix.rank() < n:
+        with pytest.raises(ValueError):
+            matrix.inverse()
+    else:
+        inverse = matrix.inverse()
+        assert matrix * inverse == Matrix.identity(n, field=field)
+        assert inverse * matrix == Matrix.identity(n, field=field)
+
+
+def test_inverse_of_non_square_matrix():
+    with pytest.raises(ValueError):
+        Matrix.zeros(2, 3).inverse()
+
+
+@pytest.mark.parametrize('field', [GF256, GF256LT])
+def test_inverse_requiring_row_swaps(field):
+    matrix = Matrix([b'\x00\x01\x00', b'\x00\x00\x01', b'\x01\x00\x00'],
+                    field=field)
+    assert matrix.inverse() * matrix == Matrix.identity(3, field=field)
+
+
+@pytest.mark.parametrize(('rows', 'rank'), [
+    ([], 0),
+    ([b'\x00\x00'], 0),
+    ([b'\x01\x02', b'\x02\x04'], 1),
+    ([b'\x00\x01', b'\x00\x02', b'\x01\x00'], 2),
+    ([b'\x01\x02\x03', b'\x04\x05\x06'], 2),
+])
+def test_rank(rows, rank):
+    assert Matrix(rows).rank() == rank
+    assert Matrix(rows, field=GF256).rank() == rank
+
+
+@given(square_matrices(), integers(min_value=1, max_value=4), fields)
+def test_solve(rows, right_hand_sides, field):
+    a = Matrix(rows, field=field)
+    assume(a.rank() == a.shape[0])
+    b = Matrix(
+        [bytes(range(i, i + right_hand_sides)) for i in range(a.shape[0])],
+        field=field
+    )
+    assert a * solve(a, b) == b
+
+
+@given(square_matrices())
+def test_solve_with_vector(rows):
+    a = Matrix(rows)
+    assume(a.rank() == a.shape[0])
+    b = GF256Array(bytes(range(a.shape[0])))
+    x = solve(a, b)
+    assert isinstance(x, GF256Array)
+    assert a * x == b
+
+
+def test_solve_singular():
+    with pytest.raises(ValueError):
+        solve(Matrix([b'\x01\x02', b'\x02\x04']), GF256Array(2))
+
+
+def test_solve_with_wrong_shape():
+    with pytest.raises(ValueError):
+        solve(Matrix.zeros(2, 3), Matrix.zeros(2, 1))
+    with pytest.raises(ValueError):
+        solve(Matrix.identity(2), GF256Array(3))
+
+
+def test_solve_with_different_field():
+    with pytest.raises(TypeError):
+        solve(Matrix.identity(2), Matrix.identity(2, field=GF256))
+    with pytest.raises(TypeError):
+        solve(Matrix.identity(2, field=GF256), GF256Array(2))
@@ -0,0 +1,160 @@
+"""
+    test_np
+    ~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from hypothesis import given  # noqa: E402
+from hypothesis.extra.numpy import arrays  # noqa: E402
+from hypothesis.strategies import integers, sampled_from  # noqa: E402
+
+from gf256 import GF256, GF256LT, field  # noqa: E402
+from gf256 import np as gf256np  # noqa: E402
+from gf256.matrix import Matrix  # noqa: E402
+
+
+fields = sampled_from([GF256LT, field(0b100011101, 2)])
+
+
+def uint8_arrays(shape=integers(min_value=0, max_value=16)):
+    return arrays(numpy.uint8, shape)
+
+
+def elementwise(operation, field, *arrays):
+    """
+    Applies `operation` to the elements of `arrays` one by one.
+    """
+    arrays = numpy.broadcast_arrays(*arrays)
+    return numpy.array([
+        int(operation(*map(field, map(int, elements))))
+        for elements in zip(*map(numpy.ravel, arrays))
+    ], dtype=numpy.uint8).reshape(arrays[0].shape)
+
+
+@given(uint8_arrays(), uint8_arrays())
+def test_add(a, b):
+    size = min(len(a), len(b))
+    a, b = a[:size], b[:size]
+    expected = elementwise(lambda x, y: x + y, GF256LT, a, b)
+    assert (gf256np.add(a, b) == expected).all()
+    assert (gf256np.subtract(a, b) == expected).all()
+
+
+@given(uint8_arrays(), uint8_arrays(), fields)
+def test_multiply(a, b, field):
+    size = min(len(a), len(b))
+    a, b = a[:size], b[:size]
+    expected = elementwise(lambda x, y: x * y, field, a, b)
+    assert (gf256np.multiply(a, b, field=field) == expected).all()
+
+
+@given(uint8_arrays(), fields)
+def test_broadcasting(a, field):
+    column = numpy.arange(4, dtype=numpy.uint8)[:, None]
+    expected = elementwise(lambda x, y: x * y, field, column, a)
+    result = gf256np.multiply(column, a, field=field)
+    assert result.shape == (4, len(a))
+    assert (result == expected).all()
+
+
+@given(uint8_arrays(), fields)
+def test_inverse_and_divide(a, field):
+    b = numpy.maximum(a, 1)
+    expected = elementwise(lambda x: x ** -1, field, b)
+    assert (gf256np.inverse(b, field=field) == expected).all()
+    expected = elementwise(lambda x, y: x / y, field, a, b)
+    assert (gf256np.divide(a, b, field=field) == expected).all()
+
+
+def test_division_by_zero():
+    with pytest.raises(ZeroDivisionError) as error:
+        gf256np.divide([1, 2], [[1, 1], [1, 0]])
+    assert 'position (1, 1)' in str(error.value)
+    with pytest.raises(ZeroDivisionError):
+        gf256np.inverse([0])
+
+
+@given(uint8_arrays(), integers(min_value=-600, max_value=600), fields)
+def test_power(a, exponent, field):
+    a = a if exponent >= 0 else numpy.maximum(a, 1)
+    expected = elementwise(lambda x: x ** exponent, field, a)
+    assert (gf256np.power(a, exponent, field=field) == expected).all()
+
+
+def test_power_with_array_of_exponents():
+    assert gf256np.power([0, 0, 2, 2], [0, 1, 1, -1]).tolist() == [
+        1, 0, 2, int(GF256LT(2) ** -1)
+    ]
+    with pytest.raises(ZeroDivisionError):
+        gf256np.power([0], -1)
+    with pytest.raises(TypeError):
+        gf256np.power([1], 1.5)
+
+
+@given(
+    arrays(numpy.uint8, (3, 4)), arrays(numpy.uint8, (4, 2)),
+    arrays(numpy.uint8, 4), fields
+)
+def test_matmul(a, b, vector, field):
+    expected = Matrix(list(map(bytes, a)), field=field) * Matrix(
+        list(map(bytes, b)), field=field
+    )
+    assert gf256np.matmul(a, b, field=field).tobytes() == bytes(expected)
+    assert gf256np.matmul(a.T.T, b.T.T, field=field).shape == (3, 2)
+    expected = Matrix(list(map(bytes, a)), field=field) * Matrix(
+        [bytes([x]) for x in vector], field=field
+    )
+    result = gf256np.matmul(a, vector, field=field)
+    assert result.shape == (3, )
+    assert result.tobytes() == bytes(expected)
+
+
+def test_matmul_with_non_contiguous_arrays():
+    a = numpy.arange(16, dtype=numpy.uint8).reshape(4, 4)
+    assert (
+        gf256np.matmul(a.T, a[:, ::2]) ==
+        gf256np.matmul(a.T.copy(), a[:, ::2].copy())
+    ).all()
+
+
+def test_matmul_with_wrong_shapes():
+    with pytest.raises(ValueError):
+        gf256np.matmul([1, 2], [1, 2])
+    with pytest.raises(ValueError):
+        gf256np.matmul([[1, 2, 3], [1, 2, 3]], [[1, 2, 3], [1, 2, 3]])
+
+
+@pytest.mark.parametrize('operation', [
+    lambda out: gf256np.add([1, 2], [3, 4], out=out),
+    lambda out: gf256np.multiply([1, 2], [3, 4], out=out),
+    lambda out: gf256np.divide([1, 2], [3, 4], out=out),
+    lambda out: gf256np.inverse([1, 2], out=out),
+    lambda out: gf256np.power([1, 2], 3, out=out),
+    lambda out: gf256np.matmul([[1, 2], [3, 4]], [1, 2], out=out),
+])
+def test_out(operation):
+    out = numpy.zeros(2, dtype=numpy.uint8)
+    assert operation(out) is out
+    assert (out == operation(None)).all()
+
+
+def test_conversion():
+    assert gf256np.add(numpy.array([1, 255], dtype=numpy.int64), 1).dtype == (
+        numpy.uint8
+    )
+    with pytest.raises(ValueError):
+        gf256np.add([256], [1])
+    with pytest.raises(ValueError):
+        gf256np.add([-1], [1])
+    with pytest.raises(TypeError):
+        gf256np.add([1.0], [1])
+
+
+def test_field_without_tables():
+    with pytest.raises(TypeError):
+        gf256np.multiply([1], [1], field=GF256)
@@ -0,0 +1,178 @@
+"""
+    test_polynomial
+    ~~~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+import pytest
+from hypothesis import assume, given
+from hypothesis.strategies import binary, integers, lists, sampled_from
+
+import gf256
+from gf256 import GF256, GF256LT
+from gf256.polynomial import Polynomial
+
+
+fields = sampled_from([GF256, GF256LT, gf256.field(0b100011101, 2)])
+elements = integers(min_value=0, max_value=255)
+
+
+def naive_evaluate(polynomial, x):
+    result = polynomial.field(0)
+    power = polynomial.field(1)
+    for coefficient in polynomial.coefficients:
+        result += polynomial.field(coefficient) * power
+        power *= x
+    return result
+
+
+def test_init():
+    assert Polynomial(b'\x01\x02\x00\x00').coefficients == b'\x01\x02'
+    assert Polynomial([GF256LT(1), GF256LT(0)]).coefficients == b'\x01'
+    assert Polynomial().degree == -1
+    assert Polynomial(b'\x00\x00\x05').degree == 2
+
+
+def test_init_with_wrong_elements():
+    with pytest.raises(TypeError):
+        Polynomial([GF256(1)])
+
+
+@given(binary(max_size=8), fields)
+def test_repr_evals_to_equal_obj(coefficients, field):
+    polynomial = Polynomial(coefficients, field=field)
+    namespace = {
+        'Polynomial': Polynomial, field.__name__: field, 'field': gf256.field
+    }
+    assert eval(repr(polynomial), {}, namespace) == polynomial
+
+
+def test_equality_and_hash():
+    assert Polynomial(b'\x01') == Polynomial(b'\x01\x00')
+    assert hash(Polynomial(b'\x01')) == hash(Polynomial(b'\x01\x00'))
+    assert Polynomial(b'\x01') != Polynomial(b'\x01', field=GF256)
+    assert Polynomial(b'\x01') != b'\x01'
+
+
+@given(binary(max_size=16), elements, fields)
+def test_call(coefficients, x, field):
+    polynomial = Polynomial(coefficients, field=field)
+    assert polynomial(field(x)) == naive_evaluate(polynomial, field(x))
+
+
+def test_call_with_wrong_type():
+    with pytest.raises(TypeError):
+        Polynomial(b'\x01')(1)
+
+
+@given(binary(max_size=16), binary(max_size=32), fields)
+def test_evaluate(coefficients, points, field):
+    polynomial = Polynomial(coefficients, field=field)
+    assert polynomial.evaluate(points) == bytes(
+        naive_evaluate(polynomial, field(x)).n for x in points
+    )
+    assert polynomial.evaluate(map(field, points)) == (
+        polynomial.evaluate(points)
+    )
+
+
+@given(binary(max_size=16), binary(max_size=32), fields)
+def test_evaluate_into_out(coefficients, points, field):
+    polynomial = Polynomial(coefficients, field=field)
+    out = memoryview(bytearray(len(points)))
+    assert polynomial.evaluate(memoryview(points), out=out) is out
+    assert out == polynomial.evaluate(points)
+
+
+def test_evaluate_with_wrong_out():
+    with pytest.raises(ValueError):
+        Polynomial(b'\x01').evaluate(b'\x01', out=bytearray(2))
+    with pytest.raises(TypeError):
+        Polynomial(b'\x01').evaluate(b'\x01', out=b'\x00')
+
+
+@given(binary(max_size=16), binary(max_size=16), elements, fields)
+def test_addition(a, b, x, field):
+    a, b, x = Polynomial(a, field=field), Polynomial(b, field=field), field(x)
+    assert (a + b)(x) == a(x) + b(x)
+    assert (a - b)(x) == a(x) - b(x)
+
+
+@given(binary(max_size=16), binary(max_size=16), elements, fields)
+def test_multiplication(a, b, x, field):
+    a, b, x = Polynomial(a, field=field), Polynomial(b, field=field), field(x)
+    product = a * b
+    assert product(x) == a(x) * b(x)
+    if a.degree >= 0 and b.degree >= 0:
+        assert product.degree == a.degree + b.degree
+
+
+@given(binary(max_size=16), elements, elements, fields)
+def test_multiplication_with_scalar(a, b, x, field):
+    a, b, x = Polynomial(a, field=field), field(b), field(x)
+    assert (a * b)(x) == a(x) * b
+    assert b * a == a * b
+
+
+@given(binary(max_size=16), binary(min_size=1, max_size=8), fields)
+def test_divmod(a, b, field):
+    a, b = Polynomial(a, field=field), Polynomial(b, field=field)
+    assume(b.degree >= 0)
+    quotient, remainder = divmod(a, b)
+    assert quotient * b + remainder == a
+    assert remainder.degree < b.degree
+    assert a // b == quotient
+    assert a % b == remainder
+
+
+def test_division_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        divmod(Polynomial(b'\x01'), Polynomial())
+
+
+@pytest.mark.parametrize('operation', [
+    lambda a, b: a + b,
+    lambda a, b: a * b,
+    lambda a, b: b * a,
+    lambda a, b: divmod(a, b),
+    lambda a, b: a // b,
+    lambda a, b: a % b,
+])
+def test_operation_with_different_type(operation):
+    with pytest.raises(TypeError):
+        operation(Polynomial(b'\x01'), 1)
+    with pytest.raises(TypeError):
+        operation(Polynomial(b'\x01'), Polynomial(b'\x01', field=GF256))
+
+
+@pytest.mark.parametrize('interpolate', [
+    Polynomial.interpolate_lagrange, Polynomial.interpolate_newton
+])
+@given(lists(elements, max_size=32, unique=True), binary(max_size=32), fields)
+def test_interpolate(interpolate, xs, ys, field):
+    xs = bytes(xs[:len(ys)])
+    ys = ys[:len(xs)]
+    polynomial = interpolate(xs, ys, field=field)
+    assert polynomial.field is field
+    assert polynomial.degree < len(xs)
+    assert polynomial.evaluate(xs) == ys
+
+
+@given(binary(max_size=16), fields)
+def test_interpolation_methods_agree(coefficients, field):
+    polynomial = Polynomial(coefficients, field=field)
+    xs = bytes(range(1, len(coefficients) + 1))
+    ys = polynomial.evaluate(xs)
+    assert Polynomial.interpolate_lagrange(xs, ys, field=field) == polynomial
+    assert Polynomial.interpolate_newton(xs, ys, field=field) == polynomial
+
+
+@pytest.mark.parametrize('interpolate', [
+    Polynomial.interpolate_lagrange, Polynomial.interpolate_newton
+])
+def test_interpolate_invalid_points(interpolate):
+    with pytest.raises(ValueError):
+        interpolate(b'\x01\x02', b'\x01')
+    with pytest.raises(ValueError):
+        interpolate(b'\x01\x01', b'\x01\x02')
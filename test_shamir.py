@@ -0,0 +1,79 @@
+"""
+    test_shamir
+    ~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from itertools import combinations
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import binary, data, integers, sampled_from
+
+from gf256 import GF256, GF256LT
+from gf256.shamir import combine, split
+
+
+@pytest.mark.parametrize('field', [GF256, GF256LT])
+def test_combine_any_threshold_shares(field):
+    secret = b'attack at dawn'
+    shares = split(secret, 3, 5, field=field)
+    assert [x for x, _ in shares] == [1, 2, 3, 4, 5]
+    for subset in combinations(shares, 3):
+        assert combine(subset, field=field) == secret
+    for subset in combinations(shares, 4):
+        assert combine(subset, field=field) == secret
+
+
+@given(
+    binary(max_size=64), integers(min_value=1, max_value=8),
+    integers(min_value=0, max_value=8), data()
+)
+def test_split_and_combine(secret, threshold, additional_shares, draw):
+    shares = split(secret, threshold, threshold + additional_shares)
+    subset = draw.draw(sampled_from(
+        list(combinations(shares, threshold))
+    ))
+    assert combine(subset) == secret
+
+
+def test_threshold_of_one_copies_secret():
+    assert split(b'secret', 1, 2) == [(1, b'secret'), (2, b'secret')]
+
+
+def test_fewer_shares_reveal_nothing():
+    # The polynomial is random, so a share on its own is independent of the
+    # secret; with overwhelming probability it differs from it.
+    assert all(y != bytes(32) for _, y in split(bytes(32), 2, 3))
+
+
+def test_split_invalid_parameters():
+    with pytest.raises(ValueError):
+        split(b'secret', 0, 1)
+    with pytest.raises(ValueError):
+        split(b'secret', 3, 2)
+    with pytest.raises(ValueError):
+        split(b'secret', 2, 256)
+
+
+def test_combine_into_out():
+    shares = split(b'secret', 2, 3)
+    out = bytearray(6)
+    assert combine(
+        [(x, memoryview(y)) for x, y in shares[:2]], out=out
+    ) is out
+    assert out == b'secret'
+    with pytest.raises(ValueError):
+        combine(shares, out=bytearray(5))
+
+
+def test_combine_invalid_shares():
+    with pytest.raises(ValueError):
+        combine([])
+    with pytest.raises(ValueError):
+        combine([(1, b'a'), (1, b'b')])
+    with pytest.raises(ValueError):
+        combine([(0, b'a')])
+    with pytest.raises(ValueError):
+        combine([(1, b'a'), (2, b'bc')])
@@ -0,0 +1,122 @@
+"""
+    test_striping
+    ~~~~~~~~~~~~~
+
+    :copyright: 2016 by Daniel Neuhäuser
+    :license: BSD, see LICENSE.rst for details
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+shared_memory = pytest.importorskip('multiprocessing.shared_memory')
+
+from gf256 import GF256, GF256LT, field  # noqa: E402
+from gf256 import striping  # noqa: E402
+from gf256.erasure import ReedSolomon  # noqa: E402
+
+
+QR = field(0b100011101, 2)
+
+
+@pytest.fixture(scope='module')
+def executor():
+    # The workers run in threads, so that their coverage is measured. They
+    # attach to the shared memory just like processes would.
+    with ThreadPoolExecutor(2) as executor:
+        yield executor
+
+
+def shards_of(code, size):
+    data = [
+        bytes((i * 7 + j) % 256 for j in range(size))
+        for i in range(code.data_shards)
+    ]
+    parity = code.encode(data)
+    return b''.join(data), b''.join(data + parity)
+
+
+@pytest.mark.parametrize('cls', [GF256, GF256LT, QR])
+@pytest.mark.parametrize('stripe_size', [1, 7, 100])
+def test_encode(cls, stripe_size, executor):
+    code = ReedSolomon(3, 2, field=cls)
+    data, expected = shards_of(code, 20)
+    shards = bytearray(data) + bytearray(40)
+    striping.encode(
+        code, shards, stripe_size=stripe_size, executor=executor
+    )
+    assert shards == expected
+
+
+@pytest.mark.parametrize('missing', [[], [0], [1, 3], [3, 4]])
+def test_reconstruct(missing, executor):
+    code = ReedSolomon(3, 2)
+    _, expected = shards_of(code, 20)
+    shards = bytearray(expected)
+    for i in missing:
+        shards[i * 20:(i + 1) * 20] = bytes(20)
+    striping.reconstruct(
+        code, memoryview(shards), missing, stripe_size=8, executor=executor
+    )
+    assert shards == expected
+
+
+def test_shared_memory(executor):
+    code = ReedSolomon(2, 1)
+    data, expected = shards_of(code, 10)
+    memory = shared_memory.SharedMemory(create=True, size=30)
+    try:
+        memory.buf[:20] = data
+        striping.encode(code, memory, executor=executor)
+        assert bytes(memory.buf[:30]) == expected
+        memory.buf[:10] = bytes(10)
+        striping.reconstruct(code, memory, [0], executor=executor)
+        assert bytes(memory.buf[:30]) == expected
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_files(tmpdir, executor):
+    code = ReedSolomon(4, 2)
+    data, expected = shards_of(code, 50)
+    path = tmpdir.join('shards')
+    path.write(data + bytes(100), mode='wb')
+    striping.encode_file(code, str(path), stripe_size=16, executor=executor)
+    assert path.read(mode='rb') == expected
+    corrupted = bytearray(expected)
+    corrupted[100:150] = b'\xff' * 50
+    path.write(bytes(corrupted), mode='wb')
+    striping.reconstruct_file(code, str(path), [2], executor=executor)
+    assert path.read(mode='rb') == expected
+
+
+def test_processes(tmpdir):
+    code = ReedSolomon(3, 2, field=QR)
+    data, expected = shards_of(code, 1000)
+    shards = bytearray(data) + bytearray(2000)
+    striping.encode(code, shards, processes=2, stripe_size=300)
+    assert shards == expected
+    shards[:1000] = bytes(1000)
+    striping.reconstruct(code, shards, [0], processes=2, stripe_size=300)
+    assert shards == expected
+
+
+def test_empty(executor):
+    shards = bytearray()
+    striping.encode(ReedSolomon(2, 1), shards, executor=executor)
+    assert shards == b''
+
+
+def test_invalid_arguments(executor):
+    code = ReedSolomon(3, 2)
+    with pytest.raises(ValueError):
+        striping.encode(code, bytearray(11), executor=executor)
+    with pytest.raises(ValueError):
+        striping.encode(code, bytearray(10), stripe_size=0, executor=executor)
+    with pytest.raises(TypeError):
+        striping.encode(code, bytes(10), executor=executor)
+    with pytest.raises(ValueError):
+        striping.reconstruct(code, bytearray(10), [5], executor=executor)
+    with pytest.raises(ValueError):
+        striping.reconstruct(code, bytearray(10), [0, 1, 2], executor=executor)